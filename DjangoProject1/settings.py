@@ -51,10 +51,26 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # 조회용 페이지/JSON API는 세션·인증 DB 조회를 건너뜀 (STATELESS_URL_PATTERNS 참고)
+    'analysis_app.middleware.DisableSessionForAPI',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# 세션과 사용자 인증을 사용하지 않는 URL 경로 (정규식, request.path_info 기준)
+# 이 경로들에서는 세션이 DB(djongo)에서 읽히거나 저장되지 않습니다. (/admin/ 등은 제외)
+STATELESS_URL_PATTERNS = [
+    r'^/$',
+    r'^/wordcloud/',
+    r'^/api/',
+    r'^/start_distributed_rebuild/',
+    r'^/reset_all_db/',
+    r'^/worker_notification/',
+]
+
+# 플래시 메시지를 세션 대신 서명된 쿠키에 저장 (세션 DB 왕복 없음)
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 ROOT_URLCONF = 'DjangoProject1.urls'
 
 TEMPLATES = [
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DjangoProject1.settings')
 
 application = get_wsgi_application()
+
+# PREWARM_HEAVY_IMPORTS=1이면 (각 워커 프로세스에서) 지연 임포트 대상 모듈을 미리 불러옴
+if os.environ.get('PREWARM_HEAVY_IMPORTS') == '1':
+    from analysis_app.prewarm import prewarm_heavy_imports
+    prewarm_heavy_imports()
@@ -0,0 +1,122 @@
+# analysis_app/http_utils.py
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from data_processor.constants import API_CACHE_MAX_AGE, API_COMPRESS_MIN_BYTES
+
+
+def choose_content_encoding(request) -> Optional[str]:
+    """
+    Accept-Encoding 헤더를 보고 응답 압축 방식을 고릅니다.
+    (brotli 패키지가 설치된 경우에만 'br'을 사용하고, 그 외에는 'gzip')
+    """
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',') if part.strip()}
+
+    if 'br' in accepted:
+        try:
+            import brotli  # noqa: F401 (선택 의존성)
+            return 'br'
+        except ImportError:
+            pass
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_content(content: bytes, encoding: Optional[str]) -> bytes:
+    """선택된 방식으로 응답 본문을 압축합니다."""
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(content)
+    if encoding == 'gzip':
+        return gzip.compress(content, mtime=0)
+    return content
+
+
+def make_strong_etag(key_data: Dict[str, Any], data_version: Any) -> str:
+    """
+    캐시 키와 데이터 버전으로부터 압축하지 않은 표현의 강한(strong) ETag를 생성합니다.
+    (압축된 표현의 ETag는 실제로 압축한 경우에만 encoded_etag()로 만듭니다.)
+    """
+    raw = json.dumps({'key': key_data, 'version': data_version}, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """압축된 표현은 바이트가 다르므로 적용한 인코딩 이름을 ETag에 붙입니다."""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def etag_matches(request, etag: str, encoding: Optional[str] = None) -> Optional[str]:
+    """
+    If-None-Match 헤더에 현재 ETag(또는 '*')가 포함되어 있으면 일치한 ETag를 반환합니다.
+    본문이 작으면 압축하지 않고 보내므로, 인코딩을 고른 요청은 압축/비압축 두 표현의 ETag를 모두 확인합니다.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return None
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    for representation in (encoded_etag(etag, encoding), etag):
+        if representation in candidates:
+            return representation
+    return etag if '*' in candidates else None
+
+
+def _patch_api_headers(response, etag: Optional[str], max_age: int) -> None:
+    if etag:
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=max_age)
+    else:
+        # 임시 결과(표본 미리보기 등)는 재사용되면 안 되므로 매번 다시 요청하도록 함
+        patch_cache_control(response, no_cache=True, max_age=0)
+    patch_vary_headers(response, ('Accept-Encoding',))
+
+
+def not_modified_response(etag: str, max_age: int = API_CACHE_MAX_AGE) -> HttpResponseNotModified:
+    """본문 없이 304 응답을 반환합니다. (ETag, Cache-Control 포함)"""
+    response = HttpResponseNotModified()
+    _patch_api_headers(response, etag, max_age)
+    return response
+
+
+def compressed_json_response(payload: Dict[str, Any], encoding: Optional[str], etag: Optional[str],
+                             max_age: int = API_CACHE_MAX_AGE, status: int = 200) -> HttpResponse:
+    """
+    payload를 JSON으로 직렬화하고 (충분히 크면) 압축하여 ETag/Cache-Control 헤더와 함께 반환합니다.
+    (etag는 make_strong_etag()의 비압축 ETag이며, 실제로 압축한 경우에만 인코딩 이름을 붙입니다.
+    etag가 None이면 캐시하지 않는 응답으로 표시합니다.)
+    """
+    content = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    if encoding and len(content) >= API_COMPRESS_MIN_BYTES:
+        content = compress_content(content, encoding)
+    else:
+        encoding = None
+
+    response = HttpResponse(content, content_type='application/json; charset=utf-8', status=status)
+    if encoding:
+        response['Content-Encoding'] = encoding
+        etag = encoded_etag(etag, encoding) if etag else None
+    _patch_api_headers(response, etag, max_age)
+    return response
+
+
+CACHE_STATUS_HEADER = 'X-Cache'
+
+
+def mark_cache_status(response: HttpResponse, result_doc: Optional[Dict[str, Any]]) -> HttpResponse:
+    """
+    응답에 집계 결과 캐시 적중 여부(X-Cache: HIT/MISS, 혼잡하여 추정치로 응답한 경우 DEGRADED)를 표시합니다.
+    부하 테스트(loadtest 커맨드)가 지연 시간을 캐시 적중/미스별로 나누어 집계할 때 사용합니다.
+    """
+    if result_doc and result_doc.get('degraded'):
+        response[CACHE_STATUS_HEADER] = 'DEGRADED'
+    else:
+        response[CACHE_STATUS_HEADER] = 'HIT' if result_doc and result_doc.get('cache_hit') else 'MISS'
+    return response
@@ -0,0 +1,17 @@
+# myapp/management/commands/assign_random_keys.py
+
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.sampling import assign_random_keys
+
+
+class Command(BaseCommand):
+    help = "ImFiles 문서에 표본 추정용 난수 키(rand)를 채우고 인덱스를 생성합니다. (기존 데이터를 한 번 백필할 때 사용)"
+
+    def handle(self, *args, **options):
+        self.stdout.write("표본용 난수 키 생성 작업 시작...")
+
+        updated = assign_random_keys()
+
+        if updated is None:
+            raise CommandError("MongoDB 연결 실패로 난수 키를 생성하지 못했습니다.")
+        self.stdout.write(self.style.SUCCESS(f"난수 키 생성 완료. (갱신된 문서: {updated}개)"))
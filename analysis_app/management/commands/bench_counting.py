@@ -0,0 +1,122 @@
+# myapp/management/commands/bench_counting.py
+
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.db_connector import get_mongodb_client
+from data_processor.cache_manager import build_record_query, normalize_query_conditions
+from data_processor.aggregation import (
+    count_nouns_streaming, count_nouns_parallel, peak_rss_mb, children_peak_rss_mb, warm_up_parallel_pool,
+    shutdown_parallel_pool
+)
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_NOUNS, TOP_N, AGG_CURSOR_BATCH_SIZE, AGG_MEMORY_LIMIT_MB,
+    AGG_PARALLEL_WORKERS
+)
+
+MODE_LIST = 'list'
+MODE_STREAMING = 'streaming'
+MODE_PARALLEL = 'parallel'
+
+
+def run_counting(mode: str, query: Dict[str, Any], top_n: int, batch_size: int,
+                 memory_limit_mb: float, workers: int) -> Dict[str, Any]:
+    """새 프로세스에서 한 가지 집계 방식을 실행하고 소요 시간과 최대 RSS를 반환합니다."""
+    client = get_mongodb_client()
+    if not client:
+        raise RuntimeError("MongoDB 연결 실패")
+    collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+    baseline_rss = peak_rss_mb()
+
+    if mode == MODE_PARALLEL:
+        # 서버에서는 프로세스 풀을 재사용하므로, 풀 생성 시간은 측정에서 제외
+        warm_up_parallel_pool(workers)
+
+    start_time = time.perf_counter()
+    if mode == MODE_LIST:
+        # 기존 방식: 레코드 전체를 리스트로 읽고 명사를 하나의 리스트로 펼친 뒤 전체 정렬
+        records = list(collection.find(query, {DB_FIELD_NOUNS: 1, "_id": 0}))
+        all_nouns = []
+        for record in records:
+            all_nouns.extend(record.get(DB_FIELD_NOUNS, []))
+        record_count, spills = len(records), 0
+        top_words = Counter(all_nouns).most_common(top_n)
+    else:
+        if mode == MODE_PARALLEL:
+            counter = count_nouns_parallel(collection, query, workers, batch_size, memory_limit_mb, min_records=0)
+        else:
+            counter = count_nouns_streaming(collection, query, batch_size, memory_limit_mb)
+        with counter:
+            record_count, spills = counter.records, len(counter.spill_paths)
+            top_words = counter.top(top_n)
+    elapsed = time.perf_counter() - start_time
+    client.close()
+
+    # 자식 프로세스의 최대 RSS는 자식이 종료된 뒤에야 집계됨
+    shutdown_parallel_pool()
+    children_rss = children_peak_rss_mb()
+
+    return {"mode": mode, "records": record_count, "spills": spills, "elapsed": elapsed,
+            "baseline_rss_mb": baseline_rss, "peak_rss_mb": peak_rss_mb(), "children_rss_mb": children_rss,
+            "top_words": top_words}
+
+
+class Command(BaseCommand):
+    help = '정확(Exact) 집계의 기존 리스트 방식, 스트리밍 방식, 병렬 방식을 각각 새 프로세스에서 실행해 시간과 최대 RSS를 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--title', type=str, default=None, help='Heading (Title) 검색어 - 단어 접두어 일치')
+        parser.add_argument('--tags', type=str, default=None, help='Tags (예: Culture,Life - 쉼표로 구분)')
+        parser.add_argument('--start-date', type=str, default=None, help='날짜 범위의 시작일 (예: 2014-01-01)')
+        parser.add_argument('--end-date', type=str, default=None, help='날짜 범위의 종료일 (예: 2020-12-31)')
+        parser.add_argument('--top-n', type=int, default=TOP_N, help=f'상위 몇 개의 명사를 구할지 (기본값: {TOP_N})')
+        parser.add_argument('--batch-size', type=int, default=AGG_CURSOR_BATCH_SIZE,
+                            help=f'스트리밍 커서 배치 크기 (기본값: {AGG_CURSOR_BATCH_SIZE})')
+        parser.add_argument('--memory-limit-mb', type=float, default=AGG_MEMORY_LIMIT_MB,
+                            help=f'스트리밍 빈도표 메모리 상한 MB (기본값: {AGG_MEMORY_LIMIT_MB})')
+        parser.add_argument('--workers', type=int, default=max(AGG_PARALLEL_WORKERS, 2),
+                            help=f'병렬 방식의 프로세스 수 (기본값: {max(AGG_PARALLEL_WORKERS, 2)})')
+
+    def handle(self, *args, **options):
+        tags_input = options['tags']
+        parsed_tags = [tag.strip() for tag in tags_input.split(',') if tag.strip()] if tags_input else None
+        query_conditions = normalize_query_conditions({
+            'title': options['title'] or "",
+            'tags': parsed_tags,
+            'start_date': options['start_date'] or "",
+            'end_date': options['end_date'] or "",
+        })
+        query = build_record_query(query_conditions) if query_conditions else {}
+
+        # 방식마다 새 프로세스(spawn)에서 실행해야 ru_maxrss(최대 RSS)가 서로 섞이지 않음
+        results = []
+        for mode in (MODE_LIST, MODE_STREAMING, MODE_PARALLEL):
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                try:
+                    results.append(executor.submit(run_counting, mode, query, options['top_n'],
+                                                   options['batch_size'], options['memory_limit_mb'],
+                                                   options['workers']).result())
+                except Exception as e:
+                    raise CommandError(f"{mode} 방식 집계 실패: {e}")
+
+        self.stdout.write(f"조건: {query or '(전체)'}")
+        self.stdout.write(f"{'방식':<10} {'레코드':>10} {'임시파일':>5} {'시간(s)':>9} {'시작 RSS(MB)':>13} "
+                          f"{'최대 RSS(MB)':>13} {'자식 RSS(MB)':>13}")
+        for result in results:
+            self.stdout.write(f"{result['mode']:<10} {result['records']:>10} {result['spills']:>5} "
+                              f"{result['elapsed']:>9.3f} {result['baseline_rss_mb']:>13.1f} "
+                              f"{result['peak_rss_mb']:>13.1f} {result['children_rss_mb']:>13.1f}")
+
+        list_result, streaming_result, parallel_result = results
+        expected_counts = [count for _, count in list_result['top_words']]
+        for result in (streaming_result, parallel_result):
+            if [count for _, count in result['top_words']] != expected_counts:
+                raise CommandError(f"{result['mode']} 방식의 상위 N개 빈도가 리스트 방식과 일치하지 않습니다.")
+
+        saved = list_result['peak_rss_mb'] - streaming_result['peak_rss_mb']
+        speedup = streaming_result['elapsed'] / parallel_result['elapsed'] if parallel_result['elapsed'] else 0
+        self.stdout.write(self.style.SUCCESS(f"✅ 상위 {options['top_n']}개 일치, 스트리밍 최대 RSS {saved:.1f}MB 절약, "
+                                             f"병렬({options['workers']}개 프로세스) {speedup:.2f}배 빠름"))
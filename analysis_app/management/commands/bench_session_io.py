@@ -0,0 +1,60 @@
+# myapp/management/commands/bench_session_io.py
+
+import time
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+
+class Command(BaseCommand):
+    help = '조회용 경로에서 stateless 모드가 요청당 절약하는 세션/인증 DB 호출 수를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--paths',
+            type=str,
+            default='/',
+            help="측정할 경로 (쉼표로 구분, 예: '/,/api/top_words/?tags=Business')"
+        )
+        parser.add_argument('--requests', type=int, default=20, help='경로마다 보낼 요청 수 (기본값: 20)')
+
+    def run_requests(self, path: str, request_count: int):
+        """세션 쿠키를 가진 방문자가 path를 request_count번 요청할 때의 DB 쿼리 수와 소요 시간을 측정합니다."""
+        session = SessionStore()
+        session['visited'] = True
+        session.create()
+
+        client = Client()
+        client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+        start_time = time.perf_counter()
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(request_count):
+                client.get(path)
+        elapsed = time.perf_counter() - start_time
+
+        session.delete()
+        return len(captured.captured_queries), elapsed
+
+    def handle(self, *args, **options):
+        paths = [path.strip() for path in options['paths'].split(',') if path.strip()]
+        request_count = options['requests']
+
+        self.stdout.write(f"세션 I/O 벤치마크 (경로마다 {request_count}회, 세션 쿠키 보유 방문자)")
+        self.stdout.write(f"{'경로':<40} {'모드':<10} {'DB 호출/요청':>14} {'ms/요청':>10}")
+
+        for path in paths:
+            with override_settings(STATELESS_URL_PATTERNS=[]):
+                stateful_queries, stateful_time = self.run_requests(path, request_count)
+            stateless_queries, stateless_time = self.run_requests(path, request_count)
+
+            for mode, queries, elapsed in (('stateful', stateful_queries, stateful_time),
+                                           ('stateless', stateless_queries, stateless_time)):
+                self.stdout.write(f"{path:<40} {mode:<10} {queries / request_count:>14.2f} "
+                                  f"{elapsed * 1000 / request_count:>10.2f}")
+
+            saved = (stateful_queries - stateless_queries) / request_count
+            self.stdout.write(self.style.SUCCESS(f" - {path}: 요청당 DB 호출 {saved:.2f}회 절약"))
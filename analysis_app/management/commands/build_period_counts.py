@@ -0,0 +1,23 @@
+# myapp/management/commands/build_period_counts.py
+
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.trends import build_period_counts
+
+
+class Command(BaseCommand):
+    help = 'ImFiles에서 (월/주, 태그, 명사)별 빈도를 집계하여 명사 추세 API가 사용할 수 있게 합니다. (기본: 바뀐 월만 증분 갱신)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='월별 지문 비교(증분 갱신)를 건너뛰고 ImFiles 전체를 다시 집계')
+
+    def handle(self, *args, **options):
+        self.stdout.write("기간별 명사 빈도 집계 작업 시작...")
+
+        document_count = build_period_counts(full=options['full'])
+
+        if document_count is None:
+            raise CommandError("MongoDB 연결 실패로 기간별 명사 빈도를 집계하지 못했습니다.")
+        if document_count == 0:
+            self.stdout.write(self.style.WARNING("⚠️ ImFiles에 날짜가 있는 레코드가 없어 집계 결과가 없습니다."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"기간별 명사 빈도 {document_count}건 집계 완료."))
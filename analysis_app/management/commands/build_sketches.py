@@ -0,0 +1,29 @@
+# myapp/management/commands/build_sketches.py
+
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.sketches import build_noun_sketches
+from data_processor.constants import SKETCH_CAPACITY
+
+
+class Command(BaseCommand):
+    help = 'ImFiles에서 (일/월, 태그)별 명사 스케치를 생성하여 근사(approximate) 엔진이 사용할 수 있게 합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--capacity',
+            type=int,
+            default=SKETCH_CAPACITY,
+            help=f'버킷마다 보관할 상위 단어 수 (기본값: {SKETCH_CAPACITY})'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("명사 스케치 생성 작업 시작...")
+
+        sketch_count = build_noun_sketches(capacity=options['capacity'])
+
+        if sketch_count is None:
+            raise CommandError("MongoDB 연결 실패로 스케치를 생성하지 못했습니다.")
+        if sketch_count == 0:
+            self.stdout.write(self.style.WARNING("⚠️ ImFiles에 날짜가 있는 레코드가 없어 스케치를 만들지 않았습니다."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"명사 스케치 {sketch_count}개 생성 완료."))
@@ -0,0 +1,24 @@
+# myapp/management/commands/build_title_index.py
+
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.title_index import build_title_index
+
+
+class Command(BaseCommand):
+    help = "ImFiles 문서에 제목 토큰(heading_tokens)을 채우고 Title 검색용 인덱스를 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='이미 토큰이 있는 문서도 모두 다시 토큰화합니다. (토큰화 규칙 변경 시)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("제목 토큰 인덱스 생성 작업 시작...")
+
+        updated = build_title_index(rebuild=options['rebuild'])
+
+        if updated is None:
+            raise CommandError("MongoDB 연결 실패로 제목 토큰 인덱스를 생성하지 못했습니다.")
+        self.stdout.write(self.style.SUCCESS(f"제목 토큰 인덱스 생성 완료. (갱신된 문서: {updated}개)"))
@@ -0,0 +1,63 @@
+# myapp/management/commands/export_distribution.py
+
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.exporter import iter_export_lines, EXPORT_FORMATS
+from data_processor.constants import EXPORT_BATCH_SIZE
+from typing import Dict, Any
+
+
+class Command(BaseCommand):
+    help = '특정 조건(Title, Tags, Date Range)에 맞는 전체 명사 빈도표를 NDJSON 또는 CSV로 스트리밍 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--title', type=str, default=None, help='Heading (Title) 검색어 - 단어 접두어 일치')
+        parser.add_argument('--tags', type=str, default=None, help='Tags (예: Culture,Life - 쉼표로 구분)')
+        parser.add_argument('--start-date', type=str, default=None, help='날짜 범위의 시작일 (예: 2014-01-01)')
+        parser.add_argument('--end-date', type=str, default=None, help='날짜 범위의 종료일 (예: 2020-12-31)')
+        parser.add_argument(
+            '--format',
+            type=str,
+            choices=EXPORT_FORMATS,
+            default='ndjson',
+            help='출력 형식 (기본값: ndjson)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='출력 파일 경로 (생략 시 표준 출력)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EXPORT_BATCH_SIZE,
+            help=f'서버 측 커서 배치 크기 (기본값: {EXPORT_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        tags_input = options['tags']
+        parsed_tags = [tag.strip() for tag in tags_input.split(',') if tag.strip()] if tags_input else None
+
+        # 조건이 없으면 전체 컬렉션의 빈도표를 내보냅니다.
+        query_conditions: Dict[str, Any] = {
+            'title': options['title'] or "",
+            'tags': parsed_tags,
+            'start_date': options['start_date'] or "",
+            'end_date': options['end_date'] or "",
+        }
+
+        row_count = 0
+        try:
+            lines = iter_export_lines(query_conditions, options['format'], options['batch_size'])
+            if options['output']:
+                with open(options['output'], 'w', encoding='utf-8', newline='') as output_file:
+                    for line in lines:
+                        output_file.write(line)
+                        row_count += 1
+                self.stderr.write(self.style.SUCCESS(f"✅ {options['output']}에 {row_count}행 저장 완료."))
+            else:
+                for line in lines:
+                    self.stdout.write(line, ending='')
+                    row_count += 1
+        except ConnectionError as e:
+            raise CommandError(str(e))
@@ -15,7 +15,7 @@ class Command(BaseCommand):
             '--title',
             type=str,
             default=None,
-            help='캐시를 생성할 Heading (Title)의 부분 일치 문자열 (예: Apple)'
+            help='캐시를 생성할 Heading (Title) 검색어 - 단어 접두어 일치 (예: Apple)'
         )
         parser.add_argument(
             '--tags',
@@ -0,0 +1,30 @@
+# myapp/management/commands/inspect_frames.py
+
+import json
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.transport import iter_frames, frame_to_json, TransportError
+
+
+class Command(BaseCommand):
+    help = '워커 <-> 마스터 바이너리 프레임 파일(또는 표준 입력)을 JSON Lines로 풀어 출력합니다. (디버깅용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="프레임 파일 경로 ('-'이면 표준 입력)")
+        parser.add_argument('--max-items', type=int, default=20, help='배열 필드(words, counts 등)에서 보여줄 최대 항목 수')
+
+    def handle(self, *args, **options):
+        stream = sys.stdin.buffer if options['path'] == '-' else open(options['path'], 'rb')
+        max_items = options['max_items']
+
+        try:
+            with stream:
+                for frame in iter_frames(iter(lambda: stream.read(64 * 1024), b'')):
+                    item = frame_to_json(frame)
+                    # 큰 빈도 묶음은 앞부분만 보여주고 전체 길이를 함께 표시
+                    for key, value in item.items():
+                        if isinstance(value, list) and len(value) > max_items:
+                            item[key] = value[:max_items] + [f"... ({len(value)}개)"]
+                    self.stdout.write(json.dumps(item, ensure_ascii=False))
+        except TransportError as e:
+            raise CommandError(f"프레임 해석 실패: {e}")
@@ -0,0 +1,301 @@
+# myapp/management/commands/loadtest.py
+
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from django.core.management.base import BaseCommand, CommandError
+from data_processor.db_connector import get_mongodb_client
+from data_processor.title_index import tokenize_heading
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_HEADING, DB_FIELD_HEADING_TOKENS, TOP_N
+)
+
+# 기본 쿼리 구성 (--mix JSON 파일로 일부 또는 전체를 덮어쓸 수 있음)
+DEFAULT_MIX = {
+    "hot_share": 0.6,  # 미리 정한 인기 조건(핫 쿼리)을 반복 요청하는 비율
+    "hot_pool_size": 20,  # 핫 쿼리 개수
+    "api_share": 0.5,  # /api/top_words/ 요청 비율 (나머지는 /wordcloud/)
+    "tag_share": 0.8,  # 태그 조건을 포함하는 비율
+    "max_tags": 2,  # 한 조건에 들어가는 최대 태그 수
+    "date_share": 0.5,  # 날짜 범위 조건을 포함하는 비율
+    "date_span_days": [7, 30, 90, 365, 1825],  # 날짜 범위 길이 후보 (일)
+    "title_share": 0.2,  # 제목 검색 조건을 포함하는 비율
+    "top_n": TOP_N,
+    # 아래 값이 비어 있으면 ImFiles에서 실제 분포를 읽어 채움
+    "tag_weights": {},  # {태그: 가중치}
+    "date_range": [],  # ["YYYY-MM-DD", "YYYY-MM-DD"]
+    "title_terms": [],  # 제목 검색어 후보
+}
+
+CACHE_STATUSES = ('HIT', 'MISS', 'DEGRADED')
+ISO_DAY_PATTERN = r'^\d{4}-\d{2}-\d{2}'  # Date 문자열이 'YYYY-MM-DD'로 시작하는 레코드만 날짜 범위에 사용
+
+
+def parse_iso_day(value: Any) -> Optional[date]:
+    """'YYYY-MM-DD'로 시작하는 값을 date로 변환합니다. (형식이 다르면 None)"""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def sample_title_terms(collection, sample_size: int = 2000, min_length: int = 4, limit: int = 200) -> List[str]:
+    """
+    표본 레코드의 제목에서 자주 나오는 토큰을 제목 검색어 후보로 고릅니다.
+    heading_tokens가 아직 채워지지 않은 레코드(build_title_index 백필 전)는 Heading을 같은 규칙(tokenize_heading)으로 나누어 사용합니다.
+    """
+    rows = collection.aggregate([
+        {"$sample": {"size": sample_size}},
+        {"$project": {"_id": 0, DB_FIELD_HEADING: 1, DB_FIELD_HEADING_TOKENS: 1}},
+    ])
+    counts: Counter = Counter()
+    for row in rows:
+        tokens = row.get(DB_FIELD_HEADING_TOKENS)
+        if not isinstance(tokens, list):
+            tokens = tokenize_heading(row.get(DB_FIELD_HEADING))
+        # 너무 짧은 토큰(관사 등)은 검색어로 쓰지 않음
+        counts.update(token for token in tokens if isinstance(token, str) and len(token) >= min_length)
+    return [token for token, _ in counts.most_common(limit)]
+
+
+def load_mix_from_db(mix: Dict[str, Any], sample_size: int = 2000) -> Dict[str, Any]:
+    """비어 있는 태그 분포, 날짜 범위, 제목 검색어를 ImFiles의 실제 데이터에서 채웁니다."""
+    if mix["tag_weights"] and mix["date_range"] and mix["title_terms"]:
+        return mix
+
+    client = get_mongodb_client()
+    if not client:
+        raise CommandError("MongoDB 연결 실패: --mix 파일에 tag_weights, date_range, title_terms를 모두 지정하세요.")
+    collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+
+    if not mix["tag_weights"]:
+        rows = collection.aggregate([
+            {"$sample": {"size": sample_size}},
+            {"$unwind": f"${DB_FIELD_TAGS}"},
+            {"$sortByCount": f"${DB_FIELD_TAGS}"},
+            {"$limit": 50},
+        ])
+        mix["tag_weights"] = {row["_id"]: row["count"] for row in rows if isinstance(row["_id"], str)}
+
+    if not mix["date_range"]:
+        date_filter = {DB_FIELD_DATE: {"$type": "string", "$regex": ISO_DAY_PATTERN}}
+        first = collection.find_one(date_filter, {DB_FIELD_DATE: 1}, sort=[(DB_FIELD_DATE, 1)])
+        last = collection.find_one(date_filter, {DB_FIELD_DATE: 1}, sort=[(DB_FIELD_DATE, -1)])
+        first_day = parse_iso_day(first[DB_FIELD_DATE]) if first else None
+        last_day = parse_iso_day(last[DB_FIELD_DATE]) if last else None
+        if first_day and last_day:
+            mix["date_range"] = [first_day.isoformat(), last_day.isoformat()]
+
+    if not mix["title_terms"]:
+        mix["title_terms"] = sample_title_terms(collection, sample_size)
+
+    client.close()
+    if not mix["tag_weights"]:
+        raise CommandError("ImFiles에서 태그를 찾지 못했습니다. 데이터를 먼저 생성하거나 --mix로 지정하세요.")
+    return mix
+
+
+class QueryMix:
+    """쿼리 구성(mix)에 따라 요청 경로를 생성합니다. 핫 쿼리는 미리 만들어 두고 반복 사용합니다."""
+
+    def __init__(self, mix: Dict[str, Any], seed: int, hot_queries: Optional[List[Dict[str, str]]] = None):
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.tags = list(mix["tag_weights"])
+        self.tag_weights = [mix["tag_weights"][tag] for tag in self.tags]
+        self.date_range = self._parse_date_range(mix["date_range"])
+        self.hot_queries = hot_queries or [self.cold_query() for _ in range(mix["hot_pool_size"])]
+
+    @staticmethod
+    def _parse_date_range(date_range: List[Any]) -> Optional[Tuple[date, date]]:
+        """date_range를 (시작일, 종료일)로 변환합니다. 형식이 잘못되었으면 날짜 조건을 만들지 않습니다. (None)"""
+        if not date_range:
+            return None
+        days = [parse_iso_day(day) for day in date_range[:2]]
+        if len(days) != 2 or None in days:
+            print(f"⚠️ date_range {date_range}가 YYYY-MM-DD 형식이 아니어서 날짜 조건 없이 진행합니다.")
+            return None
+        return min(days), max(days)
+
+    def _random_date_range(self) -> Tuple[str, str]:
+        first_day, last_day = self.date_range
+        span = timedelta(days=self.rng.choice(self.mix["date_span_days"]))
+        latest_start = max(first_day, last_day - span)
+        start = first_day + timedelta(days=self.rng.randint(0, (latest_start - first_day).days))
+        return start.isoformat(), min(start + span, last_day).isoformat()
+
+    def cold_query(self) -> Dict[str, str]:
+        """태그/날짜/제목 분포에 따라 새로운 조건을 만듭니다. (조건이 하나도 없으면 태그 하나를 넣음)"""
+        mix, rng = self.mix, self.rng
+        params: Dict[str, str] = {}
+
+        if rng.random() < mix["tag_share"]:
+            tag_count = rng.randint(1, max(1, mix["max_tags"]))
+            params["tags"] = ",".join(sorted(set(rng.choices(self.tags, self.tag_weights, k=tag_count))))
+        if self.date_range and rng.random() < mix["date_share"]:
+            params["start_date"], params["end_date"] = self._random_date_range()
+        if mix["title_terms"] and rng.random() < mix["title_share"]:
+            params["title"] = rng.choice(mix["title_terms"])
+        if not params:
+            params["tags"] = rng.choices(self.tags, self.tag_weights)[0]
+
+        params["top_n"] = str(mix["top_n"])
+        return params
+
+    def next_path(self) -> Tuple[str, bool]:
+        """다음 요청 경로와 핫 쿼리 여부를 반환합니다."""
+        is_hot = self.rng.random() < self.mix["hot_share"]
+        params = self.rng.choice(self.hot_queries) if is_hot else self.cold_query()
+        endpoint = '/api/top_words/' if self.rng.random() < self.mix["api_share"] else '/wordcloud/'
+        return f"{endpoint}?{urlencode(params)}", is_hot
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """정렬된 값에서 nearest-rank 방식 백분위수를 구합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_budgets(value: Optional[str]) -> List[Tuple[str, str, float]]:
+    """'hit:p95=200,miss:p99=8000' 형식의 지연 시간 예산(ms)을 [(HIT, p95, 200.0), ...]으로 변환합니다."""
+    budgets = []
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        try:
+            target, limit = item.split('=')
+            status, stat = target.strip().split(':')
+            status, stat = status.upper(), stat.lower()
+            if status not in CACHE_STATUSES + ('ALL',) or stat not in ('p50', 'p95', 'p99'):
+                raise ValueError
+            budgets.append((status, stat, float(limit)))
+        except ValueError:
+            raise CommandError(f"잘못된 예산 형식입니다: '{item}' (예: hit:p95=200,miss:p99=8000,degraded:p95=1000,all:p50=100)")
+    return budgets
+
+
+class Command(BaseCommand):
+    help = ('실행 중인 서버에 실제와 비슷한 조건 분포(핫 쿼리 반복, 태그/날짜/제목)로 동시 요청을 보내고, '
+            '처리량과 캐시 적중/미스별 p50/p95/p99 지연 시간을 보고합니다. 예산을 넘으면 실패합니다. '
+            '제목 검색어는 heading_tokens에서 고르고, 아직 백필 전(build_title_index 미실행)이면 Heading을 직접 나누어 씁니다. '
+            '이 경우 서버의 제목 검색도 느린 정규식 검색이므로 제목 조건의 지연 시간이 실제 운영보다 길게 측정됩니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', type=str, default='http://127.0.0.1:8000', help='대상 서버 주소')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 스레드 수 (기본값: 8)')
+        parser.add_argument('--duration', type=float, default=30.0, help='측정 시간(초) (기본값: 30)')
+        parser.add_argument('--warmup', type=float, default=0.0, help='측정에서 제외할 시작 구간(초)')
+        parser.add_argument('--timeout', type=float, default=60.0, help='요청 하나의 제한 시간(초)')
+        parser.add_argument('--mix', type=str, default=None, help='쿼리 구성 JSON 파일 (DEFAULT_MIX의 키를 덮어씀)')
+        parser.add_argument('--seed', type=int, default=42, help='난수 시드 (같은 시드면 같은 요청 순서)')
+        parser.add_argument(
+            '--no-keep-alive',
+            action='store_true',
+            help='요청마다 새 연결을 엽니다. (연결 재사용 없이 연결 생성 비용까지 측정)'
+        )
+        parser.add_argument(
+            '--budget',
+            type=str,
+            default=None,
+            help="지연 시간 예산(ms), 예: 'hit:p95=200,miss:p99=8000,all:p50=100'"
+        )
+        parser.add_argument('--max-error-rate', type=float, default=0.01, help='허용하는 오류 응답 비율 (기본값: 0.01)')
+
+    def handle(self, *args, **options):
+        import requests  # 부하 테스트에서만 사용하는 무거운 의존성
+
+        mix = dict(DEFAULT_MIX)
+        if options['mix']:
+            with open(options['mix'], encoding='utf-8') as mix_file:
+                mix.update(json.load(mix_file))
+        mix = load_mix_from_db(mix)
+        budgets = parse_budgets(options['budget'])
+
+        base_url = options['base_url'].rstrip('/')
+        measure_from = time.perf_counter() + options['warmup']
+        deadline = measure_from + options['duration']
+        samples: List[Tuple[str, bool, str, int, float]] = []  # (endpoint, is_hot, cache_status, status_code, ms)
+        samples_lock = threading.Lock()
+        # 핫 쿼리는 모든 스레드가 같은 목록을 공유해야 반복 요청이 됨
+        shared_hot_queries = QueryMix(mix, options['seed']).hot_queries
+
+        def worker(worker_index: int):
+            query_mix = QueryMix(mix, options['seed'] + worker_index + 1, shared_hot_queries)
+            session = requests.Session()
+            while time.perf_counter() < deadline:
+                path, is_hot = query_mix.next_path()
+                start_time = time.perf_counter()
+                try:
+                    if options['no_keep_alive']:
+                        response = requests.get(base_url + path, timeout=options['timeout'])
+                    else:
+                        response = session.get(base_url + path, timeout=options['timeout'])
+                    status_code, cache_status = response.status_code, response.headers.get('X-Cache', 'UNKNOWN')
+                except requests.RequestException:
+                    status_code, cache_status = 0, 'ERROR'
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+                if start_time >= measure_from:
+                    with samples_lock:
+                        samples.append((path.split('?')[0], is_hot, cache_status, status_code, elapsed_ms))
+            session.close()
+
+        threads = [threading.Thread(target=worker, args=(index,), daemon=True)
+                   for index in range(options['concurrency'])]
+        self.stdout.write(f"부하 테스트 시작: {base_url}, 동시 {options['concurrency']}개, "
+                          f"{options['duration']}초 (+워밍업 {options['warmup']}초), 태그 {len(mix['tag_weights'])}종")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if not samples:
+            raise CommandError("측정된 요청이 없습니다.")
+
+        errors = [sample for sample in samples if not 200 <= sample[3] < 400]
+        shed = sum(1 for sample in samples if sample[3] == 503)
+        self.stdout.write(f"\n총 요청 {len(samples)}건, 처리량 {len(samples) / options['duration']:.1f} req/s, "
+                          f"오류 {len(errors)}건 (그중 503 거절 {shed}건), "
+                          f"핫 쿼리 비율 {sum(s[1] for s in samples) / len(samples):.0%}")
+
+        # 캐시 적중/미스별, 엔드포인트별 지연 시간 분포
+        groups: Dict[Tuple[str, str], List[float]] = {}
+        for endpoint, _, cache_status, status_code, elapsed_ms in samples:
+            if 200 <= status_code < 400:
+                groups.setdefault((cache_status, endpoint), []).append(elapsed_ms)
+                groups.setdefault((cache_status, '*'), []).append(elapsed_ms)
+                groups.setdefault(('ALL', '*'), []).append(elapsed_ms)
+
+        self.stdout.write(f"{'캐시':<8} {'엔드포인트':<18} {'건수':>7} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+        stats: Dict[str, Dict[str, float]] = {}
+        for (cache_status, endpoint), values in sorted(groups.items()):
+            values.sort()
+            row = {'p50': percentile(values, 0.50), 'p95': percentile(values, 0.95), 'p99': percentile(values, 0.99)}
+            if endpoint == '*':
+                stats[cache_status] = row
+            self.stdout.write(f"{cache_status:<8} {endpoint:<18} {len(values):>7} {row['p50']:>9.1f} "
+                              f"{row['p95']:>9.1f} {row['p99']:>9.1f} {values[-1]:>9.1f}")
+
+        # 예산 검사
+        violations = []
+        error_rate = len(errors) / len(samples)
+        if error_rate > options['max_error_rate']:
+            violations.append(f"오류 비율 {error_rate:.2%} > {options['max_error_rate']:.2%}")
+        for cache_status, stat, limit in budgets:
+            if cache_status not in stats:
+                self.stdout.write(self.style.WARNING(f"⚠️ {cache_status} 응답이 없어 {stat} 예산을 검사하지 못했습니다."))
+                continue
+            if stats[cache_status][stat] > limit:
+                violations.append(f"{cache_status} {stat} {stats[cache_status][stat]:.1f}ms > {limit:.1f}ms")
+
+        if violations:
+            raise CommandError("예산 초과: " + ", ".join(violations))
+        self.stdout.write(self.style.SUCCESS("✅ 모든 예산을 만족했습니다."))
@@ -0,0 +1,86 @@
+# myapp/management/commands/startup_profile.py
+
+import os
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_TARGETS = [
+    'analysis_app.views',
+    'data_processor.cache_manager',
+    'data_processor.master_connector',
+    'data_processor.importer',
+]
+
+
+class Command(BaseCommand):
+    help = '새 파이썬 프로세스에서 Django 설정과 대상 모듈을 임포트하며 모듈별 임포트 시간(-X importtime)을 보고합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modules',
+            type=str,
+            default=','.join(DEFAULT_TARGETS),
+            help='임포트할 대상 모듈 (쉼표로 구분)'
+        )
+        parser.add_argument('--top', type=int, default=25, help='누적 시간 기준 상위 몇 개 모듈을 보여줄지 (기본값: 25)')
+        parser.add_argument(
+            '--prewarm',
+            action='store_true',
+            help='지연 임포트 대상(wordcloud, requests 등)까지 미리 임포트한 경우를 측정합니다.'
+        )
+
+    def handle(self, *args, **options):
+        targets = [module.strip() for module in options['modules'].split(',') if module.strip()]
+
+        script_lines = ["import django", "django.setup()"]
+        script_lines += [f"import {module}" for module in targets]
+        if options['prewarm']:
+            script_lines += ["from analysis_app.prewarm import prewarm_heavy_imports", "prewarm_heavy_imports()"]
+
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'DjangoProject1.settings')}
+
+        start_time = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', '; '.join(script_lines)],
+            cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True
+        )
+        wall_time = time.perf_counter() - start_time
+
+        if completed.returncode != 0:
+            raise CommandError(f"대상 모듈 임포트 실패:\n{completed.stderr[-2000:]}")
+
+        # 형식: "import time: self [us] | cumulative | imported package"
+        timings = []
+        for line in completed.stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            try:
+                self_us, cumulative_us, raw_name = line[len('import time:'):].split('|')
+            except ValueError:
+                continue
+            # 모듈 이름 앞 들여쓰기 깊이 = 중첩 임포트 단계
+            depth = len(raw_name) - len(raw_name.lstrip(' '))
+            timings.append((raw_name.strip(), int(self_us), int(cumulative_us), depth))
+
+        # 최상위 패키지별 누적 시간 (가장 얕은 들여쓰기 = 스크립트가 직접 일으킨 임포트)
+        top_level = {}
+        min_depth = min((depth for *_, depth in timings), default=0)
+        for module_name, _, cumulative_us, depth in timings:
+            if depth == min_depth:
+                root = module_name.split('.')[0]
+                top_level[root] = top_level.get(root, 0) + cumulative_us
+
+        self.stdout.write(f"대상: {', '.join(targets)}{' (+prewarm)' if options['prewarm'] else ''}")
+        self.stdout.write(f"프로세스 전체 시간: {wall_time * 1000:.1f} ms, 임포트된 모듈 수: {len(timings)}")
+
+        self.stdout.write(f"\n[누적 시간 상위 {options['top']}개 모듈]")
+        self.stdout.write(f"{'cumulative(ms)':>15} {'self(ms)':>10}  module")
+        for module_name, self_us, cumulative_us, _ in sorted(timings, key=lambda t: -t[2])[:options['top']]:
+            self.stdout.write(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>10.1f}  {module_name}")
+
+        self.stdout.write(f"\n[최상위 패키지별 누적 시간]")
+        for root, cumulative_us in sorted(top_level.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"{cumulative_us / 1000:>15.1f}  {root}")
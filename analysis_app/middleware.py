@@ -1,28 +1,68 @@
+import re
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.base import SessionBase
+
+
+class StatelessSession(SessionBase):
+    """
+    세션 저장소(djongo → MongoDB)를 전혀 조회하거나 저장하지 않는 빈 세션입니다.
+    뷰가 request.session을 읽어도 빈 값만 보이며, 쓴 내용은 버려집니다.
+    """
+
+    def __init__(self):
+        super().__init__(session_key=None)
+        self._session_cache = {}
+
+    def exists(self, session_key):
+        return False
+
+    def create(self):
+        pass
+
+    def save(self, must_create=False):
+        pass
+
+    def delete(self, session_key=None):
+        pass
+
+    def load(self):
+        return {}
+
+    def is_empty(self):
+        # 비어 있다고 알리면 SessionMiddleware가 브라우저의 기존 세션 쿠키를 삭제하므로 False
+        return False
+
+
 class DisableSessionForAPI:
     """
-    특정 URL 경로(/start_distributed_rebuild/)에 대해
-    SessionMiddleware가 동작하기 전에 request에서 세션 객체를 제거하여
-    세션 저장을 근본적으로 차단합니다.
+    settings.STATELESS_URL_PATTERNS에 맞는 URL(조회용 페이지, JSON API 등)에 대해
+    세션과 사용자 인증 조회를 건너뛰어 요청마다 발생하던 세션 DB 왕복을 없앱니다.
+
+    SessionMiddleware, AuthenticationMiddleware 뒤에 등록해야 하며,
+    플래시 메시지는 세션 대신 서명된 쿠키(MESSAGE_STORAGE = CookieStorage)를 사용합니다.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
-        # 세션을 비활성화할 URL 경로 목록
-        self.DISABLE_SESSION_URLS = [
-            '/start_distributed_rebuild/',
-            '/start_distributed_rebuild',
-        ]
+
+    @staticmethod
+    def is_stateless_path(path: str) -> bool:
+        # 설정 변경(벤치마크의 override_settings 등)이 바로 반영되도록 요청마다 읽음
+        return any(re.match(pattern, path) for pattern in getattr(settings, 'STATELESS_URL_PATTERNS', []))
 
     def __call__(self, request):
         # 요청 URL이 세션 비활성화 목록에 있는지 확인
-        if request.path_info in self.DISABLE_SESSION_URLS:
-            # SessionMiddleware보다 먼저 세션 관련 객체를 제거
-            if hasattr(request, 'session'):
-                del request.session
+        if not self.is_stateless_path(request.path_info):
+            return self.get_response(request)
 
-            # (선택 사항: 사용자 인증도 필요 없다면)
-            if hasattr(request, 'user'):
-                request.user = None
+        # 지연 로딩되는 세션/사용자 객체를 DB를 쓰지 않는 객체로 교체
+        request.session = StatelessSession()
+        request.user = AnonymousUser()
 
         response = self.get_response(request)
-        return response
\ No newline at end of file
+
+        # SessionMiddleware가 응답 단계에서 세션을 저장하거나 Vary: Cookie를 붙이지 않도록 표시 초기화
+        request.session.accessed = False
+        request.session.modified = False
+        return response
@@ -0,0 +1,30 @@
+# analysis_app/prewarm.py
+
+import importlib
+import os
+import time
+
+# 첫 사용 시점까지 임포트를 미루는 무거운 모듈 목록 (워드클라우드 렌더링, 워커 HTTP 호출)
+HEAVY_MODULES = [
+    'wordcloud',
+    'requests',
+]
+
+
+def prewarm_heavy_imports():
+    """
+    지연 임포트 대상 모듈을 미리 불러옵니다.
+    첫 요청의 지연을 없애고 싶을 때 워커 프로세스 시작 직후(post-fork) 호출합니다.
+    """
+    for module_name in HEAVY_MODULES:
+        start_time = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+            print(f"🔥 [{os.getpid()}] '{module_name}' 미리 임포트 완료 ({time.perf_counter() - start_time:.4f}초)")
+        except ImportError as e:
+            print(f"⚠️ [{os.getpid()}] '{module_name}' 미리 임포트 실패: {e}")
+
+
+def post_fork(server, worker):
+    """gunicorn 설정 파일에서 'from analysis_app.prewarm import post_fork'로 사용할 수 있는 훅입니다."""
+    prewarm_heavy_imports()
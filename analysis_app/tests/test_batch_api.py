@@ -0,0 +1,60 @@
+# analysis_app/tests/test_batch_api.py
+
+import json
+from unittest import mock
+from django.test import SimpleTestCase, RequestFactory
+from analysis_app import views
+
+
+class BatchApiValidationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(views, 'get_top_nouns_batch', return_value=[{"top_words": []}])
+        self.get_batch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, body):
+        data = body if isinstance(body, bytes) else json.dumps(body)
+        return views.top_words_batch_api_view(
+            self.factory.post('/api/top_words/batch/', data=data, content_type='application/json'))
+
+    def _error(self, body):
+        response = self._post(body)
+        self.assertEqual(response.status_code, 400)
+        return json.loads(response.content)["message"]
+
+    def test_rejects_malformed_requests(self):
+        self._error(b'{not json')
+        self._error(b'\xff\xfe')
+        self._error([{"title": "a"}])
+        self._error({"queries": []})
+        self._error({"queries": [{"title": "a"}], "top_n": 0})
+        self._error({"queries": [{"title": "a"}], "top_n": True})
+        self._error({"queries": [{"title": "a"}], "top_n": "²"})
+        self.assertIn("queries[1]", self._error({"queries": [{"title": "a"}, {"tags": [1, 2]}]}))
+        self.assertIn("queries[0]", self._error({"queries": [{"title": "a", "top_n": "열"}]}))
+        self.assertIn("queries[0]", self._error({"queries": [{"title": "a", "top_n": "1²"}]}))
+        self.assertIn("queries[0]", self._error({"queries": ["title=a"]}))
+        self.get_batch.assert_not_called()
+
+    def test_valid_batch_is_normalized(self):
+        response = self._post({"top_n": "20", "queries": [{"tags": " 경제, 정치 ", "top_n": 5}]})
+        self.assertEqual(response.status_code, 200)
+        conditions, top_n = self.get_batch.call_args[0]
+        self.assertEqual(top_n, 20)
+        self.assertEqual(conditions, [{'title': None, 'tags': ['경제', '정치'], 'start_date': None,
+                                       'end_date': None, 'top_n': 5}])
+
+    def test_partially_rejected_batch_keeps_computed_items(self):
+        rejected = {"error": "혼잡", "status": 503, "retry_after": 5}
+        self.get_batch.return_value = [{"top_words": [], "cache_hit": True}, rejected]
+        response = self._post({"queries": [{"title": "a"}, {"title": "b"}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Retry-After'], '5')
+        self.assertEqual(json.loads(response.content)["results"][1], rejected)
+
+        self.get_batch.return_value = [rejected, rejected]
+        response = self._post({"queries": [{"title": "a"}, {"title": "b"}]})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
@@ -0,0 +1,39 @@
+# analysis_app/tests/test_lazy_imports.py
+
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase
+from analysis_app import prewarm
+from analysis_app.prewarm import HEAVY_MODULES, prewarm_heavy_imports
+from analysis_app.management.commands.startup_profile import DEFAULT_TARGETS
+
+
+class LazyImportTests(SimpleTestCase):
+
+    def test_entry_modules_do_not_import_heavy_modules(self):
+        # 이미 임포트된 모듈의 영향을 받지 않도록 새 인터프리터에서 확인
+        script = "; ".join(
+            ["import django", "django.setup()"]
+            + [f"import {module}" for module in DEFAULT_TARGETS]
+            + ["import json, sys",
+               f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"]
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'DjangoProject1.settings')}
+        completed = subprocess.run([sys.executable, '-c', script], cwd=str(settings.BASE_DIR), env=env,
+                                   capture_output=True, text=True, timeout=60)
+
+        self.assertEqual(completed.returncode, 0, completed.stderr[-2000:])
+        self.assertEqual(json.loads(completed.stdout.strip().splitlines()[-1]), [])
+
+    def test_prewarm_imports_every_heavy_module(self):
+        def fail_first(name):
+            if name == HEAVY_MODULES[0]:
+                raise ImportError("없음")
+
+        with mock.patch.object(prewarm.importlib, 'import_module', side_effect=fail_first) as import_module:
+            prewarm_heavy_imports()  # 하나가 실패해도 나머지를 계속 임포트
+        self.assertEqual([call.args[0] for call in import_module.call_args_list], HEAVY_MODULES)
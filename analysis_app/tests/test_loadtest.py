@@ -0,0 +1,75 @@
+# analysis_app/tests/test_loadtest.py
+
+from urllib.parse import urlsplit, parse_qs
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from analysis_app.management.commands import loadtest
+from analysis_app.management.commands.loadtest import (
+    DEFAULT_MIX, QueryMix, parse_budgets, percentile, sample_title_terms, load_mix_from_db
+)
+from data_processor.constants import DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_HEADING, DB_FIELD_HEADING_TOKENS
+from data_processor.tests.fakes import FakeCollection, patch_mongodb_client
+
+
+def _mix(**overrides):
+    return {**DEFAULT_MIX, "tag_weights": {"Politics": 5, "Business": 1}, "date_range": ["2019-01-01", "2019-12-31"],
+            "title_terms": ["budget", "election"], **overrides}
+
+
+class LoadTestParsingTests(SimpleTestCase):
+
+    def test_parse_budgets(self):
+        self.assertEqual(parse_budgets("hit:p95=200, MISS:P99=8000,all:p50=100"),
+                         [("HIT", "p95", 200.0), ("MISS", "p99", 8000.0), ("ALL", "p50", 100.0)])
+        self.assertEqual(parse_budgets(None), [])
+        for value in ("hit:p90=200", "warm:p95=1", "hit=200", "hit:p95=fast"):
+            with self.subTest(value=value), self.assertRaises(CommandError):
+                parse_budgets(value)
+
+    def test_percentile_is_nearest_rank(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 0.50), 50.0)
+        self.assertEqual(percentile(values, 0.99), 99.0)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+
+class QueryMixTests(SimpleTestCase):
+
+    def test_same_seed_gives_same_requests(self):
+        first, second = QueryMix(_mix(), seed=7), QueryMix(_mix(), seed=7)
+        self.assertEqual([first.next_path() for _ in range(50)], [second.next_path() for _ in range(50)])
+
+    def test_cold_queries_stay_inside_the_mix(self):
+        query_mix = QueryMix(_mix(date_share=1.0, title_share=1.0), seed=3)
+        for _ in range(100):
+            path, _ = query_mix.next_path()
+            params = {key: values[0] for key, values in parse_qs(urlsplit(path).query).items()}
+            self.assertIn(urlsplit(path).path, ('/api/top_words/', '/wordcloud/'))
+            self.assertTrue(set(params.get("tags", "Politics").split(",")) <= {"Politics", "Business"})
+            self.assertIn(params["title"], ("budget", "election"))
+            self.assertTrue("2019-01-01" <= params["start_date"] <= params["end_date"] <= "2019-12-31")
+
+    def test_invalid_date_range_disables_date_conditions(self):
+        query_mix = QueryMix(_mix(date_range=["2019/01/01", "2019-12-31"], date_share=1.0), seed=1)
+        self.assertIsNone(query_mix.date_range)
+        self.assertNotIn("start_date", query_mix.cold_query())
+
+
+class TitleTermSamplingTests(SimpleTestCase):
+
+    def test_falls_back_to_heading_before_backfill(self):
+        collection = FakeCollection(RECORD_NOUNS_COLLECTION)
+        collection.aggregate_results = [[
+            {DB_FIELD_HEADING_TOKENS: ["budget", "vote"]},
+            {DB_FIELD_HEADING: "Budget talks stall"},  # heading_tokens 백필 전 레코드
+            {DB_FIELD_HEADING: None},
+        ]]
+        self.assertEqual(sample_title_terms(collection), ["budget", "vote", "talks", "stall"])
+
+    def test_load_mix_fills_only_missing_parts(self):
+        with patch_mongodb_client(loadtest) as client:
+            collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            collection.aggregate_results = [[{DB_FIELD_HEADING: "Election results"}]]
+            mix = load_mix_from_db(_mix(title_terms=[]))
+        self.assertEqual(mix["title_terms"], ["election", "results"])
+        self.assertEqual(len(collection.pipelines), 1)  # 태그/날짜는 이미 있으므로 조회하지 않음
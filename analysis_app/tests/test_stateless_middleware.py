@@ -0,0 +1,63 @@
+# analysis_app/tests/test_stateless_middleware.py
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.http import HttpResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from analysis_app.middleware import DisableSessionForAPI, StatelessSession
+
+
+class StatelessUrlPatternTests(SimpleTestCase):
+
+    def test_configured_patterns(self):
+        for path in ('/', '/wordcloud/', '/api/top_words/', '/api/trends/rising/', '/start_distributed_rebuild/',
+                     '/reset_all_db/', '/worker_notification/'):
+            with self.subTest(path=path):
+                self.assertTrue(DisableSessionForAPI.is_stateless_path(path))
+        for path in ('/admin/', '/admin/login/', '/apis', '/static/app.css'):
+            with self.subTest(path=path):
+                self.assertFalse(DisableSessionForAPI.is_stateless_path(path))
+
+    def test_patterns_are_read_per_request(self):
+        with override_settings(STATELESS_URL_PATTERNS=[]):
+            self.assertFalse(DisableSessionForAPI.is_stateless_path('/api/top_words/'))
+
+
+class DisableSessionForAPITests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _run(self, path, view):
+        """SessionMiddleware -> DisableSessionForAPI -> view 순서로 실행합니다. (settings.MIDDLEWARE와 같은 순서)"""
+        request = self.factory.get(path)
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = 'existing-session-key'
+        return request, SessionMiddleware(DisableSessionForAPI(view))(request)
+
+    def test_stateless_path_never_touches_session_store(self):
+        seen = {}
+
+        def view(request):
+            seen['session'] = request.session
+            seen['authenticated'] = request.user.is_authenticated
+            request.session['written'] = True  # 버려져야 함
+            return HttpResponse('ok')
+
+        request, response = self._run('/api/top_words/', view)
+        self.assertIsInstance(seen['session'], StatelessSession)
+        self.assertFalse(seen['authenticated'])
+        self.assertEqual(seen['session'].load(), {})
+        # 저장/Vary: Cookie/기존 세션 쿠키 삭제가 모두 일어나지 않음
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_other_paths_keep_the_real_session(self):
+        seen = {}
+
+        def view(request):
+            seen['session'] = request.session
+            return HttpResponse('ok')
+
+        self._run('/admin/', view)
+        self.assertNotIsInstance(seen['session'], StatelessSession)
+        self.assertEqual(seen['session'].session_key, 'existing-session-key')
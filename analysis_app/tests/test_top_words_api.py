@@ -0,0 +1,139 @@
+# analysis_app/tests/test_top_words_api.py
+
+import gzip
+import json
+from unittest import mock
+from django.test import SimpleTestCase, RequestFactory
+from data_processor.constants import (
+    API_COMPRESS_MIN_BYTES, CACHE_FIELD_TOP_WORDS, CACHE_FIELD_TOTAL_RECORDS, ENGINE_APPROXIMATE, ENGINE_SAMPLED
+)
+from analysis_app import views
+from analysis_app.http_utils import (
+    choose_content_encoding, make_strong_etag, encoded_etag, etag_matches, compressed_json_response,
+    mark_cache_status, CACHE_STATUS_HEADER
+)
+
+
+class HttpUtilsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_choose_content_encoding(self):
+        self.assertEqual(choose_content_encoding(self.factory.get('/', HTTP_ACCEPT_ENCODING='deflate, gzip;q=0.8')),
+                         'gzip')
+        self.assertIsNone(choose_content_encoding(self.factory.get('/', HTTP_ACCEPT_ENCODING='identity')))
+        self.assertIsNone(choose_content_encoding(self.factory.get('/')))
+
+    def test_etag_depends_on_key_and_version(self):
+        key = {'title': '선거', 'top_n': 10}
+        etag = make_strong_etag(key, 3)
+        self.assertEqual(etag, make_strong_etag(dict(reversed(list(key.items()))), 3))
+        self.assertNotEqual(etag, make_strong_etag(key, 4))
+        self.assertEqual(encoded_etag(etag, 'gzip'), etag[:-1] + '-gzip"')
+        self.assertEqual(encoded_etag(etag, None), etag)
+
+    def test_etag_matches(self):
+        etag = '"abc"'
+        self.assertEqual(etag_matches(self.factory.get('/', HTTP_IF_NONE_MATCH='"x", "abc"'), etag), etag)
+        self.assertEqual(etag_matches(self.factory.get('/', HTTP_IF_NONE_MATCH='*'), etag), etag)
+        self.assertIsNone(etag_matches(self.factory.get('/', HTTP_IF_NONE_MATCH='"abcd"'), etag))
+        self.assertIsNone(etag_matches(self.factory.get('/'), etag))
+        # 인코딩을 고른 요청은 압축/비압축 표현 중 클라이언트가 가진 쪽의 ETag로 304를 보냄
+        self.assertEqual(etag_matches(self.factory.get('/', HTTP_IF_NONE_MATCH='"abc-gzip"'), etag, 'gzip'),
+                         '"abc-gzip"')
+        self.assertEqual(etag_matches(self.factory.get('/', HTTP_IF_NONE_MATCH='"abc"'), etag, 'gzip'), etag)
+        self.assertIsNone(etag_matches(self.factory.get('/', HTTP_IF_NONE_MATCH='"abc-gzip"'), etag))
+
+    def test_compressed_json_response(self):
+        payload = {"top_words": [{"word": f"명사{i}", "count": i} for i in range(API_COMPRESS_MIN_BYTES)]}
+        response = compressed_json_response(payload, 'gzip', '"e"')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), payload)
+        self.assertEqual(response['ETag'], '"e-gzip"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        # 작은 본문은 압축하지 않으므로 ETag에도 인코딩을 붙이지 않음
+        small = compressed_json_response({"a": 1}, 'gzip', '"e"')
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertEqual(small['ETag'], '"e"')
+
+        provisional = compressed_json_response({"a": 1}, 'gzip', None)
+        self.assertFalse(provisional.has_header('ETag'))
+        self.assertIn('no-cache', provisional['Cache-Control'])
+
+    def test_mark_cache_status(self):
+        response = compressed_json_response({}, None, None)
+        self.assertEqual(mark_cache_status(response, {'cache_hit': True})[CACHE_STATUS_HEADER], 'HIT')
+        self.assertEqual(mark_cache_status(response, {'cache_hit': False})[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(mark_cache_status(response, None)[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(mark_cache_status(response, {'degraded': True})[CACHE_STATUS_HEADER], 'DEGRADED')
+
+
+class TopWordsApiETagTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.result_doc = {CACHE_FIELD_TOP_WORDS: [{"word": "경제", "count": 5}], CACHE_FIELD_TOTAL_RECORDS: 2,
+                           'cache_hit': True}
+        patches = [
+            mock.patch.object(views, 'get_data_version', return_value=7),
+            mock.patch.object(views, 'derived_collections_current', return_value=True),
+            mock.patch.object(views, 'get_top_nouns_document', return_value=self.result_doc),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get(self, query='title=경제', **headers):
+        return views.top_words_api_view(self.factory.get(f'/api/top_words/?{query}', **headers))
+
+    def test_matching_etag_returns_304_without_aggregation(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["top_words"], self.result_doc[CACHE_FIELD_TOP_WORDS])
+        etag = response['ETag']
+
+        views.get_top_nouns_document.reset_mock()
+        not_modified = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        views.get_top_nouns_document.assert_not_called()
+
+    def test_compressed_representation_etag_round_trips(self):
+        self.result_doc[CACHE_FIELD_TOP_WORDS] = [{"word": f"명사{i}", "count": i}
+                                                  for i in range(API_COMPRESS_MIN_BYTES)]
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].endswith('-gzip"'))
+        not_modified = self._get(HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+
+    def test_small_body_etag_has_no_encoding_suffix(self):
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response['ETag'].endswith('-gzip"'))
+        self.assertEqual(self._get(HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_new_data_version_changes_etag(self):
+        etag = self._get()['ETag']
+        views.get_data_version.return_value = 8
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_provisional_results_have_no_etag(self):
+        self.result_doc['engine'] = ENGINE_SAMPLED
+        self.assertFalse(self._get('title=경제&sampled=true').has_header('ETag'))
+
+        self.result_doc['engine'] = ENGINE_APPROXIMATE
+        views.derived_collections_current.return_value = False
+        self.assertFalse(self._get('tags=경제&approximate=true').has_header('ETag'))
+        views.derived_collections_current.return_value = True
+        self.assertTrue(self._get('tags=경제&approximate=true').has_header('ETag'))
+
+    def test_missing_conditions_and_db_errors(self):
+        self.assertEqual(self._get('').status_code, 400)
+        views.get_data_version.return_value = None
+        self.assertEqual(self._get().status_code, 503)
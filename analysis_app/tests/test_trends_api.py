@@ -0,0 +1,40 @@
+# analysis_app/tests/test_trends_api.py
+
+import json
+from unittest import mock
+from django.test import SimpleTestCase, RequestFactory
+from analysis_app import views
+from data_processor.admission import AdmissionRejected
+from data_processor.constants import TREND_RISING_MAX_LIMIT
+
+
+class TrendsApiTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        for name, value in (('get_data_version', 3), ('derived_collections_current', True)):
+            patcher = mock.patch.object(views, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_rising_limit_is_bounded(self):
+        with mock.patch.object(views, 'get_rising_nouns', return_value=[]) as get_rising:
+            for limit in ('0', '-3', str(TREND_RISING_MAX_LIMIT + 1), 'many'):
+                with self.subTest(limit=limit):
+                    response = views.rising_nouns_api_view(self.factory.get(
+                        '/api/trends/rising/', {'period_a': '2024-01', 'period_b': '2024-02', 'limit': limit}))
+                    self.assertEqual(response.status_code, 400)
+            get_rising.assert_not_called()
+
+            response = views.rising_nouns_api_view(self.factory.get(
+                '/api/trends/rising/', {'period_a': '2024-01', 'period_b': '2024-02',
+                                        'limit': str(TREND_RISING_MAX_LIMIT)}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_rising.call_args.kwargs['limit'], TREND_RISING_MAX_LIMIT)
+
+    def test_title_trends_overload_is_503_with_retry_after(self):
+        with mock.patch.object(views, 'get_noun_trends', side_effect=AdmissionRejected("혼잡", retry_after=9)):
+            response = views.trends_api_view(self.factory.get('/api/trends/', {'nouns': '경제', 'title': 'budget'}))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '9')
+        self.assertEqual(json.loads(response.content)["retry_after"], 9)
@@ -0,0 +1,28 @@
+# analysis_app/tests/test_worker_notification.py
+
+import json
+from django.test import SimpleTestCase, RequestFactory
+from data_processor.constants import TRANSPORT_CONTENT_TYPE
+from data_processor.transport import MESSAGE_RESULT, CODEC_JSON, encode_frame
+from analysis_app import views
+
+
+class WorkerNotificationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _post(self, data, content_type):
+        return views.worker_notification_view(
+            self.factory.post('/worker_notification/', data=data, content_type=content_type))
+
+    def test_json_and_frame_notifications(self):
+        body = {"worker_name": "w1", "status": "SUCCESS"}
+        self.assertEqual(self._post(json.dumps(body), 'application/json').status_code, 200)
+        frame = encode_frame(MESSAGE_RESULT, body, CODEC_JSON)
+        self.assertEqual(self._post(frame, TRANSPORT_CONTENT_TYPE).status_code, 200)
+
+    def test_malformed_notifications_are_client_errors(self):
+        self.assertEqual(self._post('[1, 2]', 'application/json').status_code, 400)
+        self.assertEqual(self._post(b'\xff', 'application/json').status_code, 400)
+        self.assertEqual(self._post(b'TCF\x63garbage', TRANSPORT_CONTENT_TYPE).status_code, 400)
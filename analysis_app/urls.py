@@ -13,4 +13,13 @@ urlpatterns = [
     path('wordcloud/', views.wordcloud_view, name='wordcloud_view'),
 # analysis_app/urls.py에 추가
     path('worker_notification/', views.worker_notification_view, name='worker_notification'),
+    # 조건부 상위 명사 JSON API (이미지 렌더링 없음, ETag/304 지원)
+    path('api/top_words/', views.top_words_api_view, name='top_words_api'),
+    # 여러 조건 세트를 한 번의 검색으로 계산하는 배치 API (POST JSON)
+    path('api/top_words/batch/', views.top_words_batch_api_view, name='top_words_batch_api'),
+    # 조건부 전체 명사 빈도표 스트리밍 내보내기 (NDJSON/CSV)
+    path('api/export/', views.export_distribution_view, name='export_distribution'),
+    # 명사 추세 (월/주별 빈도 시계열) 및 두 기간 사이 상승 명사 순위
+    path('api/trends/', views.trends_api_view, name='trends_api'),
+    path('api/trends/rising/', views.rising_nouns_api_view, name='rising_nouns_api'),
 ]
\ No newline at end of file
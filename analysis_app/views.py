@@ -1,19 +1,32 @@
 # analysis_app/views.py
 
 from django.shortcuts import render, redirect
+from django.contrib import messages
 from django.urls import reverse
-from django.http import JsonResponse
-from wordcloud import WordCloud
+from django.http import JsonResponse, StreamingHttpResponse
 import io
 import base64
 from typing import List, Tuple, Optional, Dict, Any
 # 마스터 로직 임포트
-from data_processor.cache_manager import get_top_nouns_for_conditions
+from data_processor.cache_manager import (
+    get_top_nouns_document, normalize_query_conditions, build_cache_key, get_top_nouns_batch
+)
+from data_processor.admission import AdmissionRejected
+from data_processor.transport import (
+    decode_frames, counters_from_body, frame_to_json, TransportError,
+    MESSAGE_NOTIFICATION, MESSAGE_PROGRESS, MESSAGE_COUNTERS, MESSAGE_RESULT
+)
+from data_processor.data_version import get_data_version, derived_collections_current
+from data_processor.exporter import iter_export_lines, EXPORT_FORMATS
+from data_processor.trends import get_noun_trends, get_rising_nouns, GRANULARITY_MONTH
 from data_processor.importer import reset_all_db  # 마스터 전용 DB 초기화 함수 사용
 from data_processor.master_connector import distribute_importer_rebuild  # 분산 처리 기능 사용
-from data_processor.constants import TOP_N
+from data_processor.constants import TOP_N, BATCH_MAX_QUERIES, CACHE_FIELD_TOP_WORDS, CACHE_FIELD_TOTAL_RECORDS, ENGINE_EXACT, \
+    ENGINE_APPROXIMATE, ENGINE_SAMPLED, TRANSPORT_CONTENT_TYPE, TREND_RISING_MAX_LIMIT
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_GET
+from .http_utils import choose_content_encoding, make_strong_etag, etag_matches, not_modified_response, \
+    compressed_json_response, mark_cache_status
 import json
 
 
@@ -22,6 +35,9 @@ def generate_word_cloud_image(word_counts: List[Dict[str, int]]) -> Optional[str
     word_freq_dict = {item['word']: item['count'] for item in word_counts}
     if not word_freq_dict: return None
 
+    # wordcloud는 PIL, NumPy, matplotlib 컬러맵까지 불러오므로 실제로 이미지를 만들 때만 임포트
+    from wordcloud import WordCloud
+
     try:
         # 폰트 경로 필요시 수정
         # font_path = 'static/malgun.ttf'
@@ -48,8 +64,14 @@ def generate_word_cloud_image(word_counts: List[Dict[str, int]]) -> Optional[str
 
 def index(request):
     """메인 페이지 뷰 (분산 전용)"""
-    success_message = request.session.pop('success_message', None)
-    warning_message = request.session.pop('warning_message', None)
+    # 플래시 메시지는 서명된 쿠키(CookieStorage)에서 읽음 (세션 DB 조회 없음)
+    success_message = None
+    warning_message = None
+    for message in messages.get_messages(request):
+        if message.level == messages.WARNING:
+            warning_message = message.message
+        else:
+            success_message = message.message
 
     # 중간 데이터 존재 여부 확인 로직 제거로 이 플래그는 항상 False
     show_rebuild_prompt = False
@@ -60,6 +82,8 @@ def index(request):
         'start_date': request.GET.get('start_date', ''),
         'end_date': request.GET.get('end_date', ''),
         'top_n': request.GET.get('top_n', str(TOP_N)),
+        'approximate': parse_engine(request) == ENGINE_APPROXIMATE,
+        'sampled': parse_engine(request) == ENGINE_SAMPLED,
     }
 
     return render(request, 'analysis_app/index.html', {
@@ -75,14 +99,13 @@ def index(request):
 def start_distributed_rebuild_view(request):
     """[분산 병렬] DB 데이터 재생성 AJAX 요청 처리 뷰 (워커 호출)"""
     if request.method == 'POST':
-        request.session.modified = False
         try:
             # master_connector.py의 로직 호출
             response_data = distribute_importer_rebuild()
 
             master_total_time = response_data.get('master_total_time', 0.0)
 
-            request.session['success_message'] = f"✅ 분산 병렬 ImFiles 데이터 재생성 완료! (마스터 총 경과 시간: {master_total_time:.4f}초)"
+            messages.success(request, f"✅ 분산 병렬 ImFiles 데이터 재생성 완료! (마스터 총 경과 시간: {master_total_time:.4f}초)")
 
             return JsonResponse({
                 "status": "COMPLETED",
@@ -103,9 +126,9 @@ def reset_all_db_view(request):
     if request.method == 'POST':
         try:
             if reset_all_db():
-                request.session['success_message'] = "🗑️ 모든 DB 컬렉션이 성공적으로 초기화되었습니다."
+                messages.success(request, "🗑️ 모든 DB 컬렉션이 성공적으로 초기화되었습니다.")
             else:
-                request.session['success_message'] = "⚠️ DB 초기화 중 오류가 발생했습니다. 로그를 확인하세요."
+                messages.warning(request, "⚠️ DB 초기화 중 오류가 발생했습니다. 로그를 확인하세요.")
         except Exception as e:
             return render(request, 'analysis_app/error.html', {
                 'message': f'DB 초기화 중 치명적인 오류 발생: {e}'
@@ -114,16 +137,9 @@ def reset_all_db_view(request):
     return redirect(reverse('index'))
 
 
-def wordcloud_view(request):
-    """
-    WordCloud 표시 뷰: GET 쿼리 매개변수를 받아 조건부 워드클라우드를 생성합니다.
-    """
-
-    # 1. 쿼리 매개변수 추출
-    title = request.GET.get('title')
+def parse_query_params(request) -> Tuple[Dict[str, Any], int]:
+    """GET 쿼리 매개변수에서 조건 딕셔너리와 top_n을 추출합니다."""
     tags_input = request.GET.get('tags')
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
     top_n = request.GET.get('top_n', TOP_N)
 
     try:
@@ -133,13 +149,44 @@ def wordcloud_view(request):
 
     parsed_tags = [tag.strip() for tag in tags_input.split(',') if tag.strip()] if tags_input else None
 
-    # 2. 쿼리 객체(딕셔너리) 구성
     query_conditions: Dict[str, Any] = {
-        'title': title,
+        'title': request.GET.get('title'),
         'tags': parsed_tags,
-        'start_date': start_date,
-        'end_date': end_date,
+        'start_date': request.GET.get('start_date'),
+        'end_date': request.GET.get('end_date'),
     }
+    return query_conditions, top_n
+
+
+def parse_engine(request) -> str:
+    """
+    'approximate=true'이면 근사 엔진을, 'sampled=true'이면 표본 추정 엔진을, 없으면 정확 엔진을 선택합니다.
+    """
+    def is_on(name: str) -> bool:
+        return request.GET.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+    if is_on('approximate'):
+        return ENGINE_APPROXIMATE
+    if is_on('sampled'):
+        return ENGINE_SAMPLED
+    return ENGINE_EXACT
+
+
+# 근사/표본 엔진 응답에만 포함되는 오차 관련 필드
+APPROXIMATE_RESULT_FIELDS = ('error_bound', 'guaranteed_top_set', 'sample_size', 'confidence', 'rank_stability')
+
+
+def wordcloud_view(request):
+    """
+    WordCloud 표시 뷰: GET 쿼리 매개변수를 받아 조건부 워드클라우드를 생성합니다.
+    """
+
+    # 1. 쿼리 매개변수 추출 및 2. 쿼리 객체(딕셔너리) 구성
+    query_conditions, top_n = parse_query_params(request)
+    title = query_conditions['title']
+    parsed_tags = query_conditions['tags']
+    start_date = query_conditions['start_date']
+    end_date = query_conditions['end_date']
 
     # 유효성 검사: 최소 하나의 조건이 있어야 함
     if not (title or parsed_tags or start_date or end_date):
@@ -149,16 +196,28 @@ def wordcloud_view(request):
 
     # 3. cache_manager를 통해 조건부 명사 데이터 가져오기
     # 이 함수 내부에서 1차 검색 실패 시 자동 재처리(rebuild) 후 2차 검색이 시도됩니다.
-    top_words_data = get_top_nouns_for_conditions(
-        query_conditions=query_conditions,
-        top_n=top_n
-    )
-
-    if top_words_data is None:
+    # 캐시 미스 집계는 동시 실행 제한을 거치며, 슬롯이 없으면 추정치로 응답하거나 503을 반환합니다.
+    try:
+        result_doc = get_top_nouns_document(
+            query_conditions=query_conditions,
+            top_n=top_n,
+            engine=parse_engine(request),
+            admission=True
+        )
+    except AdmissionRejected as e:
+        response = render(request, 'analysis_app/error.html', {
+            'message': f'요청이 많아 지금은 새 조건을 집계할 수 없습니다. {e.retry_after}초 후 다시 시도하세요.'
+        }, status=503)
+        response['Retry-After'] = str(e.retry_after)
+        return response
+
+    if result_doc is None:
         return render(request, 'analysis_app/error.html', {
             'message': '데이터를 처리하는 중 오류가 발생했습니다. 데이터베이스 연결을 확인하세요.'
         }, status=500)
 
+    top_words_data = result_doc.get(CACHE_FIELD_TOP_WORDS, [])
+
     # 4. 데이터로 워드클라우드 이미지 생성
     image_base64 = generate_word_cloud_image(top_words_data)
 
@@ -172,21 +231,49 @@ def wordcloud_view(request):
 
         'image_base64': image_base64,
         'top_words': top_words_data,
+        'engine': result_doc.get('engine', ENGINE_EXACT),
+        'error_bound': result_doc.get('error_bound'),
+        'sample_size': result_doc.get('sample_size'),
+        'confidence': result_doc.get('confidence'),
+        'degraded': result_doc.get('degraded', False),
     }
 
-    return render(request, 'analysis_app/wordcloud.html', context)
+    return mark_cache_status(render(request, 'analysis_app/wordcloud.html', context), result_doc)
+
+
+def _parse_worker_notification(request) -> Dict[str, Any]:
+    """
+    워커 알림 본문을 읽습니다. 바이너리 프레임(data_processor.transport)이면 진행 상황/빈도 프레임은 로그로 남기고
+    알림(NOTIFICATION/RESULT) 프레임 본문을 반환하며, 그 외에는 기존처럼 JSON으로 해석합니다.
+    본문이 객체(dict)가 아니면 ValueError가 발생합니다. (프레임 본문은 transport에서 이미 검사)
+    """
+    if request.content_type != TRANSPORT_CONTENT_TYPE:
+        data = json.loads(request.body.decode('utf-8'))
+        if not isinstance(data, dict):
+            raise ValueError(f"알림 본문은 JSON 객체여야 합니다: {type(data).__name__}")
+        return data
+
+    data: Dict[str, Any] = {}
+    for frame in decode_frames(request.body):
+        if frame.message_type == MESSAGE_PROGRESS:
+            print(f"[Master] ⏳ Worker 진행 상황: {frame_to_json(frame)}")
+        elif frame.message_type == MESSAGE_COUNTERS:
+            print(f"[Master] 📦 Worker 빈도 묶음 수신: 명사 {len(counters_from_body(frame.body))}종")
+        elif frame.message_type in (MESSAGE_NOTIFICATION, MESSAGE_RESULT):
+            data = frame.body
+    return data
 
 
 @require_POST
 @csrf_exempt
 def worker_notification_view(request):
     """
-    Worker 서버로부터 데이터 재생성 완료 상태를 JSON 형태로 수신합니다.
+    Worker 서버로부터 데이터 재생성 완료 상태를 JSON 또는 바이너리 프레임 형태로 수신합니다.
     (CSRF 토큰 검증은 비활성화합니다. 외부 API 통신이므로)
     """
     try:
-        # 1. POST 본문에서 JSON 데이터 파싱
-        data = json.loads(request.body.decode('utf-8'))
+        # 1. POST 본문에서 JSON(또는 프레임) 데이터 파싱
+        data = _parse_worker_notification(request)
 
         worker_name = data.get('worker_name', 'UNKNOWN_WORKER')
         status = data.get('status', 'FAILURE')
@@ -207,10 +294,301 @@ def worker_notification_view(request):
             "message": f"Notification received from {worker_name}"
         }, status=200)
 
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, UnicodeDecodeError):
         print("[Master] ❌ Worker 알림 수신 오류: 유효하지 않은 JSON 형식")
         return JsonResponse({"status": "error", "message": "Invalid JSON format"}, status=400)
 
+    except TransportError as e:
+        print(f"[Master] ❌ Worker 알림 수신 오류: 잘못된 프레임 ({e})")
+        return JsonResponse({"status": "error", "message": f"Invalid frame: {e}"}, status=400)
+
+    except ValueError as e:
+        print(f"[Master] ❌ Worker 알림 수신 오류: {e}")
+        return JsonResponse({"status": "error", "message": f"Invalid notification: {e}"}, status=400)
+
     except Exception as e:
         print(f"[Master] ❌ Worker 알림 처리 중 알 수 없는 오류: {e}")
-        return JsonResponse({"status": "error", "message": f"Server error: {e}"}, status=500)
\ No newline at end of file
+        return JsonResponse({"status": "error", "message": f"Server error: {e}"}, status=500)
+
+
+def _overloaded_json_response(rejection: AdmissionRejected) -> JsonResponse:
+    """캐시 미스 집계 슬롯이 없을 때의 빠른 503 응답 (Retry-After 포함)"""
+    response = JsonResponse({"status": "error", "message": str(rejection), "retry_after": rejection.retry_after},
+                            status=503, json_dumps_params={'ensure_ascii': False})
+    response['Retry-After'] = str(rejection.retry_after)
+    return response
+
+
+@require_GET
+def top_words_api_view(request):
+    """
+    JSON API: 조건별 상위 명사 목록을 이미지 렌더링 없이 JSON으로 반환합니다.
+    캐시 키 + 데이터 버전으로 만든 강한 ETag로 조건부 GET(304)을 지원하고, gzip/brotli로 압축합니다.
+    """
+    query_conditions, top_n = parse_query_params(request)
+
+    processed_conditions = normalize_query_conditions(query_conditions)
+    if processed_conditions is None:
+        return JsonResponse({
+            "status": "error",
+            "message": "title, tags, start_date, end_date 중 최소한 하나는 입력해야 합니다."
+        }, status=400)
+
+    data_version = get_data_version()
+    if data_version is None:
+        return JsonResponse({"status": "error", "message": "데이터베이스 연결 오류"}, status=503)
+
+    # 1. 집계 전에 ETag를 먼저 계산하여, 클라이언트가 최신 데이터를 가지고 있으면 바로 304 반환
+    engine = parse_engine(request)
+    cache_key = {**build_cache_key(processed_conditions, top_n), 'engine': engine}
+    encoding = choose_content_encoding(request)
+    etag = make_strong_etag(cache_key, data_version)
+
+    matched_etag = etag_matches(request, etag, encoding)
+    if matched_etag:
+        return not_modified_response(matched_etag)
+
+    # 2. 캐시 조회 (미스 시 동시 실행 제한을 거쳐 계산 및 저장)
+    try:
+        result_doc = get_top_nouns_document(processed_conditions, top_n, engine=engine, admission=True)
+    except AdmissionRejected as e:
+        return _overloaded_json_response(e)
+    if result_doc is None:
+        return JsonResponse({"status": "error", "message": "데이터 처리 중 오류가 발생했습니다."}, status=500)
+
+    payload = {
+        "query": {
+            "title": processed_conditions['title'],
+            "tags": processed_conditions['tags'] or [],
+            "start_date": processed_conditions['start_date'],
+            "end_date": processed_conditions['end_date'],
+        },
+        "top_n": top_n,
+        "data_version": data_version,
+        "engine": result_doc.get('engine', ENGINE_EXACT),
+        "total_records": result_doc.get(CACHE_FIELD_TOTAL_RECORDS, 0),
+        "top_words": result_doc.get(CACHE_FIELD_TOP_WORDS, []),
+    }
+    payload.update({field: result_doc[field] for field in APPROXIMATE_RESULT_FIELDS if field in result_doc})
+
+    if result_doc.get('degraded'):
+        payload["degraded"] = True
+
+    # 표본 추정치와 혼잡 시 추정치는 나중에 정확한 결과로 바뀌므로 ETag를 붙이지 않음
+    # (재생성 직후 아직 이전 세대의 스케치로 만든 근사 결과도 마찬가지)
+    if payload["engine"] == ENGINE_SAMPLED or payload.get("degraded"):
+        etag = None
+    elif payload["engine"] == ENGINE_APPROXIMATE and not derived_collections_current():
+        etag = None
+    return mark_cache_status(compressed_json_response(payload, encoding, etag), result_doc)
+
+
+@require_GET
+def export_distribution_view(request):
+    """
+    조건에 맞는 전체 명사 빈도표를 NDJSON(기본) 또는 CSV로 스트리밍합니다.
+    (상위 N개로 자르지 않으며, 서버 측 커서를 배치 단위로 읽어 메모리 사용량이 일정합니다.)
+    """
+    query_conditions, _ = parse_query_params(request)
+    export_format = request.GET.get('format', 'ndjson').lower()
+
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({
+            "status": "error",
+            "message": f"format은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다."
+        }, status=400)
+
+    processed_conditions = normalize_query_conditions(query_conditions)
+    if processed_conditions is None:
+        return JsonResponse({
+            "status": "error",
+            "message": "title, tags, start_date, end_date 중 최소한 하나는 입력해야 합니다."
+        }, status=400)
+
+    # 커서를 먼저 열어 DB 오류는 스트리밍 시작 전에 503으로 응답 (200 헤더가 나간 뒤에는 알릴 수 없음)
+    try:
+        lines = iter_export_lines(processed_conditions, export_format)
+    except ConnectionError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=503)
+
+    content_type = 'text/csv; charset=utf-8' if export_format == 'csv' else 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="noun_distribution.{export_format}"'
+    return response
+
+
+def _parse_positive_int(value: Any) -> Optional[int]:
+    """1 이상의 정수(또는 정수 문자열)이면 int로, 아니면 None을 반환합니다."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            value = int(value.strip())
+        except ValueError:
+            return None
+    return value if isinstance(value, int) and value > 0 else None
+
+
+def _parse_batch_item(query: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """배치 API의 조건 세트 하나를 검증하여 (조건 딕셔너리, 오류 메시지) 중 하나를 반환합니다."""
+    if not isinstance(query, dict):
+        return None, "조건 세트는 JSON 객체여야 합니다."
+    for field in ('title', 'start_date', 'end_date'):
+        if query.get(field) is not None and not isinstance(query[field], str):
+            return None, f"'{field}'는 문자열이어야 합니다."
+
+    tags = query.get('tags')
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+    elif tags is not None and not (isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)):
+        return None, "'tags'는 쉼표로 구분한 문자열 또는 문자열 목록이어야 합니다."
+
+    item_top_n = None
+    if query.get('top_n') is not None:
+        item_top_n = _parse_positive_int(query['top_n'])
+        if item_top_n is None:
+            return None, "'top_n'은 1 이상의 정수여야 합니다."
+
+    return {
+        'title': query.get('title'),
+        'tags': [tag.strip() for tag in tags if tag.strip()] if tags else None,
+        'start_date': query.get('start_date'),
+        'end_date': query.get('end_date'),
+        'top_n': item_top_n,
+    }, None
+
+
+@csrf_exempt
+@require_POST
+def top_words_batch_api_view(request):
+    """
+    JSON 배치 API: 여러 조건 세트의 상위 명사 목록을 한 번에 반환합니다.
+    요청 본문: {"top_n": 50, "queries": [{"title": "...", "tags": "A,B" 또는 ["A", "B"],
+                                          "start_date": "...", "end_date": "...", "top_n": 10}, ...]}
+    캐시 미스인 조건 세트들은 ImFiles를 묶음마다 한 번만 검색하여 함께 계산됩니다.
+    혼잡하여 집계하지 못한 조건 세트만 결과 항목에 503(retry_after)으로 표시하고 Retry-After 헤더를 붙이며,
+    모든 조건 세트가 거절된 경우에만 응답 전체가 503입니다.
+    """
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({"status": "error", "message": "Invalid JSON format"}, status=400)
+
+    queries = data.get('queries') if isinstance(data, dict) else None
+    if not isinstance(queries, list) or not queries:
+        return JsonResponse({"status": "error", "message": "'queries' 목록이 필요합니다."}, status=400)
+    if len(queries) > BATCH_MAX_QUERIES:
+        return JsonResponse({
+            "status": "error",
+            "message": f"한 번에 최대 {BATCH_MAX_QUERIES}개의 조건 세트만 요청할 수 있습니다."
+        }, status=400)
+
+    top_n = _parse_positive_int(data.get('top_n', TOP_N))
+    if top_n is None:
+        return JsonResponse({"status": "error", "message": "'top_n'은 1 이상의 정수여야 합니다."}, status=400)
+
+    batch_conditions: List[Dict[str, Any]] = []
+    for index, query in enumerate(queries):
+        conditions, error = _parse_batch_item(query)
+        if error:
+            return JsonResponse({"status": "error", "message": f"queries[{index}]: {error}"}, status=400)
+        batch_conditions.append(conditions)
+
+    results = get_top_nouns_batch(batch_conditions, top_n, admission=True)
+    if results is None:
+        return JsonResponse({"status": "error", "message": "데이터베이스 연결 오류"}, status=503)
+
+    rejected = [result for result in results if result.get("status") == 503]
+    if rejected and len(rejected) == len(results):
+        return _overloaded_json_response(AdmissionRejected(rejected[0]["error"], rejected[0]["retry_after"]))
+
+    response = JsonResponse({"status": "ok", "top_n": top_n, "results": results},
+                            json_dumps_params={'ensure_ascii': False})
+    if rejected:
+        response['Retry-After'] = str(max(result["retry_after"] for result in rejected))
+    return response
+
+
+def _parse_comma_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+def _trend_json_response(request, payload_builder):
+    """추세 API 공통 응답: 데이터 세대 기반 ETag로 304를 지원하고 압축된 JSON을 반환합니다."""
+    data_version = get_data_version()
+    if data_version is None:
+        return JsonResponse({"status": "error", "message": "데이터베이스 연결 오류"}, status=503)
+
+    encoding = choose_content_encoding(request)
+    etag = make_strong_etag({'path': request.path, 'query': sorted(request.GET.lists())}, data_version)
+    matched_etag = etag_matches(request, etag, encoding)
+    if matched_etag:
+        return not_modified_response(matched_etag)
+
+    try:
+        payload = payload_builder()
+    except ValueError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+    except AdmissionRejected as rejection:
+        return _overloaded_json_response(rejection)
+    if payload is None:
+        return JsonResponse({"status": "error", "message": "데이터베이스 연결 오류"}, status=503)
+
+    # 재생성 직후 기간별 빈도가 아직 이전 세대로 만들어진 상태이면 ETag를 붙이지 않음 (생성 후 바뀌므로)
+    if not derived_collections_current():
+        etag = None
+    return compressed_json_response({**payload, "data_version": data_version}, encoding, etag)
+
+
+@require_GET
+def trends_api_view(request):
+    """
+    명사 추세 API: 지정한 명사들의 월별(기본) 또는 주별 빈도 시계열을 반환합니다.
+    예) /api/trends/?nouns=economy,brexit&tags=Business&granularity=month&start=2016-01&end=2019-12
+    (기간 값은 월: YYYY-MM, 주: YYYY-Www)
+    """
+    nouns = _parse_comma_list(request.GET.get('nouns'))
+    if not nouns:
+        return JsonResponse({"status": "error", "message": "'nouns' (쉼표로 구분) 매개변수가 필요합니다."}, status=400)
+
+    granularity = request.GET.get('granularity', GRANULARITY_MONTH)
+    tags = _parse_comma_list(request.GET.get('tags')) or None
+
+    return _trend_json_response(request, lambda: get_noun_trends(
+        nouns, granularity=granularity, tags=tags, title=request.GET.get('title', ''),
+        start_period=request.GET.get('start', ''), end_period=request.GET.get('end', '')
+    ))
+
+
+@require_GET
+def rising_nouns_api_view(request):
+    """
+    상승 명사 API: 두 기간(period_a -> period_b) 사이에 빈도가 가장 많이 오른 명사 순위를 반환합니다.
+    예) /api/trends/rising/?period_a=2019-01&period_b=2019-02&tags=Politics&limit=20
+    """
+    period_a = request.GET.get('period_a')
+    period_b = request.GET.get('period_b')
+    if not (period_a and period_b):
+        return JsonResponse({"status": "error", "message": "'period_a'와 'period_b' 매개변수가 필요합니다."}, status=400)
+
+    try:
+        limit = int(request.GET.get('limit', 20))
+        min_count = int(request.GET.get('min_count', 5))
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "limit, min_count는 정수여야 합니다."}, status=400)
+    if not 1 <= limit <= TREND_RISING_MAX_LIMIT or min_count < 0:
+        return JsonResponse({"status": "error",
+                             "message": f"limit은 1 이상 {TREND_RISING_MAX_LIMIT} 이하, min_count는 0 이상이어야 합니다."},
+                            status=400)
+
+    granularity = request.GET.get('granularity', GRANULARITY_MONTH)
+    tags = _parse_comma_list(request.GET.get('tags')) or None
+
+    def build_payload():
+        rising = get_rising_nouns(period_a, period_b, granularity=granularity, tags=tags,
+                                  limit=limit, min_count=min_count)
+        if rising is None:
+            return None
+        return {"granularity": granularity, "period_a": period_a, "period_b": period_b, "rising": rising}
+
+    return _trend_json_response(request, build_payload)
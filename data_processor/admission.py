@@ -0,0 +1,156 @@
+# data_processor/admission.py
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from .db_connector import get_mongodb_client
+from .constants import (
+    DB_NAME, ADMISSION_COLLECTION, ADMISSION_FIELD_HOLDER, ADMISSION_FIELD_EXPIRES_AT,
+    ADMISSION_ENABLED, ADMISSION_PROCESS_SLOTS, ADMISSION_CLUSTER_SLOTS, ADMISSION_MAX_WAITERS,
+    ADMISSION_WAIT_SECONDS, ADMISSION_LEASE_SECONDS, ADMISSION_RETRY_AFTER, ADMISSION_DEGRADED_SAMPLE_SLOTS
+)
+
+# 이 프로세스에서 동시에 실행할 수 있는 캐시 미스 집계 수와 대기 중인 요청 수
+_process_slots = threading.BoundedSemaphore(max(1, ADMISSION_PROCESS_SLOTS))
+_waiters = 0
+_waiters_lock = threading.Lock()
+_cluster_slots_ready = False
+# 혼잡 시 대체 응답용 표본 추정의 별도 예산 (정확 집계 슬롯과 독립)
+_degraded_sample_slots = threading.BoundedSemaphore(max(1, ADMISSION_DEGRADED_SAMPLE_SLOTS))
+
+
+class AdmissionRejected(Exception):
+    """캐시 미스 집계 슬롯을 얻지 못했을 때 발생합니다. (뷰는 503 + Retry-After로 응답)"""
+
+    def __init__(self, message: str, retry_after: int = ADMISSION_RETRY_AFTER):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _acquire_process_slot(deadline: float) -> None:
+    global _waiters
+    if _process_slots.acquire(blocking=False):
+        return
+
+    with _waiters_lock:
+        if _waiters >= ADMISSION_MAX_WAITERS:
+            raise AdmissionRejected("캐시 미스 집계 대기열이 가득 찼습니다.")
+        _waiters += 1
+    try:
+        if not _process_slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise AdmissionRejected("프로세스의 캐시 미스 집계 슬롯을 기다리다 시간이 초과되었습니다.")
+    finally:
+        with _waiters_lock:
+            _waiters -= 1
+
+
+def _ensure_cluster_slots(collection) -> None:
+    """슬롯 문서(_id: 0 ~ N-1)가 없으면 만듭니다. (프로세스당 한 번)"""
+    global _cluster_slots_ready
+    if _cluster_slots_ready:
+        return
+    try:
+        collection.bulk_write([
+            UpdateOne({"_id": slot_id},
+                      {"$setOnInsert": {ADMISSION_FIELD_HOLDER: None, ADMISSION_FIELD_EXPIRES_AT: None}},
+                      upsert=True)
+            for slot_id in range(ADMISSION_CLUSTER_SLOTS)
+        ], ordered=False)
+    except BulkWriteError:
+        pass  # 다른 프로세스가 동시에 만든 경우 (중복 키)
+    _cluster_slots_ready = True
+
+
+def _acquire_cluster_slot(collection, deadline: float) -> Optional[Tuple[int, str]]:
+    """
+    MongoDB의 슬롯 문서를 원자적으로 임대합니다. 반환값은 (슬롯 번호, 임대 토큰)입니다.
+    임대에는 만료 시각이 있어, 집계 중 프로세스가 죽어도 ADMISSION_LEASE_SECONDS 뒤에는 슬롯이 회수됩니다.
+    """
+    token = uuid.uuid4().hex
+    delay = 0.05
+    _ensure_cluster_slots(collection)
+    while True:
+        now = datetime.now(timezone.utc)
+        slot = collection.find_one_and_update(
+            {"_id": {"$in": list(range(ADMISSION_CLUSTER_SLOTS))},
+             "$or": [{ADMISSION_FIELD_HOLDER: None}, {ADMISSION_FIELD_EXPIRES_AT: {"$lt": now}}]},
+            {"$set": {ADMISSION_FIELD_HOLDER: token,
+                      ADMISSION_FIELD_EXPIRES_AT: now + timedelta(seconds=ADMISSION_LEASE_SECONDS)}},
+            projection={"_id": 1}
+        )
+        if slot:
+            return slot["_id"], token
+        if time.monotonic() + delay > deadline:
+            raise AdmissionRejected("클러스터 전체의 캐시 미스 집계 슬롯이 모두 사용 중입니다.")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+def _release_cluster_slot(collection, slot_id: int, token: str) -> None:
+    try:
+        collection.update_one(
+            {"_id": slot_id, ADMISSION_FIELD_HOLDER: token},
+            {"$set": {ADMISSION_FIELD_HOLDER: None, ADMISSION_FIELD_EXPIRES_AT: None}}
+        )
+    except Exception as e:
+        print(f"⚠️ 클러스터 슬롯 반납 실패 (임대 만료 후 자동 회수): {e}")
+
+
+@contextmanager
+def admit(wait_seconds: float = ADMISSION_WAIT_SECONDS):
+    """
+    캐시 미스 집계(전체 검색)를 실행해도 되는지 확인하는 컨텍스트 매니저입니다.
+    프로세스 슬롯과 클러스터 슬롯을 wait_seconds 안에 모두 얻으면 블록을 실행하고, 끝나면 반납합니다.
+    얻지 못하면 AdmissionRejected가 발생합니다. (캐시 적중 요청은 이 함수를 거치지 않습니다.)
+    클러스터 슬롯의 임대와 반납은 하나의 MongoDB 연결로 처리합니다.
+    (클러스터 제한이 꺼져 있거나 DB에 연결할 수 없으면 프로세스 제한만 적용)
+    """
+    if not ADMISSION_ENABLED:
+        yield
+        return
+
+    deadline = time.monotonic() + wait_seconds
+    try:
+        _acquire_process_slot(deadline)
+    except AdmissionRejected as e:
+        print(f"🚦 캐시 미스 집계 거절: {e}")
+        raise
+
+    client = get_mongodb_client() if ADMISSION_CLUSTER_SLOTS > 0 else None
+    try:
+        lease = None
+        if client:
+            collection = client[DB_NAME][ADMISSION_COLLECTION]
+            try:
+                lease = _acquire_cluster_slot(collection, deadline)
+            except AdmissionRejected as e:
+                print(f"🚦 캐시 미스 집계 거절: {e}")
+                raise
+        try:
+            yield
+        finally:
+            if lease:
+                _release_cluster_slot(collection, *lease)
+    finally:
+        if client:
+            client.close()
+        _process_slots.release()
+
+
+@contextmanager
+def admit_degraded_sample():
+    """
+    혼잡 시 대체 응답용 표본 추정을 실행해도 되는지 확인합니다. (기다리지 않음)
+    별도의 작은 예산(ADMISSION_DEGRADED_SAMPLE_SLOTS)을 다 쓰고 있으면 AdmissionRejected가 발생합니다.
+    """
+    if ADMISSION_DEGRADED_SAMPLE_SLOTS <= 0 or not _degraded_sample_slots.acquire(blocking=False):
+        raise AdmissionRejected("혼잡 시 표본 추정 슬롯이 모두 사용 중입니다.")
+    try:
+        yield
+    finally:
+        _degraded_sample_slots.release()
@@ -0,0 +1,337 @@
+# data_processor/aggregation.py
+
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .db_connector import get_mongodb_client
+from .constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_NOUNS,
+    AGG_CURSOR_BATCH_SIZE, AGG_MEMORY_LIMIT_MB, AGG_ESTIMATED_BYTES_PER_NOUN, AGG_MAX_SPILL_FILES,
+    AGG_PARALLEL_WORKERS, AGG_PARALLEL_MIN_RECORDS
+)
+
+try:
+    import resource  # 유닉스 전용 (Windows에서는 메모리 측정값을 0.0으로 보고)
+except ImportError:
+    resource = None
+
+# 병렬 집계용 프로세스 풀 (처음 사용할 때 생성하여 재사용)
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _max_rss_mb(who: int) -> float:
+    # ru_maxrss는 리눅스에서 KB, macOS에서 바이트 단위
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS(Resident Set Size)를 MB 단위로 반환합니다. (resource 모듈이 없으면 0.0)"""
+    return _max_rss_mb(resource.RUSAGE_SELF) if resource else 0.0
+
+
+def children_peak_rss_mb() -> float:
+    """종료된 자식 프로세스 중 가장 큰 최대 RSS를 MB 단위로 반환합니다. (resource 모듈이 없으면 0.0)"""
+    return _max_rss_mb(resource.RUSAGE_CHILDREN) if resource else 0.0
+
+
+class StreamingNounCounter:
+    """
+    레코드를 하나씩 받아 명사 빈도를 누적하는 메모리 상한이 있는 카운터입니다.
+
+    서로 다른 명사 수가 메모리 상한(memory_limit_mb / 명사당 추정 바이트)을 넘으면
+    지금까지의 부분 빈도를 단어순으로 정렬해 임시 파일로 내보내고(spill) 메모리를 비웁니다.
+    결과를 읽을 때는 임시 파일들을 단어순으로 병합(heapq.merge)하면서 같은 단어의 빈도를 합산하므로,
+    메모리에는 전체 빈도표가 아니라 파일당 한 줄과 상위 N개 힙만 남습니다.
+    """
+
+    def __init__(self, memory_limit_mb: float = AGG_MEMORY_LIMIT_MB, spill_dir: Optional[str] = None):
+        self.max_distinct_nouns = max(1, int(memory_limit_mb * 1024 * 1024 / AGG_ESTIMATED_BYTES_PER_NOUN))
+        self.spill_dir = spill_dir
+        self.counts: Counter = Counter()
+        self.records = 0
+        self.total_nouns = 0
+        self.spill_paths: List[str] = []
+
+    def add_record(self, nouns: List[str]) -> None:
+        self.records += 1
+        self.total_nouns += len(nouns)
+        self.counts.update(nouns)
+        if len(self.counts) > self.max_distinct_nouns:
+            self._spill()
+
+    def adopt_sorted_file(self, path: str, records: int = 0, total_nouns: int = 0) -> None:
+        """
+        다른 카운터(병렬 파티션의 자식 프로세스 등)가 detach_sorted_file로 넘긴 단어순 정렬 파일을 넘겨받습니다.
+        파일은 이 카운터가 병합할 때 읽고 close()에서 삭제합니다. (부분 빈도를 메모리에 올리지 않음)
+        """
+        self.records += records
+        self.total_nouns += total_nouns
+        if len(self.spill_paths) >= AGG_MAX_SPILL_FILES:
+            self._compact_spills()
+        self.spill_paths.append(path)
+
+    def detach_sorted_file(self) -> Optional[str]:
+        """
+        지금까지의 전체 빈도를 단어순으로 정렬된 임시 파일 하나로 만들어 경로를 반환하고,
+        파일의 소유권을 넘깁니다. (이후 close()에서 삭제하지 않음, 빈도가 없으면 None)
+        """
+        if not self.spill_paths and not self.counts:
+            return None
+        if len(self.spill_paths) == 1 and not self.counts:
+            path = self.spill_paths[0]
+        else:
+            path = self._write_spill(self.iter_counts() if self.spill_paths else
+                                     ((word, self.counts[word]) for word in sorted(self.counts)))
+            self.close()
+        self.spill_paths = []
+        self.counts = Counter()
+        return path
+
+    def _write_spill(self, items: Iterator[Tuple[str, int]]) -> str:
+        """단어순으로 정렬된 (word, count)를 임시 파일(JSON Lines)에 기록하고 경로를 반환합니다."""
+        fd, path = tempfile.mkstemp(prefix='noun_counts_', suffix='.jsonl', dir=self.spill_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as spill_file:
+            for word, count in items:
+                spill_file.write(json.dumps([word, count], ensure_ascii=False) + "\n")
+        return path
+
+    def _spill(self) -> None:
+        """현재 메모리의 부분 빈도를 임시 파일로 내보내고 메모리를 비웁니다."""
+        if len(self.spill_paths) >= AGG_MAX_SPILL_FILES:
+            self._compact_spills()
+
+        self.spill_paths.append(self._write_spill((word, self.counts[word]) for word in sorted(self.counts)))
+        print(f"💾 부분 빈도 {len(self.counts)}개를 디스크로 내보냄 (임시 파일 {len(self.spill_paths)}개)")
+        self.counts = Counter()
+
+    def _compact_spills(self) -> None:
+        """병합 시 동시에 여는 파일 수를 제한하기 위해 기존 임시 파일들을 하나로 합칩니다."""
+        merged_path = self._write_spill(self._merge_sorted([self._read_spill(path) for path in self.spill_paths]))
+        self.close()
+        self.spill_paths = [merged_path]
+
+    @staticmethod
+    def _read_spill(path: str) -> Iterator[Tuple[str, int]]:
+        with open(path, encoding='utf-8') as spill_file:
+            for line in spill_file:
+                word, count = json.loads(line)
+                yield word, count
+
+    def iter_counts(self) -> Iterator[Tuple[str, int]]:
+        """전체 (word, count)를 하나씩 반환합니다. 디스크로 내보낸 부분 빈도가 있으면 병합하여 합산합니다."""
+        if not self.spill_paths:
+            yield from self.counts.items()
+            return
+
+        in_memory = sorted(self.counts.items())
+        yield from self._merge_sorted([self._read_spill(path) for path in self.spill_paths] + [iter(in_memory)])
+
+    @staticmethod
+    def _merge_sorted(sources: Iterable[Iterator[Tuple[str, int]]]) -> Iterator[Tuple[str, int]]:
+        """단어순으로 정렬된 여러 (word, count) 스트림을 병합하며 같은 단어의 빈도를 합산합니다."""
+        current_word, current_count = None, 0
+        for word, count in heapq.merge(*sources, key=lambda item: item[0]):
+            if word == current_word:
+                current_count += count
+                continue
+            if current_word is not None:
+                yield current_word, current_count
+            current_word, current_count = word, count
+        if current_word is not None:
+            yield current_word, current_count
+
+    def top(self, top_n: int) -> List[Tuple[str, int]]:
+        """크기 top_n의 힙으로 상위 N개를 선택합니다. (전체 정렬 없음)"""
+        return heapq.nlargest(top_n, self.iter_counts(), key=lambda item: item[1])
+
+    def close(self) -> None:
+        """임시 파일을 삭제합니다."""
+        for path in self.spill_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.spill_paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def count_nouns_streaming(collection, query: Dict[str, Any], batch_size: int = AGG_CURSOR_BATCH_SIZE,
+                          memory_limit_mb: float = AGG_MEMORY_LIMIT_MB) -> StreamingNounCounter:
+    """
+    조건에 맞는 레코드를 batch_size 단위 커서로 읽으며 명사 빈도를 누적한 카운터를 반환합니다.
+    (반환된 카운터는 사용 후 close() 해야 임시 파일이 삭제됩니다.)
+    """
+    start_time = time.time()
+    counter = StreamingNounCounter(memory_limit_mb)
+    cursor = collection.find(query, {DB_FIELD_NOUNS: 1, "_id": 0}, batch_size=batch_size)
+    with cursor:
+        for record in cursor:
+            counter.add_record(record.get(DB_FIELD_NOUNS, []))
+
+    print(f"📊 스트리밍 집계: 레코드 {counter.records}개, 명사 {counter.total_nouns}개, "
+          f"임시 파일 {len(counter.spill_paths)}개 ({time.time() - start_time:.4f}초, "
+          f"최대 RSS {peak_rss_mb():.1f}MB)")
+    return counter
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    병렬 집계용 프로세스 풀을 반환합니다. 요청마다 프로세스를 띄우지 않도록 재사용하며,
+    스레드가 있는 Django 프로세스를 fork하지 않도록 spawn 방식으로 생성합니다.
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _executor_workers = workers
+        return _executor
+
+
+def warm_up_parallel_pool(workers: int = AGG_PARALLEL_WORKERS) -> None:
+    """병렬 집계용 프로세스 풀을 미리 만들고 자식 프로세스를 모두 띄워 둡니다. (첫 요청/벤치마크의 기동 시간 제외용)"""
+    if workers > 1:
+        list(_get_executor(workers).map(peak_rss_mb, range(workers)))
+
+
+def shutdown_parallel_pool() -> None:
+    """병렬 집계용 프로세스 풀을 종료합니다. 다음 병렬 집계에서 새로 만듭니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def plan_id_partitions(collection, query: Dict[str, Any], partitions: int) -> List[Dict[str, Any]]:
+    """
+    조건에 맞는 레코드를 _id 기준으로 건수가 비슷한 partitions개의 구간으로 나눕니다. ($bucketAuto)
+    각 구간은 {"min", "max", "count", "last"}이며, 마지막 구간만 max를 포함합니다.
+    """
+    buckets = list(collection.aggregate([
+        {"$match": query},
+        {"$project": {"_id": 1}},
+        {"$bucketAuto": {"groupBy": "$_id", "buckets": partitions}},
+    ], allowDiskUse=True))
+    return [{"min": bucket["_id"]["min"], "max": bucket["_id"]["max"], "count": bucket["count"],
+             "last": index == len(buckets) - 1} for index, bucket in enumerate(buckets)]
+
+
+def partition_query(query: Dict[str, Any], partition: Dict[str, Any]) -> Dict[str, Any]:
+    id_range = {"$gte": partition["min"], ("$lte" if partition["last"] else "$lt"): partition["max"]}
+    return {"$and": [query, {"_id": id_range}]} if query else {"_id": id_range}
+
+
+def count_partition(query: Dict[str, Any], batch_size: int = AGG_CURSOR_BATCH_SIZE,
+                    memory_limit_mb: float = AGG_MEMORY_LIMIT_MB,
+                    collection_name: str = RECORD_NOUNS_COLLECTION) -> Tuple[Optional[str], int, int]:
+    """
+    (자식 프로세스에서 실행) 자체 MongoDB 연결로 collection_name 컬렉션에서 한 구간의 레코드를 memory_limit_mb 상한 안에서 집계하고,
+    결과를 단어순으로 정렬된 임시 파일로 넘깁니다. 반환값은 (파일 경로 또는 None, 레코드 수, 명사 수)입니다.
+    (빈도표를 pickle로 부모에게 보내지 않으므로 자식/부모 모두 메모리 상한을 지킴)
+    """
+    client = get_mongodb_client()
+    if not client:
+        raise RuntimeError("MongoDB 연결 실패")
+
+    counter = StreamingNounCounter(memory_limit_mb)
+    try:
+        cursor = client[DB_NAME][collection_name].find(query, {DB_FIELD_NOUNS: 1, "_id": 0}, batch_size=batch_size)
+        with cursor:
+            for record in cursor:
+                counter.add_record(record.get(DB_FIELD_NOUNS, []))
+        return counter.detach_sorted_file(), counter.records, counter.total_nouns
+    finally:
+        counter.close()
+        client.close()
+
+
+def _discard_partition_files(futures) -> None:
+    """실패한 병렬 집계에서 이미 끝난 구간들이 남긴 임시 파일을 삭제합니다."""
+    for future in futures:
+        try:
+            path = future.result()[0]
+        except Exception:
+            continue
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _has_min_records(collection, query: Dict[str, Any], min_records: int) -> bool:
+    """
+    조건에 맞는 레코드가 min_records개 이상인지 확인합니다. 컬렉션 전체가 기준보다 작으면 메타데이터
+    (estimated_document_count)만으로 판단하고, 아니면 min_records개를 세는 즉시 멈추는 count_documents(limit)를 사용합니다.
+    (정규식 조건에서 병렬 집계 전에 컬렉션을 한 번 더 전부 훑지 않도록)
+    """
+    if collection.estimated_document_count() < min_records:
+        return False
+    return not query or collection.count_documents(query, limit=min_records) >= min_records
+
+
+def count_nouns_parallel(collection, query: Dict[str, Any], workers: int = AGG_PARALLEL_WORKERS,
+                         batch_size: int = AGG_CURSOR_BATCH_SIZE, memory_limit_mb: float = AGG_MEMORY_LIMIT_MB,
+                         min_records: int = AGG_PARALLEL_MIN_RECORDS) -> StreamingNounCounter:
+    """
+    조건에 맞는 레코드를 _id 구간으로 나누어 workers개의 프로세스에서 동시에 집계한 뒤,
+    구간별 정렬 파일을 메모리 상한이 있는 카운터로 넘겨받아 반환합니다. (상위 N개는 파일 병합으로 계산)
+    자식 프로세스마다 memory_limit_mb / workers 상한을 적용하므로 전체 메모리도 memory_limit_mb 안에 머뭅니다.
+    레코드가 min_records보다 적거나 구간이 하나뿐이면 단일 프로세스 스트리밍 집계를 사용합니다.
+    (건수 확인은 _has_min_records로 먼저 하고, 구간 계획($bucketAuto)은 기준 이상일 때만 실행)
+    """
+    if workers <= 1:
+        return count_nouns_streaming(collection, query, batch_size, memory_limit_mb)
+
+    start_time = time.time()
+    if min_records > 0 and not _has_min_records(collection, query, min_records):
+        return count_nouns_streaming(collection, query, batch_size, memory_limit_mb)
+    partitions = plan_id_partitions(collection, query, workers)
+    if len(partitions) < 2:
+        return count_nouns_streaming(collection, query, batch_size, memory_limit_mb)
+
+    counter = StreamingNounCounter(memory_limit_mb)
+    futures = []
+    try:
+        executor = _get_executor(workers)
+        futures = [executor.submit(count_partition, partition_query(query, partition), batch_size,
+                                   memory_limit_mb / workers, collection.name)
+                   for partition in partitions]
+        # 완료된 구간부터가 아니라 순서대로 넘겨받아 실행마다 같은 병합 순서를 유지
+        for index, future in enumerate(futures):
+            path, records, total_nouns = future.result()
+            futures[index] = None  # 넘겨받은 파일은 counter.close()가 삭제
+            if path:
+                counter.adopt_sorted_file(path, records, total_nouns)
+            else:
+                counter.records += records
+    except Exception as e:
+        # 프로세스 풀이 깨졌을 수 있으므로 다음 호출에서 새로 만들고, 이번 집계는 단일 프로세스로 다시 수행
+        print(f"❌ 병렬 집계 중 오류 발생, 단일 프로세스 집계로 전환합니다: {e}")
+        _discard_partition_files([future for future in futures if future is not None])
+        shutdown_parallel_pool()
+        counter.close()
+        return count_nouns_streaming(collection, query, batch_size, memory_limit_mb)
+
+    print(f"📊 병렬 집계({len(partitions)}개 구간, 프로세스 {workers}개): 레코드 {counter.records}개, "
+          f"명사 {counter.total_nouns}개, 임시 파일 {len(counter.spill_paths)}개 "
+          f"({time.time() - start_time:.4f}초, 최대 RSS {peak_rss_mb():.1f}MB)")
+    return counter
@@ -1,60 +1,205 @@
 # data_processor/cache_manager.py
 
 from typing import List, Dict, Optional, Any
-from collections import Counter
+import threading
+from contextlib import ExitStack, nullcontext
 from .db_connector import get_mongodb_client
 # 분산 처리 함수 임포트
 from .master_connector import distribute_importer_rebuild
+from .data_version import get_data_version
+from .sketches import get_approximate_top_nouns, supports_approximate
+from .sampling import estimate_top_nouns_by_sampling
+from .aggregation import StreamingNounCounter, count_nouns_parallel
+from .admission import AdmissionRejected, admit, admit_degraded_sample
+from .title_index import build_title_query, heading_matches
 from .constants import (
     DB_NAME, RECORD_NOUNS_COLLECTION, TOP_NOUNS_CACHE_COLLECTION, TOP_N,
     DB_FIELD_HEADING, DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_NOUNS,
     CACHE_FIELD_TITLE_QUERY, CACHE_FIELD_START_DATE_QUERY, CACHE_FIELD_END_DATE_QUERY,
-    CACHE_FIELD_TAGS_QUERY, CACHE_FIELD_TOP_N, CACHE_FIELD_TOP_WORDS
+    CACHE_FIELD_TAGS_QUERY, CACHE_FIELD_TOP_N, CACHE_FIELD_TOP_WORDS, CACHE_FIELD_TOTAL_RECORDS, CACHE_FIELD_GENERATION,
+    ENGINE_EXACT, ENGINE_APPROXIMATE, ENGINE_SAMPLED, ADMISSION_OVERLOAD_POLICY, ADMISSION_POLICY_DEGRADE,
+    SAMPLE_INITIAL_SIZE, AGG_MEMORY_LIMIT_MB, BATCH_SCAN_GROUP_SIZE
 )
 
+# 백그라운드에서 정확한 결과를 계산 중인 캐시 키 (같은 조건의 중복 계산 방지)
+_background_keys = set()
+_background_lock = threading.Lock()
+# 검색 결과가 없어 워커 재처리를 요청 중인지 여부 (이 프로세스에서 동시에 한 번만 실행)
+_miss_rebuild_lock = threading.Lock()
 
-def get_top_nouns_from_cache(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[
-    List[Dict[str, Any]]]:
+
+def normalize_query_conditions(query_conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
-    주어진 조건 딕셔너리와 top_n에 해당하는 결과를 캐시 컬렉션에서 조회합니다.
+    뷰/커맨드에서 받은 조건 딕셔너리를 캐시 키와 검색 쿼리에 쓰이는 정규화된 형태로 변환합니다.
+    (모든 조건이 비어 있으면 None)
     """
-    client = get_mongodb_client()
-    if not client: return None
-    db = client[DB_NAME]
-    cache_collection = db[TOP_NOUNS_CACHE_COLLECTION]
+    title = query_conditions.get('title')
+    tags = query_conditions.get('tags')
+    start_date = query_conditions.get('start_date')
+    end_date = query_conditions.get('end_date')
 
-    title = query_conditions.get('title', "")
+    if not (title or tags or start_date or end_date):
+        return None
+
+    return {
+        'title': title if title is not None else "",
+        'tags': tags if tags else None,
+        'start_date': start_date if start_date is not None else "",
+        'end_date': end_date if end_date is not None else "",
+    }
+
+
+def build_cache_key(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Dict[str, Any]:
+    """캐시 문서를 유일하게 식별하는 쿼리(캐시 키)를 생성합니다."""
     tags = query_conditions.get('tags', None)
-    start_date = query_conditions.get('start_date', "")
-    end_date = query_conditions.get('end_date', "")
 
     # 캐시 키를 위한 정규화된 태그 문자열 생성
     tags_key = ",".join(tags) if tags else ""
 
-    query = {
-        CACHE_FIELD_TITLE_QUERY: title,
+    return {
+        CACHE_FIELD_TITLE_QUERY: query_conditions.get('title', ""),
         CACHE_FIELD_TAGS_QUERY: tags_key,
-        CACHE_FIELD_START_DATE_QUERY: start_date,
-        CACHE_FIELD_END_DATE_QUERY: end_date,
+        CACHE_FIELD_START_DATE_QUERY: query_conditions.get('start_date', ""),
+        CACHE_FIELD_END_DATE_QUERY: query_conditions.get('end_date', ""),
         CACHE_FIELD_TOP_N: top_n
     }
-    cached_doc = cache_collection.find_one(query)
+
+
+def build_record_query(query_conditions: Dict[str, Any]) -> Dict[str, Any]:
+    """'ImFiles' 컬렉션에서 조건에 맞는 문서를 찾기 위한 MongoDB 쿼리를 생성합니다."""
+    title = query_conditions.get('title', "")
+    tags = query_conditions.get('tags', None)
+    start_date = query_conditions.get('start_date', "")
+    end_date = query_conditions.get('end_date', "")
+
+    query: Dict[str, Any] = {}
+
+    # Title (Heading) 검색: 제목 토큰 인덱스를 이용한 단어 접두어 일치 (대소문자 무시, title_index 참고)
+    if title: query.update(build_title_query(title))
+
+    # Tags 검색: 주어진 태그 리스트 중 하나라도 포함하는 문서 ($in)
+    if tags: query[DB_FIELD_TAGS] = {"$in": tags}
+
+    # Date Range 검색
+    date_query = {}
+    if start_date: date_query["$gte"] = start_date
+    if end_date: date_query["$lte"] = end_date
+    if date_query: query[DB_FIELD_DATE] = date_query
+
+    return query
+
+
+def record_matches_conditions(record: Dict[str, Any], query_conditions: Dict[str, Any]) -> bool:
+    """build_record_query와 같은 의미로, 이미 가져온 레코드가 조건에 맞는지 파이썬에서 판단합니다."""
+    title = query_conditions.get('title', "")
+    tags = query_conditions.get('tags', None)
+    start_date = query_conditions.get('start_date', "")
+    end_date = query_conditions.get('end_date', "")
+
+    if title and not heading_matches(record.get(DB_FIELD_HEADING), title):
+        return False
+
+    if tags:
+        record_tags = record.get(DB_FIELD_TAGS)
+        record_tags = record_tags if isinstance(record_tags, list) else [record_tags]
+        if not any(tag in record_tags for tag in tags):
+            return False
+
+    if start_date or end_date:
+        # MongoDB와 마찬가지로 문자열 날짜끼리만 비교
+        record_date = record.get(DB_FIELD_DATE)
+        if not isinstance(record_date, str):
+            return False
+        if start_date and record_date < start_date:
+            return False
+        if end_date and record_date > end_date:
+            return False
+
+    return True
+
+
+def _find_current_cached_document(db, cache_key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    캐시 키에 해당하는 현재 데이터 세대의 캐시 문서를 찾습니다. (이전 세대 문서는 삭제)
+    적중 경로에서는 프로세스 안에 캐시된 세대 번호로 비교하고, 세대가 다를 때만 MetaDatas를 다시 조회합니다.
+    """
+    cache_collection = db[TOP_NOUNS_CACHE_COLLECTION]
+    cached_doc = cache_collection.find_one(cache_key)
+    if not cached_doc:
+        return None
+
+    cached_generation = cached_doc.get(CACHE_FIELD_GENERATION)
+    current_generation = get_data_version()
+    if cached_generation != current_generation:
+        # 캐시된 세대 번호가 오래되었을 수 있으므로 (다른 프로세스가 새 세대를 공개) 실제 세대를 확인
+        current_generation = get_data_version(db)
+    if cached_generation == current_generation:
+        cached_doc.pop("_id", None)
+        return cached_doc
+
+    # 이전 데이터 세대로 계산된 캐시는 무시하고 지연 삭제 (다시 계산하면 새 세대로 저장됨)
+    if current_generation is not None and (cached_generation is None or cached_generation < current_generation):
+        cache_collection.delete_one({"_id": cached_doc["_id"], CACHE_FIELD_GENERATION: cached_generation})
+        print(f"♻️ 이전 데이터 세대({cached_generation})의 캐시를 삭제했습니다. (현재 세대: {current_generation})")
+    return None
+
+
+def get_cached_document(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[Dict[str, Any]]:
+    """
+    주어진 조건 딕셔너리와 top_n에 해당하는 캐시 문서 전체(total_records 포함)를 조회합니다.
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    cached_doc = _find_current_cached_document(client[DB_NAME], build_cache_key(query_conditions, top_n))
     client.close()
 
     if cached_doc:
         print(f"✅ 캐시에서 데이터를 찾았습니다.")
-        return cached_doc.get(CACHE_FIELD_TOP_WORDS)
+        return cached_doc
 
     print("❌ 캐시에 데이터가 없습니다. 새로 생성합니다.")
     return None
 
 
-def calculate_and_save_top_nouns(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[
+def get_top_nouns_from_cache(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[
     List[Dict[str, Any]]]:
     """
+    주어진 조건 딕셔너리와 top_n에 해당하는 결과를 캐시 컬렉션에서 조회합니다.
+    """
+    cached_doc = get_cached_document(query_conditions, top_n)
+    return cached_doc.get(CACHE_FIELD_TOP_WORDS) if cached_doc else None
+
+
+def _request_rebuild_for_miss() -> Optional[Dict[str, Any]]:
+    """
+    검색 결과가 없을 때 워커들에게 분산 Importer 재처리를 요청합니다. 실패하면 None을 반환합니다.
+    다른 요청이 이미 재처리 중이면 새로 요청하지 않고 끝날 때까지 기다린 뒤 빈 결과({})를 반환합니다.
+    """
+    if not _miss_rebuild_lock.acquire(blocking=False):
+        print("⏳ 다른 요청의 워커 재처리가 끝나기를 기다린 뒤 재시도합니다...")
+        with _miss_rebuild_lock:
+            return {}
+
+    try:
+        print("🚀 워커들에게 분산 Importer 재처리 명령을 요청하고 재시도합니다...")
+        rebuild_result = distribute_importer_rebuild()
+        print("✅ 워커 재처리 명령 완료. 2차 검색을 시도합니다.")
+        return rebuild_result
+    except Exception as e:
+        print(f"❌ 워커 재처리 명령 중 치명적인 오류 발생: {e}")
+        return None
+    finally:
+        _miss_rebuild_lock.release()
+
+
+def calculate_and_save_document(query_conditions: Dict[str, Any], top_n: int = TOP_N,
+                                rebuild_on_miss: bool = True) -> Optional[Dict[str, Any]]:
+    """
     'file_noun_records'에서 조건을 만족하는 레코드를 검색하고,
-    명사 빈도수를 계산하여 상위 N개를 캐시에 저장합니다.
-    (검색 결과가 없으면 워커에 재처리 명령을 내리고 한 번 더 시도합니다.)
+    명사 빈도수를 계산하여 상위 N개를 캐시에 저장한 뒤 캐시 문서를 반환합니다.
+    (검색 결과가 없으면 워커에 재처리 명령을 내리고 한 번 더 시도합니다. rebuild_on_miss=False이면
+     재처리 없이 레코드 0건 문서를 반환하며, 집계 슬롯 안에서 호출할 때는 _calculate_admitted가 슬롯 밖에서 재처리합니다.)
     """
     client = get_mongodb_client()
     if not client: return None
@@ -63,122 +208,331 @@ def calculate_and_save_top_nouns(query_conditions: Dict[str, Any], top_n: int =
     record_collection = db[RECORD_NOUNS_COLLECTION]
     cache_collection = db[TOP_NOUNS_CACHE_COLLECTION]
 
-    title = query_conditions.get('title', "")
-    tags = query_conditions.get('tags', None)
-    start_date = query_conditions.get('start_date', "")
-    end_date = query_conditions.get('end_date', "")
-
     # 1. 'file_noun_records' 컬렉션에서 조건에 맞는 문서 검색을 위한 쿼리 설정
-    query: Dict[str, Any] = {}
-
-    # Title (Heading) 검색: 부분 일치 및 대소문자 무시 (i)
-    if title: query[DB_FIELD_HEADING] = {"$regex": title, "$options": "i"}
-
-    # Tags 검색: 주어진 태그 리스트 중 하나라도 포함하는 문서 ($in)
-    if tags: query[DB_FIELD_TAGS] = {"$in": tags}
+    query = build_record_query(query_conditions)
+    cache_key = build_cache_key(query_conditions, top_n)
 
-    # Date Range 검색
-    date_query = {}
-    if start_date: date_query["$gte"] = start_date
-    if end_date: date_query["$lte"] = end_date
-    if date_query: query[DB_FIELD_DATE] = date_query
+    # 집계 시작 시점의 데이터 세대를 캐시에 기록 (집계 중 교체되면 이 결과는 이후 무시됨)
+    generation = get_data_version(db)
 
-    def fetch_records(collection) -> List[Dict[str, Any]]:
-        """DB에서 레코드를 가져오는 내부 함수"""
+    def fetch_counts(collection) -> StreamingNounCounter:
+        """
+        DB에서 레코드를 배치 단위로 읽으며 명사 빈도를 누적하는 내부 함수 (레코드 전체를 메모리에 올리지 않음)
+        레코드가 많으면 _id 구간별로 여러 프로세스에서 나누어 집계합니다. (AGG_PARALLEL_WORKERS)
+        """
         print(f"🔍 '{RECORD_NOUNS_COLLECTION}'에서 조건 ({query})에 맞는 레코드 검색 중...")
         # 필요한 필드(명사 리스트)만 가져와 네트워크 부하 줄이기
-        return list(collection.find(query, {DB_FIELD_NOUNS: 1, "_id": 0}))
+        return count_nouns_parallel(collection, query)
 
     # 1차 검색
-    matching_records = fetch_records(record_collection)
+    noun_counter = fetch_counts(record_collection)
 
     # --- [사용자 요청 로직: 검색 실패 시 워커 재처리 후 재시도] ---
-    if not matching_records:
+    if not noun_counter.records and rebuild_on_miss:
         print(f"⚠️ 경고: 1차 검색에서 조건 ({query})에 맞는 레코드가 없습니다. (검색 조건 미일치)")
-        print("🚀 워커들에게 분산 Importer 재처리 명령을 요청하고 재시도합니다...")
-
-        try:
-            # 1. 워커에게 재처리 명령 요청
-            rebuild_result = distribute_importer_rebuild()
-            print("✅ 워커 재처리 명령 완료. 2차 검색을 시도합니다.")
 
+        # 1. 워커에게 재처리 명령 요청
+        rebuild_result = _request_rebuild_for_miss()
+        if rebuild_result is not None:
+            generation = rebuild_result.get("data_version", get_data_version(db))
             # 2. 2차 검색 시도
-            matching_records = fetch_records(record_collection)  # 2차 검색
-
-        except Exception as e:
-            print(f"❌ 워커 재처리 명령 중 치명적인 오류 발생: {e}")
+            noun_counter.close()
+            noun_counter = fetch_counts(record_collection)  # 2차 검색
 
-    if not matching_records:
+    if not noun_counter.records:
         client.close()
         print(f"⚠️ 경고: 최종적으로 조건 ({query})에 맞는 레코드가 '{RECORD_NOUNS_COLLECTION}'에 없습니다. (검색 조건 미일치)")
-        return []
-
-    # 2. 명사 종합 및 빈도수 계산
-    all_nouns = []
-    for record in matching_records:
-        all_nouns.extend(record.get(DB_FIELD_NOUNS, []))
+        return {**cache_key, CACHE_FIELD_GENERATION: generation, CACHE_FIELD_TOTAL_RECORDS: 0,
+                CACHE_FIELD_TOP_WORDS: []}
 
-    noun_counts = Counter(all_nouns)
-    top_n_words = noun_counts.most_common(top_n)
+    # 2. 상위 N개 선택 (크기 N의 힙, 디스크로 내보낸 부분 빈도가 있으면 병합)
+    with noun_counter:
+        top_n_words = noun_counter.top(top_n)
 
     top_words_for_db = [{"word": word, "count": count} for word, count in top_n_words]
 
     # 3. 새로운 MongoDB 컬렉션에 저장 (캐시)
-    tags_key = ",".join(tags) if tags else ""
     cache_document = {
-        CACHE_FIELD_TITLE_QUERY: title,
-        CACHE_FIELD_TAGS_QUERY: tags_key,
-        CACHE_FIELD_START_DATE_QUERY: start_date,
-        CACHE_FIELD_END_DATE_QUERY: end_date,
-        CACHE_FIELD_TOP_N: top_n,
-        "total_records": len(matching_records),
+        **cache_key,
+        CACHE_FIELD_GENERATION: generation,
+        CACHE_FIELD_TOTAL_RECORDS: noun_counter.records,
         CACHE_FIELD_TOP_WORDS: top_words_for_db
     }
-    # 캐시 문서를 유일하게 식별할 수 있는 쿼리
-    cache_query = {k: cache_document[k] for k in
-                   [CACHE_FIELD_TITLE_QUERY, CACHE_FIELD_TAGS_QUERY, CACHE_FIELD_START_DATE_QUERY,
-                    CACHE_FIELD_END_DATE_QUERY, CACHE_FIELD_TOP_N]}
 
-    # Upsert를 사용하여 캐시 존재 시 업데이트, 없으면 삽입
-    cache_collection.replace_one(cache_query, cache_document, upsert=True)
+    # Upsert를 사용하여 캐시 존재 시 업데이트, 없으면 삽입 (캐시 키로 문서를 유일하게 식별)
+    # 집계 중에 데이터가 교체되었다면 이전 세대의 결과로 새 캐시를 덮어쓰지 않음
+    if get_data_version(db) == generation:
+        cache_collection.replace_one(cache_key, cache_document, upsert=True)
+        cache_document.pop("_id", None)
+    else:
+        print("⚠️ 집계 중 데이터 세대가 바뀌어 결과를 캐시에 저장하지 않습니다.")
     client.close()
 
-    return top_words_for_db
+    return cache_document
 
 
-def get_top_nouns_for_conditions(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[
+def calculate_and_save_top_nouns(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[
     List[Dict[str, Any]]]:
     """
-    메인 진입 함수: 캐시 확인 후, 없으면 계산 및 저장 후 결과를 반환합니다.
-    (calculate_and_save_top_nouns 내부에서 조건 검색 실패 시 분산 재처리가 자동으로 수행됩니다.)
+    'file_noun_records'에서 조건을 만족하는 레코드를 검색하고,
+    명사 빈도수를 계산하여 상위 N개를 캐시에 저장합니다.
+    (검색 결과가 없으면 워커에 재처리 명령을 내리고 한 번 더 시도합니다.)
     """
-    title = query_conditions.get('title')
-    tags = query_conditions.get('tags')
-    start_date = query_conditions.get('start_date')
-    end_date = query_conditions.get('end_date')
+    cache_document = calculate_and_save_document(query_conditions, top_n)
+    return cache_document.get(CACHE_FIELD_TOP_WORDS) if cache_document is not None else None
 
-    if not (title or tags or start_date or end_date):
+
+def _calculate_admitted(processed_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[Dict[str, Any]]:
+    """
+    캐시 미스 정확 집계를 집계 슬롯(admit) 안에서 실행합니다. 슬롯을 얻지 못하면 AdmissionRejected가 발생합니다.
+    검색 결과가 없을 때의 워커 재처리는 슬롯 임대 시간(ADMISSION_LEASE_SECONDS)보다 오래 걸릴 수 있으므로
+    슬롯을 반납한 뒤 실행하고, 새 슬롯을 얻어 한 번 더 집계합니다.
+    """
+    with admit():
+        result_doc = calculate_and_save_document(processed_conditions, top_n, rebuild_on_miss=False)
+    if result_doc is None or result_doc[CACHE_FIELD_TOTAL_RECORDS]:
+        return result_doc
+
+    print(f"⚠️ 경고: 1차 검색에서 조건 ({processed_conditions})에 맞는 레코드가 없습니다. (검색 조건 미일치)")
+    if _request_rebuild_for_miss() is None:
+        return result_doc
+    with admit():
+        return calculate_and_save_document(processed_conditions, top_n, rebuild_on_miss=False)
+
+
+def start_background_calculation(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> bool:
+    """
+    정확한 상위 N개 계산 및 캐시 저장을 백그라운드 스레드에서 시작합니다.
+    같은 조건이 이미 계산 중이면 새로 시작하지 않고 False를 반환합니다.
+    """
+    key = tuple(sorted(build_cache_key(query_conditions, top_n).items()))
+    with _background_lock:
+        if key in _background_keys:
+            return False
+        _background_keys.add(key)
+
+    def run():
+        try:
+            # 백그라운드 집계도 캐시 미스 집계 슬롯을 사용 (슬롯이 없으면 건너뛰고 다음 요청에서 다시 시도)
+            _calculate_admitted(query_conditions, top_n)
+            print("✅ 백그라운드 정확 집계 완료. 다음 요청부터 캐시에서 응답합니다.")
+        except AdmissionRejected:
+            print("⚠️ 집계 슬롯이 없어 백그라운드 정확 집계를 건너뜁니다.")
+        except Exception as e:
+            print(f"❌ 백그라운드 정확 집계 중 오류 발생: {e}")
+        finally:
+            with _background_lock:
+                _background_keys.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+    return True
+
+
+def _get_degraded_document(processed_conditions: Dict[str, Any], top_n: int,
+                           rejection: AdmissionRejected) -> Dict[str, Any]:
+    """
+    집계 슬롯을 얻지 못한 캐시 미스 요청에 근사(스케치) 또는 표본 추정치로 응답합니다. ('degraded': True)
+    스케치 조회는 가볍기 때문에 바로 수행하고, 스케치로 답할 수 없는 조건의 표본 추정은 별도의 작은 예산
+    (admit_degraded_sample) 안에서 SAMPLE_INITIAL_SIZE건 한 번으로 제한합니다.
+    정책이 'reject'이거나, 예산이 없거나, 추정치도 만들 수 없으면 AdmissionRejected를 다시 발생시킵니다.
+    """
+    if ADMISSION_OVERLOAD_POLICY != ADMISSION_POLICY_DEGRADE:
+        raise rejection
+
+    key = build_cache_key(processed_conditions, top_n)
+    if supports_approximate(processed_conditions):
+        approx_result = get_approximate_top_nouns(processed_conditions, top_n)
+        if approx_result is not None:
+            return {**key, **approx_result, "engine": ENGINE_APPROXIMATE, "cache_hit": False, "degraded": True}
+
+    try:
+        with admit_degraded_sample():
+            sampled_result = estimate_top_nouns_by_sampling(build_record_query(processed_conditions), top_n,
+                                                            initial_size=SAMPLE_INITIAL_SIZE,
+                                                            max_size=SAMPLE_INITIAL_SIZE)
+    except AdmissionRejected as e:
+        print(f"🚦 혼잡 시 대체 응답도 거절: {e}")
+        raise rejection
+    if sampled_result is not None:
+        return {**key, **sampled_result, "engine": ENGINE_SAMPLED, "cache_hit": False, "degraded": True}
+    raise rejection
+
+
+def get_top_nouns_document(query_conditions: Dict[str, Any], top_n: int = TOP_N,
+                           engine: str = ENGINE_EXACT, admission: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    캐시 확인 후, 없으면 계산 및 저장하여 캐시 문서(top_words, total_records 포함)를 반환합니다.
+    반환 문서의 'cache_hit' 필드로 캐시 적중 여부를, 'engine' 필드로 응답한 엔진을 알 수 있습니다.
+    (engine='approximate'는 스케치 병합으로 즉시 답하며 캐시에 저장하지 않습니다.
+     스케치로 답할 수 없는 조건(Title 등)은 정확(exact) 엔진으로 처리합니다.
+     engine='sampled'는 캐시 미스 시 표본 추정치를 반환하고 정확한 결과는 백그라운드에서 캐시에 저장합니다.)
+
+    admission=True이면 캐시 미스의 정확 집계가 동시 실행 제한(admission)을 거칩니다. (캐시 적중은 거치지 않음)
+    슬롯을 얻지 못하면 근사/표본 추정치('degraded': True)로 응답하거나 AdmissionRejected를 발생시킵니다.
+    """
+    processed_conditions = normalize_query_conditions(query_conditions)
+    if processed_conditions is None:
         print("❌ 오류: Title, Tags, Start Date/End Date 중 최소한 하나는 입력되어야 합니다.")
         return None
 
-    tt = title if title is not None else ""
-    tg = tags if tags is not None else None
-    sd = start_date if start_date is not None else ""
-    ed = end_date if end_date is not None else ""
-
-    processed_conditions = {
-        'title': tt, 'tags': tg, 'start_date': sd, 'end_date': ed,
-    }
+    if engine == ENGINE_APPROXIMATE:
+        if supports_approximate(processed_conditions):
+            approx_result = get_approximate_top_nouns(processed_conditions, top_n)
+            if approx_result is None:
+                return None
+            return {**build_cache_key(processed_conditions, top_n), **approx_result,
+                    "engine": ENGINE_APPROXIMATE, "cache_hit": False}
+        print("⚠️ 근사 엔진이 지원하지 않는 조건입니다. (Title, 여러 태그 또는 날짜 형식) 정확 엔진으로 처리합니다.")
 
     # 1. 캐시 확인
-    cached_result = get_top_nouns_from_cache(processed_conditions, top_n)
-    if cached_result is not None:
-        return cached_result
+    cached_doc = get_cached_document(processed_conditions, top_n)
+    if cached_doc is not None:
+        return {**cached_doc, "engine": ENGINE_EXACT, "cache_hit": True}
+
+    if engine == ENGINE_SAMPLED:
+        # 표본으로 빠르게 미리보기를 반환하고, 정확한 결과는 백그라운드에서 계산하여 캐시에 저장
+        # (표본 추정도 캐시 미스의 DB 검색이므로 admission=True이면 같은 슬롯 제한을 받음)
+        start_background_calculation(processed_conditions, top_n)
+        try:
+            with admit() if admission else nullcontext():
+                sampled_result = estimate_top_nouns_by_sampling(build_record_query(processed_conditions), top_n)
+        except AdmissionRejected as rejection:
+            return _get_degraded_document(processed_conditions, top_n, rejection)
+        if sampled_result is None:
+            return None
+        return {**build_cache_key(processed_conditions, top_n), **sampled_result,
+                "engine": ENGINE_SAMPLED, "cache_hit": False}
 
     # 2. 중간 데이터 DB에서 계산 및 저장
     print("⚠️ 캐시 미스. 중간 데이터 DB에서 명사 집계 및 캐시 저장 시작...")
 
-    # calculate_and_save_top_nouns 내부에서 1차 검색 실패 시 자동 재처리 및 2차 검색이 실행됩니다.
-    result = calculate_and_save_top_nouns(processed_conditions, top_n)
+    # calculate_and_save_document 내부에서 1차 검색 실패 시 자동 재처리 및 2차 검색이 실행됩니다.
+    if admission:
+        try:
+            result_doc = _calculate_admitted(processed_conditions, top_n)
+        except AdmissionRejected as rejection:
+            return _get_degraded_document(processed_conditions, top_n, rejection)
+    else:
+        result_doc = calculate_and_save_document(processed_conditions, top_n)
+    if result_doc is None:
+        return None
+
+    return {**result_doc, "engine": ENGINE_EXACT, "cache_hit": False}
 
-    return result
\ No newline at end of file
+
+def get_top_nouns_for_conditions(query_conditions: Dict[str, Any], top_n: int = TOP_N) -> Optional[
+    List[Dict[str, Any]]]:
+    """
+    메인 진입 함수: 캐시 확인 후, 없으면 계산 및 저장 후 결과를 반환합니다.
+    (calculate_and_save_top_nouns 내부에서 조건 검색 실패 시 분산 재처리가 자동으로 수행됩니다.)
+    """
+    result_doc = get_top_nouns_document(query_conditions, top_n)
+    return result_doc.get(CACHE_FIELD_TOP_WORDS) if result_doc is not None else None
+
+
+def _count_batch_group(db, group: List[Dict[str, Any]]) -> None:
+    """
+    캐시 미스 조건 세트 묶음(group)의 합집합을 한 번만 검색하면서 각 레코드를 일치하는 조건 세트의 카운터에 나누어
+    집계하고, 조건별 상위 N개를 캐시에 저장합니다. (결과 문서는 각 항목의 'document'에 기록)
+    조건 세트별 카운터는 AGG_MEMORY_LIMIT_MB를 나눠 쓰는 StreamingNounCounter이므로 묶음 전체의 메모리가 제한됩니다.
+    """
+    generation = get_data_version(db)
+    union_query = {"$or": [build_record_query(item["conditions"]) for item in group]}
+    projection = {DB_FIELD_HEADING: 1, DB_FIELD_TAGS: 1, DB_FIELD_DATE: 1, DB_FIELD_NOUNS: 1, "_id": 0}
+
+    with ExitStack() as stack:
+        counters = [stack.enter_context(StreamingNounCounter(AGG_MEMORY_LIMIT_MB / len(group))) for _ in group]
+        with db[RECORD_NOUNS_COLLECTION].find(union_query, projection, batch_size=1000) as cursor:
+            for record in cursor:
+                nouns = record.get(DB_FIELD_NOUNS, [])
+                for item, counter in zip(group, counters):
+                    if record_matches_conditions(record, item["conditions"]):
+                        counter.add_record(nouns)
+
+        # 조건별 상위 N개를 캐시에 저장 (집계 중 데이터 세대가 바뀌었으면 저장하지 않음)
+        store_to_cache = get_data_version(db) == generation
+        cache_collection = db[TOP_NOUNS_CACHE_COLLECTION]
+        for item, counter in zip(group, counters):
+            cache_document = {
+                **item["cache_key"],
+                CACHE_FIELD_GENERATION: generation,
+                CACHE_FIELD_TOTAL_RECORDS: counter.records,
+                CACHE_FIELD_TOP_WORDS: [{"word": word, "count": count} for word, count in counter.top(item["top_n"])],
+            }
+            if store_to_cache and counter.records:
+                cache_collection.replace_one(item["cache_key"], cache_document, upsert=True)
+                cache_document.pop("_id", None)
+            item["document"] = {**cache_document, "engine": ENGINE_EXACT, "cache_hit": False}
+
+
+def _get_rejected_batch_document(item: Dict[str, Any], rejection: AdmissionRejected) -> Dict[str, Any]:
+    """집계 슬롯을 얻지 못한 배치 항목: 근사/표본 추정치로 응답하거나, 그것도 안 되면 항목만 503으로 표시합니다."""
+    try:
+        return _get_degraded_document(item["conditions"], item["top_n"], rejection)
+    except AdmissionRejected as e:
+        return {"error": str(e), "status": 503, "retry_after": e.retry_after}
+
+
+def get_top_nouns_batch(batch_conditions: List[Dict[str, Any]], top_n: int = TOP_N,
+                        admission: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    여러 조건 세트의 상위 N개를 한 번에 계산합니다. (대시보드의 태그별/연도별 조회 등)
+    각 조건 세트에는 'top_n'을 따로 지정할 수 있으며, 결과는 입력 순서대로 반환됩니다.
+
+    1. 캐시에 있는 조건 세트는 캐시에서 바로 응답합니다.
+    2. 나머지는 BATCH_SCAN_GROUP_SIZE개씩 묶어, 묶음마다 조건들의 합집합($or)을 한 번만 검색하면서
+       각 레코드를 일치하는 모든 조건 세트의 카운터에 나누어 집계합니다. (N번의 중복 검색 대신 묶음당 1번)
+    (단건 조회와 달리 레코드가 없어도 워커 재처리를 요청하지 않습니다.)
+    admission=True이면 묶음마다 동시 실행 제한을 거칩니다. 슬롯을 얻지 못한 묶음의 조건 세트만 근사/표본 추정치
+    ('degraded': True)로 응답하거나 {"error", "status": 503, "retry_after"}로 표시하며, 캐시 적중 결과는 그대로 반환합니다.
+    """
+    client = get_mongodb_client()
+    if not client: return None
+    db = client[DB_NAME]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(batch_conditions)
+    pending: Dict[tuple, Dict[str, Any]] = {}  # 캐시 키 -> 계산할 조건 세트 (중복 조건은 한 번만 계산)
+
+    # 1. 캐시 확인
+    for index, raw_conditions in enumerate(batch_conditions):
+        item_top_n = raw_conditions.get('top_n') or top_n
+        processed_conditions = normalize_query_conditions(raw_conditions)
+        if processed_conditions is None:
+            results[index] = {"error": "title, tags, start_date, end_date 중 최소한 하나는 입력해야 합니다."}
+            continue
+
+        cache_key = build_cache_key(processed_conditions, item_top_n)
+        cached_doc = _find_current_cached_document(db, cache_key)
+        if cached_doc is not None:
+            results[index] = {**cached_doc, "engine": ENGINE_EXACT, "cache_hit": True}
+            continue
+
+        key = tuple(sorted(cache_key.items()))
+        pending.setdefault(key, {
+            "conditions": processed_conditions, "top_n": item_top_n, "cache_key": cache_key, "indexes": [],
+        })["indexes"].append(index)
+
+    print(f"📦 배치 조회: 전체 {len(batch_conditions)}건 중 캐시 미스 {len(pending)}건을 "
+          f"{BATCH_SCAN_GROUP_SIZE}건씩 묶어 집계합니다.")
+
+    # 2. 묶음마다 (admission=True이면 동시 실행 제한 슬롯을 얻은 뒤) 한 번만 검색
+    #    한 번 거절되면 남은 묶음도 슬롯을 기다리지 않고 대체 응답으로 처리
+    items = list(pending.values())
+    rejection: Optional[AdmissionRejected] = None
+    try:
+        for start in range(0, len(items), BATCH_SCAN_GROUP_SIZE):
+            group = items[start:start + BATCH_SCAN_GROUP_SIZE]
+            if rejection is None:
+                try:
+                    with admit() if admission else nullcontext():
+                        _count_batch_group(db, group)
+                except AdmissionRejected as e:
+                    print(f"🚦 배치 조회 집계 거절: {e}")
+                    rejection = e
+            for item in group:
+                document = item["document"] if "document" in item else _get_rejected_batch_document(item, rejection)
+                for index in item["indexes"]:
+                    results[index] = document
+    finally:
+        client.close()
+    return results
@@ -22,6 +22,12 @@ MONGO_URI = (
 # ----------------------------------------------------------------------
 RECORD_NOUNS_COLLECTION = "ImFiles"
 TOP_NOUNS_CACHE_COLLECTION = "CacheDatas"
+META_COLLECTION = "MetaDatas"
+NOUN_SKETCH_COLLECTION = "NounSketches"
+NOUN_PERIOD_COLLECTION = "NounPeriodCounts"
+NOUN_PERIOD_SOURCE_COLLECTION = "NounPeriodSources"  # 기간별 빈도를 만든 ImFiles의 월별 지문 (증분 갱신 기준)
+NOUN_HASH_COLLECTION = "NounHashes"  # 정규화한 기사 본문 해시 -> 추출된 명사 (재생성 간 유지)
+ADMISSION_COLLECTION = "AdmissionSlots"  # 클러스터 전체 캐시 미스 집계 슬롯 (임대 방식)
 TOP_N = 50
 
 # A. 🌟 워커 이름 및 할당된 파일 경로 목록 🌟
@@ -61,11 +67,14 @@ WORKER_ADDRESSES = [
 # 3. MongoDB 문서 필드 스키마 정의
 # ----------------------------------------------------------------------
 DB_FIELD_HEADING = 'Heading'
+DB_FIELD_HEADING_TOKENS = 'heading_tokens'  # 제목 검색 인덱스용 소문자 단어 토큰 목록
 DB_FIELD_DATE = 'Date'
 DB_FIELD_TAGS = 'Tags'
 DB_FIELD_ARTICLES = 'Articles'
 DB_FIELD_NOUNS = 'nouns'
 DB_FIELD_RECORD_ID = 'record_id'
+DB_FIELD_CONTENT_HASH = 'content_hash'  # 정규화한 제목+본문의 SHA-256 (중복 기사 판별)
+DB_FIELD_RANDOM_KEY = 'rand'  # [0, 1) 균등 난수 (인덱스 범위 검색으로 표본을 뽑는 키)
 
 CACHE_FIELD_TITLE_QUERY = 'Title'
 CACHE_FIELD_START_DATE_QUERY = 'StartDate'
@@ -73,6 +82,38 @@ CACHE_FIELD_END_DATE_QUERY = 'EndDate'
 CACHE_FIELD_TAGS_QUERY = 'Tags'
 CACHE_FIELD_TOP_N = 'top_n'
 CACHE_FIELD_TOP_WORDS = 'top_words'
+CACHE_FIELD_TOTAL_RECORDS = 'total_records'
+CACHE_FIELD_GENERATION = 'generation'  # 캐시 문서를 계산할 때 사용한 데이터 세대
+
+SKETCH_FIELD_GRANULARITY = 'granularity'
+SKETCH_FIELD_BUCKET = 'bucket'
+SKETCH_FIELD_TAG = 'tag'
+SKETCH_FIELD_COUNTERS = 'counters'
+SKETCH_FIELD_OMITTED_MAX = 'omitted_max'
+SKETCH_FIELD_TOTAL = 'total'
+SKETCH_FIELD_RECORDS = 'records'
+
+PERIOD_FIELD_GRANULARITY = 'granularity'
+PERIOD_FIELD_PERIOD = 'period'
+PERIOD_FIELD_TAG = 'tag'
+PERIOD_FIELD_WORD = 'word'
+PERIOD_FIELD_COUNT = 'count'
+
+META_DOC_DATA_VERSION = 'data_version'
+META_FIELD_VERSION = 'version'  # 현재 서비스 중인 데이터 세대
+META_FIELD_NEXT_GENERATION = 'next_generation'  # 마지막으로 할당된 세대 (스테이징용)
+META_FIELD_DERIVED_VERSION = 'derived_version'  # 스케치/기간별 빈도를 만든 ImFiles 세대
+META_FIELD_SWAPPING = 'swapping'  # ImFiles 교체를 진행 중인 세대 (동시에 하나만 교체)
+META_FIELD_SWAPPING_SINCE = 'swapping_since'  # 교체 시작 시각 (교체 중 프로세스가 죽어도 임대가 만료되도록)
+META_DOC_TITLE_INDEX = 'title_index'
+META_FIELD_BACKFILLED = 'backfilled'  # ImFiles 전체에 heading_tokens가 채워졌는지 (채워지기 전에는 regex 검색)
+META_DOC_RANDOM_KEY = 'random_key'  # backfilled: ImFiles 전체에 rand가 채워졌는지 (채워지기 전에는 $sample 사용)
+
+HASH_FIELD_NOUNS = 'nouns'
+HASH_FIELD_EXTRACTOR_VERSION = 'extractor_version'  # 명사를 추출한 추출기 버전
+
+ADMISSION_FIELD_HOLDER = 'holder'  # 슬롯을 임대한 요청의 토큰 (비어 있으면 사용 가능)
+ADMISSION_FIELD_EXPIRES_AT = 'expires_at'  # 임대 만료 시각 (프로세스가 죽어도 슬롯이 회수되도록)
 
 
 # ----------------------------------------------------------------------
@@ -104,4 +145,113 @@ EXCLUDE_NOUNS = {
     'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
     'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
     'i', 'we', 'you', 'he', 'she', 'it', 'they', 'us', 'him', 'her', 'them'
-}
\ No newline at end of file
+}
+
+
+# ----------------------------------------------------------------------
+# 6. JSON API 응답 설정
+# ----------------------------------------------------------------------
+API_CACHE_MAX_AGE = int(os.environ.get('API_CACHE_MAX_AGE', '60'))  # 초 단위
+API_COMPRESS_MIN_BYTES = 200  # 이보다 작은 응답은 압축하지 않음
+BATCH_MAX_QUERIES = int(os.environ.get('BATCH_MAX_QUERIES', '100'))  # 배치 API 한 번에 받을 조건 세트 수
+TREND_RISING_MAX_LIMIT = int(os.environ.get('TREND_RISING_MAX_LIMIT', '200'))  # 상승 명사 API 한 번에 반환할 명사 수 상한
+# 배치 API에서 ImFiles 검색 한 번을 함께 쓰는 캐시 미스 조건 세트 수 (조건 세트별 카운터가 집계 메모리 상한을 나눠 씀)
+BATCH_SCAN_GROUP_SIZE = int(os.environ.get('BATCH_SCAN_GROUP_SIZE', '10'))
+# API 요청마다 MetaDatas를 조회하지 않도록 프로세스 안에서 데이터 세대 번호를 재사용하는 시간(초, 0이면 매번 조회)
+DATA_VERSION_CACHE_SECONDS = float(os.environ.get('DATA_VERSION_CACHE_SECONDS', '2'))
+GENERATION_SWAP_LEASE_SECONDS = 600  # ImFiles 교체 임대 만료 시간(초)
+
+
+# ----------------------------------------------------------------------
+# 7. 전체 빈도표 내보내기(Export) 설정
+# ----------------------------------------------------------------------
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))  # 서버 측 커서 배치 크기
+
+
+# ----------------------------------------------------------------------
+# 8. 근사(Heavy-hitter) 엔진 설정
+# ----------------------------------------------------------------------
+# (일/월, 태그) 버킷마다 보관하는 상위 단어 수. 클수록 오차 한계가 작아지고 저장 공간이 커집니다.
+SKETCH_CAPACITY = int(os.environ.get('SKETCH_CAPACITY', '500'))
+
+# 상위 N개를 계산한 엔진 이름 (응답의 'engine' 필드)
+ENGINE_EXACT = 'exact'
+ENGINE_APPROXIMATE = 'approximate'
+ENGINE_SAMPLED = 'sampled'
+
+
+# ----------------------------------------------------------------------
+# 9. 표본(Sampled) 추정 엔진 설정
+# ----------------------------------------------------------------------
+SAMPLE_INITIAL_SIZE = int(os.environ.get('SAMPLE_INITIAL_SIZE', '500'))  # 첫 표본 레코드 수 (이후 2배씩 증가)
+SAMPLE_MAX_SIZE = int(os.environ.get('SAMPLE_MAX_SIZE', '20000'))  # 표본 레코드 수 상한
+SAMPLE_CONFIDENCE_TARGET = float(os.environ.get('SAMPLE_CONFIDENCE_TARGET', '0.9'))  # 순위 신뢰도/안정성 목표치
+# 표본 검색 한 번의 서버 실행 시간 상한 (조건에 맞는 레코드가 드물어 rand 인덱스를 오래 훑는 경우를 제한)
+SAMPLE_SCAN_MAX_TIME_MS = int(os.environ.get('SAMPLE_SCAN_MAX_TIME_MS', '2000'))
+
+
+# ----------------------------------------------------------------------
+# 10. 제목(Title) 검색 설정
+# ----------------------------------------------------------------------
+# 'token': heading_tokens 인덱스로 단어 접두어 검색 (기본), 'regex': 기존 부분 문자열 검색 (인덱스 미사용)
+TITLE_SEARCH_MODE = os.environ.get('TITLE_SEARCH_MODE', 'token')
+TITLE_INDEX_BATCH_SIZE = 1000  # 제목 토큰 백필 시 bulk_write 단위
+# 'token' 모드에서 검색어 단어가 이보다 짧으면 (예: 'c++' -> 'c') 접두어가 너무 넓어지므로 'regex' 모드로 처리
+TITLE_MIN_TOKEN_LENGTH = 2
+
+
+# ----------------------------------------------------------------------
+# 11. 정확(Exact) 집계 메모리 설정
+# ----------------------------------------------------------------------
+AGG_CURSOR_BATCH_SIZE = int(os.environ.get('AGG_CURSOR_BATCH_SIZE', '1000'))  # 레코드 커서 배치 크기
+# 명사 빈도표가 메모리에서 차지할 수 있는 상한(MB). 넘으면 부분 빈도를 임시 파일로 내보냄
+AGG_MEMORY_LIMIT_MB = float(os.environ.get('AGG_MEMORY_LIMIT_MB', '256'))
+AGG_ESTIMATED_BYTES_PER_NOUN = 200  # 빈도표 항목 하나(dict 슬롯 + str + int)의 추정 크기
+AGG_MAX_SPILL_FILES = 32  # 임시 파일이 이 개수에 도달하면 하나로 병합 (병합 시 동시에 여는 파일 수 제한)
+# 정확 집계를 나눠 처리할 프로세스 수 (1이면 단일 프로세스 스트리밍 집계)
+AGG_PARALLEL_WORKERS = int(os.environ.get('AGG_PARALLEL_WORKERS', str(min(os.cpu_count() or 1, 8))))
+AGG_PARALLEL_MIN_RECORDS = int(os.environ.get('AGG_PARALLEL_MIN_RECORDS', '20000'))  # 이보다 적으면 병렬 처리하지 않음
+
+
+# ----------------------------------------------------------------------
+# 12. 중복 기사(Content-hash) 처리 설정
+# ----------------------------------------------------------------------
+DEDUP_COUNT_PER_OCCURRENCE = 'per_occurrence'  # 중복 기사도 등장할 때마다 집계 (명사 추출만 재사용)
+DEDUP_COUNT_ONCE = 'once'  # 같은 내용의 기사는 한 번만 저장/집계
+DEDUP_COUNT_MODES = (DEDUP_COUNT_PER_OCCURRENCE, DEDUP_COUNT_ONCE)
+DEDUP_COUNT_MODE = os.environ.get('DEDUP_COUNT_MODE', DEDUP_COUNT_PER_OCCURRENCE)
+# 명사 추출 로직(불용어, 형태소 분석기 등)을 바꾸면 올려서 저장된 추출 결과를 재사용하지 않도록 함
+DEDUP_EXTRACTOR_VERSION = os.environ.get('DEDUP_EXTRACTOR_VERSION', '1')
+DEDUP_LOOKUP_BATCH_SIZE = 500  # 해시 저장소 조회/저장 단위
+
+
+# ----------------------------------------------------------------------
+# 13. 캐시 미스 집계 동시 실행 제한(Admission control) 설정
+# ----------------------------------------------------------------------
+ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', '1') == '1'
+ADMISSION_PROCESS_SLOTS = int(os.environ.get('ADMISSION_PROCESS_SLOTS', '2'))  # 프로세스당 동시 집계 수
+ADMISSION_CLUSTER_SLOTS = int(os.environ.get('ADMISSION_CLUSTER_SLOTS', '8'))  # 전체 서버 동시 집계 수 (0이면 제한 없음)
+ADMISSION_MAX_WAITERS = int(os.environ.get('ADMISSION_MAX_WAITERS', '8'))  # 프로세스당 대기열 길이
+ADMISSION_WAIT_SECONDS = float(os.environ.get('ADMISSION_WAIT_SECONDS', '2'))  # 슬롯을 기다리는 최대 시간
+ADMISSION_LEASE_SECONDS = int(os.environ.get('ADMISSION_LEASE_SECONDS', '600'))  # 클러스터 슬롯 임대 기간
+ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', '5'))  # 거절 응답의 Retry-After(초)
+# 슬롯이 없을 때: 'degrade'는 근사/표본 추정치로 응답, 'reject'는 바로 503 응답
+ADMISSION_POLICY_DEGRADE = 'degrade'
+ADMISSION_POLICY_REJECT = 'reject'
+ADMISSION_OVERLOAD_POLICY = os.environ.get('ADMISSION_OVERLOAD_POLICY', ADMISSION_POLICY_DEGRADE)
+# 'degrade' 정책에서 스케치로 답할 수 없는 조건에 표본 추정(1회, SAMPLE_INITIAL_SIZE건)을 동시에 실행할 수 있는 수
+# (다 쓰고 있으면 503 + Retry-After, 0이면 표본 추정 없이 스케치로만 대체)
+ADMISSION_DEGRADED_SAMPLE_SLOTS = int(os.environ.get('ADMISSION_DEGRADED_SAMPLE_SLOTS', '1'))
+
+
+# ----------------------------------------------------------------------
+# 14. 워커 <-> 마스터 바이너리 전송 형식 설정
+# ----------------------------------------------------------------------
+TRANSPORT_CONTENT_TYPE = 'application/x-textcounter-frames'
+TRANSPORT_VERSION = 1  # 프레임 헤더의 형식 버전 (호환되지 않게 바뀌면 올림)
+TRANSPORT_COMPRESS_MIN_BYTES = 512  # 이보다 작은 프레임 본문은 압축하지 않음
+# 디버깅용: 1이면 msgpack/압축 대신 사람이 읽을 수 있는 JSON 본문으로 프레임을 만듦
+TRANSPORT_FORCE_JSON = os.environ.get('TRANSPORT_FORCE_JSON', '0') == '1'
+# 프레임 하나의 본문 최대 크기(압축된 상태)와 압축을 푼 뒤의 최대 크기 (넘으면 TransportError, 손상/악의적 프레임 방어)
+TRANSPORT_MAX_FRAME_BYTES = int(os.environ.get('TRANSPORT_MAX_FRAME_BYTES', str(64 * 1024 * 1024)))
+TRANSPORT_MAX_DECODED_BYTES = int(os.environ.get('TRANSPORT_MAX_DECODED_BYTES', str(256 * 1024 * 1024)))
@@ -0,0 +1,230 @@
+# data_processor/data_version.py
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from pymongo import ReturnDocument
+from .db_connector import get_mongodb_client
+from .constants import (
+    DB_NAME, META_COLLECTION, META_DOC_DATA_VERSION, META_FIELD_VERSION, META_FIELD_NEXT_GENERATION,
+    META_FIELD_DERIVED_VERSION, META_FIELD_SWAPPING, META_FIELD_SWAPPING_SINCE,
+    RECORD_NOUNS_COLLECTION, DATA_VERSION_CACHE_SECONDS, GENERATION_SWAP_LEASE_SECONDS
+)
+
+# 분산 재생성 중 워커들이 레코드를 쓰는 스테이징 컬렉션 이름 접두어 (뒤에 세대 번호가 붙음)
+STAGING_COLLECTION_PREFIX = f"{RECORD_NOUNS_COLLECTION}_staging_"
+
+# db 없이 호출될 때(API 요청 경로) 재사용하는 (세대 번호, 파생 컬렉션 세대 번호, 조회 시각[monotonic])
+_cached_version: Optional[Tuple[int, int, float]] = None
+_cached_version_lock = threading.Lock()
+
+# MetaDatas의 완료 플래그 조회 결과 {(문서 _id, 필드): (값, 조회 시각[monotonic])}: 요청마다 읽지 않도록 잠시 재사용
+_meta_flags: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+_meta_flags_lock = threading.Lock()
+
+
+def staging_collection_name(generation: int) -> str:
+    """주어진 데이터 세대(generation)의 스테이징 컬렉션 이름을 반환합니다."""
+    return f"{STAGING_COLLECTION_PREFIX}{generation}"
+
+
+def _remember_versions(meta_doc: Optional[dict]) -> Tuple[int, int]:
+    global _cached_version
+    version = meta_doc.get(META_FIELD_VERSION, 0) if meta_doc else 0
+    derived_version = meta_doc.get(META_FIELD_DERIVED_VERSION, 0) if meta_doc else 0
+    with _cached_version_lock:
+        _cached_version = (version, derived_version, time.monotonic())
+    return version, derived_version
+
+
+def _get_versions(db=None) -> Optional[Tuple[int, int]]:
+    client = None
+    if db is None:
+        cached = _cached_version
+        if cached and time.monotonic() - cached[2] < DATA_VERSION_CACHE_SECONDS:
+            return cached[0], cached[1]
+        client = get_mongodb_client()
+        if not client: return None
+        db = client[DB_NAME]
+
+    meta_doc = db[META_COLLECTION].find_one({"_id": META_DOC_DATA_VERSION})
+    if client: client.close()
+    return _remember_versions(meta_doc)
+
+
+def get_data_version(db=None) -> Optional[int]:
+    """
+    현재 서비스 중인 ImFiles 데이터의 세대(버전) 번호를 반환합니다.
+    (한 번도 기록된 적이 없으면 0, DB 연결 실패 시 None)
+    db 없이 호출하면 DATA_VERSION_CACHE_SECONDS 동안 프로세스 안에서 조회 결과를 재사용합니다.
+    (다른 프로세스에서 공개한 새 세대는 최대 그 시간만큼 늦게 반영됨)
+    """
+    versions = _get_versions(db)
+    return versions[0] if versions else None
+
+
+def derived_collections_current(db=None) -> bool:
+    """
+    스케치/기간별 빈도 컬렉션이 현재 서비스 중인 세대의 ImFiles로 만들어졌는지 확인합니다.
+    (재생성 직후 백그라운드 생성이 끝나기 전에는 False: 이 컬렉션으로 만든 응답에는 ETag를 붙이지 않음)
+    """
+    versions = _get_versions(db)
+    return bool(versions) and versions[0] == versions[1]
+
+
+def _remember_meta_flag(doc_id: str, field: str, value: bool) -> None:
+    with _meta_flags_lock:
+        _meta_flags[(doc_id, field)] = (value, time.monotonic())
+
+
+def get_meta_flag(doc_id: str, field: str) -> bool:
+    """
+    MetaDatas 문서(doc_id)의 완료 플래그(field)를 반환합니다. (기록된 적이 없거나 DB 연결 실패 시 False)
+    조회 결과는 DATA_VERSION_CACHE_SECONDS 동안 프로세스 안에서 재사용합니다.
+    """
+    cached = _meta_flags.get((doc_id, field))
+    if cached and time.monotonic() - cached[1] < DATA_VERSION_CACHE_SECONDS:
+        return cached[0]
+
+    client = get_mongodb_client()
+    if not client:
+        return False
+    meta_doc = client[DB_NAME][META_COLLECTION].find_one({"_id": doc_id})
+    client.close()
+
+    value = bool(meta_doc and meta_doc.get(field))
+    _remember_meta_flag(doc_id, field, value)
+    return value
+
+
+def set_meta_flag(db, doc_id: str, field: str, value: bool = True) -> None:
+    """MetaDatas 문서(doc_id)에 완료 플래그(field)를 기록합니다."""
+    db[META_COLLECTION].update_one({"_id": doc_id}, {"$set": {field: value}}, upsert=True)
+    _remember_meta_flag(doc_id, field, value)
+
+
+def allocate_generation(db=None) -> Optional[int]:
+    """
+    새 데이터 세대 번호를 원자적으로 할당합니다. (아직 서비스 중인 세대로 공개되지는 않음)
+    동시에 여러 재생성이 시작되어도 서로 다른 스테이징 컬렉션을 사용하게 됩니다.
+    """
+    client = None
+    if db is None:
+        client = get_mongodb_client()
+        if not client: return None
+        db = client[DB_NAME]
+
+    # 처음 할당할 때는 현재 버전 다음 번호부터 시작
+    current_version = get_data_version(db)
+    db[META_COLLECTION].update_one(
+        {"_id": META_DOC_DATA_VERSION},
+        {"$max": {META_FIELD_NEXT_GENERATION: current_version}},
+        upsert=True
+    )
+    meta_doc = db[META_COLLECTION].find_one_and_update(
+        {"_id": META_DOC_DATA_VERSION},
+        {"$inc": {META_FIELD_NEXT_GENERATION: 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if client: client.close()
+
+    return meta_doc[META_FIELD_NEXT_GENERATION]
+
+
+def publish_generation(generation: int, db=None) -> Optional[int]:
+    """
+    주어진 세대를 서비스 중인 데이터 버전으로 공개합니다. (더 오래된 세대로 되돌리지는 않음)
+    이후 이전 세대로 계산된 캐시 문서는 무시되고 조회 시 삭제됩니다.
+    """
+    client = None
+    if db is None:
+        client = get_mongodb_client()
+        if not client: return None
+        db = client[DB_NAME]
+
+    meta_doc = db[META_COLLECTION].find_one_and_update(
+        {"_id": META_DOC_DATA_VERSION},
+        {"$max": {META_FIELD_VERSION: generation, META_FIELD_NEXT_GENERATION: generation}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    if client: client.close()
+
+    published, _ = _remember_versions(meta_doc)
+    print(f"🔖 데이터 세대 공개: {published}")
+    return published
+
+
+def publish_derived_version(generation: int, db) -> None:
+    """스케치/기간별 빈도 컬렉션을 주어진 세대의 ImFiles로 만들었음을 기록합니다."""
+    meta_doc = db[META_COLLECTION].find_one_and_update(
+        {"_id": META_DOC_DATA_VERSION},
+        {"$max": {META_FIELD_DERIVED_VERSION: generation}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    _remember_versions(meta_doc)
+
+
+def claim_generation_swap(generation: int, db) -> Optional[bool]:
+    """
+    ImFiles를 주어진 세대로 교체할 권한을 원자적으로 얻습니다. (compare-and-set)
+    더 새로운 세대가 이미 공개되었거나 다른 교체가 진행 중이면 얻지 못합니다.
+    반환값: True(획득), False(더 새로운 세대가 이미 공개됨: 교체하면 안 됨), None(다른 교체 진행 중)
+    """
+    now = datetime.now(timezone.utc)
+    claimed = db[META_COLLECTION].find_one_and_update(
+        {"_id": META_DOC_DATA_VERSION,
+         "$and": [
+             {"$or": [{META_FIELD_VERSION: {"$lt": generation}}, {META_FIELD_VERSION: {"$exists": False}}]},
+             {"$or": [{META_FIELD_SWAPPING: None},
+                      {META_FIELD_SWAPPING_SINCE: {"$lt": now - timedelta(seconds=GENERATION_SWAP_LEASE_SECONDS)}}]},
+         ]},
+        {"$set": {META_FIELD_SWAPPING: generation, META_FIELD_SWAPPING_SINCE: now}},
+        projection={"_id": 1}
+    )
+    if claimed:
+        return True
+    return None if (get_data_version(db) or 0) < generation else False
+
+
+def release_generation_swap(generation: int, db, publish: bool = True) -> Optional[int]:
+    """
+    claim_generation_swap으로 얻은 교체 권한을 반납합니다.
+    publish=True이면 같은 갱신에서 세대를 공개합니다. (공개된 세대 번호 반환)
+    """
+    update = {"$set": {META_FIELD_SWAPPING: None, META_FIELD_SWAPPING_SINCE: None}}
+    if publish:
+        update["$max"] = {META_FIELD_VERSION: generation, META_FIELD_NEXT_GENERATION: generation}
+    meta_doc = db[META_COLLECTION].find_one_and_update(
+        {"_id": META_DOC_DATA_VERSION, META_FIELD_SWAPPING: generation},
+        update,
+        return_document=ReturnDocument.AFTER
+    )
+    if meta_doc is None:
+        return None  # 임대가 만료되어 다른 교체가 가져감
+    published, _ = _remember_versions(meta_doc)
+    if publish:
+        print(f"🔖 데이터 세대 공개: {published}")
+    return published
+
+
+def bump_data_version(db=None) -> Optional[int]:
+    """
+    ImFiles 데이터가 바뀌었음을 기록하기 위해 새 세대를 할당하고 즉시 공개합니다.
+    (스테이징 없이 데이터가 바뀌는 DB 초기화 등에서 호출)
+    """
+    client = None
+    if db is None:
+        client = get_mongodb_client()
+        if not client: return None
+        db = client[DB_NAME]
+
+    derived_current = derived_collections_current(db)
+    new_version = publish_generation(allocate_generation(db), db)
+    if derived_current:
+        # 스케치/기간별 빈도는 그대로 유효함 (DB 초기화는 함께 삭제하므로 빈 ImFiles와도 일치)
+        publish_derived_version(new_version, db)
+    if client: client.close()
+    return new_version
@@ -0,0 +1,80 @@
+# data_processor/dedup.py
+
+import hashlib
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+from pymongo import DeleteMany
+from .db_connector import get_mongodb_client
+from .constants import (
+    DB_NAME, DB_FIELD_DATE, DB_FIELD_CONTENT_HASH,
+    DEDUP_COUNT_MODE, DEDUP_COUNT_MODES, DEDUP_EXTRACTOR_VERSION, DEDUP_LOOKUP_BATCH_SIZE
+)
+
+_NON_WORD_PATTERN = re.compile(r'[^\w]+', re.UNICODE)
+
+
+def normalize_article_text(heading: Any, articles: Any) -> str:
+    """
+    재게시 기사의 사소한 차이(대소문자, 공백, 문장부호, 유니코드 표기)를 없앤 비교용 텍스트를 만듭니다.
+    (제목과 본문은 따로 정규화한 뒤 줄바꿈으로 이어, 제목/본문 경계가 다른 기사가 같아지지 않게 함)
+    """
+    def normalize(value: Any) -> str:
+        text = unicodedata.normalize('NFKC', str(value or '')).casefold()
+        return _NON_WORD_PATTERN.sub(' ', text).strip()
+
+    return f"{normalize(heading)}\n{normalize(articles)}"
+
+
+def content_hash(heading: Any, articles: Any) -> str:
+    """정규화한 제목+본문의 SHA-256 해시(16진수)를 반환합니다. (워커가 content_hash 필드를 채울 때와 같은 규칙)"""
+    return hashlib.sha256(normalize_article_text(heading, articles).encode('utf-8')).hexdigest()
+
+
+def dedup_rebuild_options(count_mode: str = DEDUP_COUNT_MODE,
+                          extractor_version: str = DEDUP_EXTRACTOR_VERSION) -> Dict[str, str]:
+    """
+    재생성 요청에 실어 워커에게 보내는 명사 추출 단계의 중복 처리 설정입니다.
+    (명사 추출은 워커 측 Importer가 수행하며, 워커는 content_hash()와 같은 규칙으로 content_hash 필드를 채우고
+    해시 저장소(NounHashes)에서 같은 extractor_version으로 추출한 명사를 재사용합니다.)
+
+    - 'per_occurrence': 중복 기사도 등장할 때마다 저장/집계하고 명사 추출만 재사용
+    - 'once': 워커는 자기 파일 안의 중복만 빼고, 파일 간 중복은 마스터가 remove_duplicate_records()로 정리
+    """
+    if count_mode not in DEDUP_COUNT_MODES:
+        raise ValueError(f"지원하지 않는 중복 집계 방식입니다: {count_mode} (가능: {', '.join(DEDUP_COUNT_MODES)})")
+    return {"dedup_count_mode": count_mode, "extractor_version": extractor_version}
+
+
+def remove_duplicate_records(collection_name: str) -> Optional[int]:
+    """
+    같은 content_hash를 가진 레코드 중 가장 이른 날짜의 한 건만 남기고 삭제합니다. ('once' 방식)
+    워커는 각자 맡은 연도 파일 안의 중복만 알 수 있으므로, 여러 연도 파일에 걸친 재게시 기사는
+    마스터가 재생성 마무리 단계에서 이 함수로 정리합니다. 삭제한 레코드 수를 반환합니다. (DB 연결 실패 시 None)
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    collection = client[DB_NAME][collection_name]
+    duplicate_groups = collection.aggregate([
+        {"$match": {DB_FIELD_CONTENT_HASH: {"$type": "string"}}},
+        {"$sort": {DB_FIELD_CONTENT_HASH: 1, DB_FIELD_DATE: 1, "_id": 1}},
+        {"$group": {"_id": f"${DB_FIELD_CONTENT_HASH}", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True)
+
+    removed = 0
+    operations = []
+    for group in duplicate_groups:
+        operations.append(DeleteMany({"_id": {"$in": group["ids"][1:]}}))
+        if len(operations) >= DEDUP_LOOKUP_BATCH_SIZE:
+            removed += collection.bulk_write(operations, ordered=False).deleted_count
+            operations = []
+    if operations:
+        removed += collection.bulk_write(operations, ordered=False).deleted_count
+    client.close()
+
+    print(f"✅ 중복 기사 {removed}건 삭제 ({collection_name}, {time.time() - start_time:.4f}초)")
+    return removed
@@ -0,0 +1,94 @@
+# data_processor/exporter.py
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+from pymongo.errors import PyMongoError
+from .db_connector import get_mongodb_client
+from .cache_manager import build_record_query
+from .constants import DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_NOUNS, EXPORT_BATCH_SIZE
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+
+def build_distribution_pipeline(query_conditions: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    조건에 맞는 레코드의 명사를 펼쳐(unwind) 전체 빈도표를 만드는 집계 파이프라인을 생성합니다.
+    (집계는 MongoDB 서버에서 수행되며, 결과는 빈도 내림차순으로 정렬됩니다.)
+    """
+    return [
+        {"$match": build_record_query(query_conditions)},
+        {"$project": {DB_FIELD_NOUNS: 1, "_id": 0}},
+        {"$unwind": f"${DB_FIELD_NOUNS}"},
+        {"$group": {"_id": f"${DB_FIELD_NOUNS}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ]
+
+
+def iter_noun_distribution(query_conditions: Dict[str, Any],
+                           batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple[str, int]]:
+    """
+    조건에 맞는 전체 명사 빈도표를 (word, count) 순서로 하나씩 반환하는 이터레이터를 만듭니다.
+    서버 측 커서를 batch_size 단위로 가져오므로 빈도표 전체나 원본 명사 목록을 메모리에 올리지 않습니다.
+    DB 연결과 집계 커서 생성은 호출 즉시 수행하므로, 실패하면 응답을 스트리밍하기 전에 ConnectionError가 발생합니다.
+    """
+    client = get_mongodb_client()
+    if not client:
+        raise ConnectionError("MongoDB 연결 실패로 빈도표를 내보낼 수 없습니다.")
+
+    try:
+        record_collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+        pipeline = build_distribution_pipeline(query_conditions)
+        print(f"📤 '{RECORD_NOUNS_COLLECTION}' 전체 빈도표 내보내기 시작 (파이프라인: {pipeline[0]})")
+
+        # allowDiskUse: $group/$sort가 서버 메모리 한도를 넘으면 디스크를 사용
+        cursor = record_collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size)
+    except PyMongoError as e:
+        client.close()
+        raise ConnectionError(f"빈도표 집계를 시작하지 못했습니다: {e}") from e
+
+    def iterate() -> Iterator[Tuple[str, int]]:
+        try:
+            with cursor:
+                for doc in cursor:
+                    yield doc["_id"], doc["count"]
+        finally:
+            client.close()
+
+    return iterate()
+
+
+def iter_ndjson_lines(distribution: Iterator[Tuple[str, int]]) -> Iterator[str]:
+    """빈도표를 한 줄에 하나의 JSON 객체(NDJSON)로 직렬화합니다."""
+    for word, count in distribution:
+        yield json.dumps({"word": word, "count": count}, ensure_ascii=False) + "\n"
+
+
+def iter_csv_lines(distribution: Iterator[Tuple[str, int]]) -> Iterator[str]:
+    """빈도표를 헤더(word,count)가 있는 CSV 행으로 직렬화합니다."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush_row(row) -> str:
+        writer.writerow(row)
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return line
+
+    yield flush_row(["word", "count"])
+    for word, count in distribution:
+        yield flush_row([word, count])
+
+
+def iter_export_lines(query_conditions: Dict[str, Any], export_format: str = 'ndjson',
+                      batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """요청된 형식(ndjson/csv)으로 전체 빈도표를 한 줄씩 반환합니다."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {export_format} (가능: {', '.join(EXPORT_FORMATS)})")
+
+    distribution = iter_noun_distribution(query_conditions, batch_size)
+    if export_format == 'csv':
+        return iter_csv_lines(distribution)
+    return iter_ndjson_lines(distribution)
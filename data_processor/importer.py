@@ -1,10 +1,28 @@
 # data_processor/importer.py 또는 data_processor/db_utils.py 파일에 추가
 
 from .db_connector import get_mongodb_client
-from .constants import DB_NAME, RECORD_NOUNS_COLLECTION, TOP_NOUNS_CACHE_COLLECTION
+from .data_version import bump_data_version, STAGING_COLLECTION_PREFIX
+from .constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, TOP_NOUNS_CACHE_COLLECTION, NOUN_SKETCH_COLLECTION, NOUN_PERIOD_COLLECTION,
+    NOUN_PERIOD_SOURCE_COLLECTION, META_COLLECTION, META_DOC_TITLE_INDEX, META_DOC_RANDOM_KEY, DB_FIELD_HEADING_TOKENS,
+    DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_RANDOM_KEY
+)
 import sys
 
 
+def ensure_record_indexes(collection):
+    """
+    ImFiles 조회에 쓰이는 인덱스를 생성합니다. (이미 있으면 아무 일도 하지 않음)
+    - 제목 토큰 + 날짜: Title 검색을 접두어 범위 검색으로 처리하고 날짜 조건과 함께 좁힘
+    - 태그 + 날짜 / 날짜: Title 없이 Tags, Date Range만 있는 조회
+    - 난수 키: 표본 추정 엔진이 rand 범위 검색으로 무작위 표본을 읽음 (sampling.estimate_top_nouns_by_sampling)
+    """
+    collection.create_index([(DB_FIELD_HEADING_TOKENS, 1), (DB_FIELD_DATE, 1)])
+    collection.create_index([(DB_FIELD_TAGS, 1), (DB_FIELD_DATE, 1)])
+    collection.create_index([(DB_FIELD_DATE, 1)])
+    collection.create_index([(DB_FIELD_RANDOM_KEY, 1)])
+
+
 # 🌟 새로운 DB 초기화 함수 🌟
 def reset_all_db():
     client = get_mongodb_client()
@@ -16,7 +34,13 @@ def reset_all_db():
         db = client[DB_NAME]  # 데이터베이스 객체를 가져옴
 
         # 1. 특정 컬렉션만 Drop
-        collections_to_drop = [RECORD_NOUNS_COLLECTION, TOP_NOUNS_CACHE_COLLECTION]
+        collections_to_drop = [RECORD_NOUNS_COLLECTION, TOP_NOUNS_CACHE_COLLECTION, NOUN_SKETCH_COLLECTION,
+                               NOUN_PERIOD_COLLECTION, NOUN_PERIOD_SOURCE_COLLECTION]
+        # (NounHashes 해시 저장소는 원본 데이터가 아닌 추출 결과 캐시이므로 재생성 간 재사용을 위해 남겨 둠)
+
+        # 진행 중이거나 남아 있는 재생성 스테이징 컬렉션도 함께 삭제
+        collections_to_drop += [name for name in db.list_collection_names()
+                                if name.startswith(STAGING_COLLECTION_PREFIX)]
 
         for collection_name in collections_to_drop:
             if collection_name in db.list_collection_names():
@@ -26,6 +50,14 @@ def reset_all_db():
                 # 이미 삭제되었거나 존재하지 않는 경우
                 pass
 
+        # 새로 쌓일 ImFiles는 제목 토큰 백필 전까지 regex 검색을 사용 (title_index.title_search_mode)
+        db[META_COLLECTION].delete_one({"_id": META_DOC_TITLE_INDEX})
+        # 난수 키(rand)도 백필 전까지는 $sample 표본을 사용 (sampling.is_random_key_backfilled)
+        db[META_COLLECTION].delete_one({"_id": META_DOC_RANDOM_KEY})
+
+        # 2. 데이터가 바뀌었으므로 새 세대를 공개하여 캐시와 API 응답의 ETag를 무효화
+        bump_data_version(db)
+
         print(f"✅ 데이터베이스 '{DB_NAME}' 내의 주요 분석 컬렉션을 성공적으로 초기화했습니다.")
         return True
 
@@ -1,17 +1,99 @@
 # data_processor/master_connector.py
 
-from typing import List, Dict, Any
-import requests
+from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
-from .constants import WORKER_ADDRESSES
+from .db_connector import get_mongodb_client
+from .constants import (
+    WORKER_ADDRESSES, DB_NAME, RECORD_NOUNS_COLLECTION, DEDUP_COUNT_MODE, DEDUP_COUNT_ONCE,
+    TRANSPORT_CONTENT_TYPE, GENERATION_SWAP_LEASE_SECONDS
+)
+from .data_version import (
+    allocate_generation, staging_collection_name, get_data_version, publish_derived_version,
+    claim_generation_swap, release_generation_swap
+)
+from .sketches import build_noun_sketches
+from .trends import build_period_counts
+from .title_index import build_title_index, mark_title_index_backfilled
+from .sampling import assign_random_keys, mark_random_key_backfilled
+from .dedup import dedup_rebuild_options, remove_duplicate_records
+from .transport import (
+    iter_frames, counters_from_body, MESSAGE_PROGRESS, MESSAGE_COUNTERS, MESSAGE_RESULT, MESSAGE_NOTIFICATION
+)
 
 WORKER_REBUILD_PATH = "/rebuild"
 TIMEOUT_SECONDS = 3000  # 50분 타임아웃
 
+# 이 상태가 하나라도 있으면 스테이징 데이터가 불완전하므로 교체하지 않음
+# (그 외 상태는 성공: 상태 없이 200/202로 응답한 워커는 SUCCESS, 비동기로 접수한 워커의 'ACCEPTED' 등)
+WORKER_FAILURE_STATUSES = {
+    "FAILURE", "FAILED", "ERROR", "INITIATED", "INVALID_RESPONSE",
+    "CLIENT_ERROR", "REFUSED", "HTTP_ERROR", "TIMEOUT", "CONNECTION_ERROR", "UNKNOWN_ERROR", "THREAD_ERROR"
+}
 
-def call_worker_rebuild(worker_info: Dict[str, Any]) -> Dict[str, Any]:
-    """단일 워커에게 Importer 재생성 명령을 HTTP로 전송하고 결과를 반환합니다."""
+# 재생성 후 파생 컬렉션(스케치, 기간별 빈도) 백그라운드 생성 상태 (실행 중에 다시 요청되면 끝난 뒤 한 번 더 실행)
+_derived_lock = threading.Lock()
+_derived_running = False
+_derived_pending = False
+
+
+def _apply_worker_result(response_data: Dict[str, Any], worker_response: Dict[str, Any]) -> None:
+    """
+    워커의 최종 결과(JSON 본문 또는 RESULT 프레임)를 마스터의 결과 딕셔너리에 반영합니다.
+    상태(status)가 없는 응답은 기존과 같이 SUCCESS로 처리하고, 객체가 아닌 응답만 INVALID_RESPONSE로 처리합니다.
+    """
+    if not isinstance(worker_response, dict):
+        response_data["status"] = "INVALID_RESPONSE"
+        response_data["message"] = "워커 응답이 JSON 객체가 아닙니다."
+        return
+    response_data["status"] = worker_response.get("status") or "SUCCESS"
+    response_data["message"] = worker_response.get("message", "")
+    response_data["processing_time"] = worker_response.get("processing_time", 0.0)
+    response_data["records_inserted"] = worker_response.get("records_inserted", 0)
+
+
+def _read_worker_frames(response, response_data: Dict[str, Any]) -> None:
+    """
+    워커가 바이너리 프레임 스트림으로 응답한 경우, 진행 상황은 도착하는 대로 출력하고
+    최종 결과(RESULT)는 상태 필드에 반영합니다. 빈도 묶음(COUNTERS)은 명사별로 합치지 않고(메모리가 명사 종류 수에
+    비례해 커지지 않도록) 묶음 항목 수와 총 빈도의 누계만 response_data에 남깁니다.
+    """
+    worker_name = response_data["worker"]
+    counted_entries = 0
+    counted_total = 0
+    received_counters = False
+    received_result = False
+
+    for frame in iter_frames(response.iter_content(chunk_size=64 * 1024)):
+        if frame.message_type == MESSAGE_PROGRESS:
+            print(f"⏳ {worker_name}: {frame.body.get('processed', 0)}/{frame.body.get('total', '?')} "
+                  f"{frame.body.get('stage', '')}")
+        elif frame.message_type == MESSAGE_COUNTERS:
+            counts = counters_from_body(frame.body)
+            counted_entries += len(counts)
+            counted_total += sum(counts.values())
+            received_counters = True
+        elif frame.message_type in (MESSAGE_RESULT, MESSAGE_NOTIFICATION):
+            _apply_worker_result(response_data, frame.body)
+            received_result = True
+
+    if received_counters:
+        # 여러 묶음에 같은 명사가 나올 수 있으므로 counted_entries는 명사 종류 수가 아니라 (명사, 빈도) 항목 수
+        response_data["counted_entries"] = counted_entries
+        response_data["counted_total"] = counted_total
+    if not received_result:
+        response_data["status"] = "HTTP_ERROR"
+        response_data["message"] = "워커 프레임 스트림에 최종 결과(RESULT)가 없습니다."
+
+
+def call_worker_rebuild(worker_info: Dict[str, Any], rebuild_request: Optional[Dict[str, Any]] = None) -> Dict[
+    str, Any]:
+    """
+    단일 워커에게 Importer 재생성 명령을 HTTP로 전송하고 결과를 반환합니다.
+    rebuild_request(JSON 본문)의 'target_collection'은 워커가 레코드를 써야 할 스테이징 컬렉션입니다.
+    워커는 JSON 또는 바이너리 프레임 스트림(data_processor.transport)으로 응답할 수 있으며, Content-Type으로 구분합니다.
+    """
 
     worker_host = worker_info['host']
     worker_port = worker_info['port']
@@ -31,30 +113,31 @@ def call_worker_rebuild(worker_info: Dict[str, Any]) -> Dict[str, Any]:
 
     print(f"📤 {worker_name}: {url}로 명령 전송 시작...")
 
+    # requests(urllib3 등)는 재생성 명령을 보낼 때만 필요하므로 지연 임포트
+    import requests
+
     try:
         # 워커 서버에 POST 요청
         # 워커 서버의 `/rebuild/` 엔드포인트는 해당 워커의 importer.py 로직을 실행하도록 구현되어야 합니다.
-        response = requests.post(url, timeout=TIMEOUT_SECONDS)
-        comm_end_time = time.time()
-
-        response_data["communication_time"] = comm_end_time - start_time
-
-        if response.status_code == 200 or response.status_code == 202:
-            worker_response = response.json()
-            response_data["status"] = worker_response.get("status", "SUCCESS")
-            response_data["message"] = worker_response.get("message", "워커 처리 성공")
-            response_data["processing_time"] = worker_response.get("processing_time", 0.0)
-            response_data["records_inserted"] = worker_response.get("records_inserted", 0)
-
-        elif response.status_code == 400:
-            response_data["status"] = "CLIENT_ERROR"
-            response_data["message"] = f"워커 요청 오류: {response.text}"
-        elif response.status_code == 403:
-            response_data["status"] = "REFUSED"
-            response_data["message"] = "워커 연결 거부 (CORS/인증 오류)"
-        else:
-            response_data["status"] = "HTTP_ERROR"
-            response_data["message"] = f"워커 HTTP 오류: Status {response.status_code}, {response.text}"
+        # 프레임 스트림을 지원하는 워커는 진행 상황과 부분 빈도를 처리 중에 바로 보낼 수 있음
+        # stream=True 응답은 with 블록으로 감싸 본문을 다 읽지 못한 경우에도 연결을 반납
+        with requests.post(url, json=rebuild_request or {}, timeout=TIMEOUT_SECONDS, stream=True,
+                           headers={"Accept": f"{TRANSPORT_CONTENT_TYPE}, application/json"}) as response:
+            if response.status_code == 200 or response.status_code == 202:
+                if response.headers.get("Content-Type", "").startswith(TRANSPORT_CONTENT_TYPE):
+                    _read_worker_frames(response, response_data)
+                else:
+                    _apply_worker_result(response_data, response.json())
+
+            elif response.status_code == 400:
+                response_data["status"] = "CLIENT_ERROR"
+                response_data["message"] = f"워커 요청 오류: {response.text}"
+            elif response.status_code == 403:
+                response_data["status"] = "REFUSED"
+                response_data["message"] = "워커 연결 거부 (CORS/인증 오류)"
+            else:
+                response_data["status"] = "HTTP_ERROR"
+                response_data["message"] = f"워커 HTTP 오류: Status {response.status_code}, {response.text}"
 
     except requests.exceptions.Timeout:
         response_data["status"] = "TIMEOUT"
@@ -66,21 +149,198 @@ def call_worker_rebuild(worker_info: Dict[str, Any]) -> Dict[str, Any]:
         response_data["status"] = "UNKNOWN_ERROR"
         response_data["message"] = f"알 수 없는 오류: {e}"
 
+    # 스트리밍 응답은 본문을 모두 읽은 시점까지가 통신 시간
+    response_data["communication_time"] = time.time() - start_time
     print(f"📥 {worker_name}: {response_data['status']} 수신. (Comm Time: {response_data['communication_time']:.4f}초)")
     return response_data
 
 
+def build_derived_collections() -> None:
+    """
+    현재 ImFiles로 근사 엔진용 스케치와 추세 API용 기간별 빈도를 다시 만들고,
+    둘 다 성공하면 어떤 세대로 만들었는지 기록합니다. (data_version.derived_collections_current)
+    """
+    client = get_mongodb_client()
+    if not client: return
+    generation = get_data_version(client[DB_NAME])
+    client.close()
+
+    succeeded = True
+    try:
+        build_noun_sketches()
+    except Exception as e:
+        succeeded = False
+        print(f"❌ 명사 스케치 생성 중 오류 발생 (근사 엔진은 이전 스케치를 사용): {e}")
+    try:
+        build_period_counts()
+    except Exception as e:
+        succeeded = False
+        print(f"❌ 기간별 명사 빈도 생성 중 오류 발생 (추세 API는 이전 집계를 사용): {e}")
+
+    if succeeded and generation is not None:
+        client = get_mongodb_client()
+        if not client: return
+        publish_derived_version(generation, client[DB_NAME])
+        client.close()
+
+
+def start_derived_collection_build() -> None:
+    """
+    build_derived_collections를 백그라운드로 실행합니다. (재생성 완료 응답을 늦추지 않도록)
+    생성이 끝날 때까지 근사 엔진과 추세 API는 이전 컬렉션으로 응답하며, 그 응답에는 ETag를 붙이지 않습니다.
+    """
+    global _derived_running, _derived_pending
+    with _derived_lock:
+        if _derived_running:
+            _derived_pending = True
+            return
+        _derived_running = True
+
+    def run():
+        global _derived_running, _derived_pending
+        while True:
+            try:
+                build_derived_collections()
+            except Exception as e:
+                print(f"❌ 파생 컬렉션 생성 중 오류 발생: {e}")
+            with _derived_lock:
+                if not _derived_pending:
+                    _derived_running = False
+                    return
+                _derived_pending = False
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _claim_swap(generation: int, db) -> bool:
+    """ImFiles 교체 권한을 얻을 때까지 기다립니다. 더 새로운 세대가 이미 공개되었으면 False를 반환합니다."""
+    deadline = time.monotonic() + GENERATION_SWAP_LEASE_SECONDS
+    while True:
+        claimed = claim_generation_swap(generation, db)
+        if claimed is not None:
+            return claimed
+        if time.monotonic() > deadline:
+            return False
+        print(f"⏳ 다른 재생성이 ImFiles를 교체하는 중입니다. 세대 {generation} 교체를 기다립니다...")
+        time.sleep(1)
+
+
+def finalize_staged_rebuild(generation: int) -> Optional[int]:
+    """
+    워커들이 채운 스테이징 컬렉션을 정리(중복 기사, 제목 토큰 인덱스)한 뒤,
+    ImFiles로 원자적으로 교체(renameCollection)하고 새 세대를 공개합니다.
+    교체 전까지 조회는 이전 ImFiles를 그대로 사용하므로 재생성 중에도 부분 데이터가 보이지 않습니다.
+
+    교체는 세대 번호에 대한 compare-and-set(claim_generation_swap)으로 보호되어, 더 새로운 세대가 이미
+    공개되었으면 이 스테이징 데이터는 버리고, 동시에 끝난 재생성끼리는 하나씩 교체합니다.
+    스케치와 기간별 빈도는 ImFiles 교체와 공개가 끝난 뒤 백그라운드에서 새 ImFiles로 만듭니다.
+    """
+    client = get_mongodb_client()
+    if not client: return None
+    db = client[DB_NAME]
+    staging_name = staging_collection_name(generation)
+
+    try:
+        staged_records = _staged_record_count(db, staging_name)
+        if staged_records == 0:
+            # 스테이징을 지원하지 않는 워커는 ImFiles에 직접 기록하므로, ImFiles 기준으로 후처리만 수행
+            print(f"⚠️ 스테이징 컬렉션 '{staging_name}'이 비어 있습니다. ImFiles에 직접 기록된 것으로 보고 후처리합니다.")
+            staging_name = RECORD_NOUNS_COLLECTION
+
+        # 1. 교체 전에 중복 기사 정리('once' 방식), 제목 토큰 인덱스와 표본용 난수 키를 준비 (실패해도 데이터 교체는 진행)
+        if DEDUP_COUNT_MODE == DEDUP_COUNT_ONCE:
+            try:
+                remove_duplicate_records(staging_name)
+            except Exception as e:
+                print(f"❌ 중복 기사 정리 중 오류 발생: {e}")
+        title_index_ready = False
+        try:
+            title_index_ready = build_title_index(staging_name) is not None
+        except Exception as e:
+            print(f"❌ 제목 토큰 인덱스 생성 중 오류 발생: {e}")
+        random_key_ready = False
+        try:
+            random_key_ready = assign_random_keys(staging_name) is not None
+        except Exception as e:
+            print(f"❌ 표본용 난수 키 생성 중 오류 발생: {e}")
+
+        # 2. 세대 compare-and-set: 더 새로운 세대가 이미 공개되었으면 교체하지 않음
+        if not _claim_swap(generation, db):
+            print(f"⚠️ 세대 {generation}보다 새로운 데이터가 이미 공개되어 스테이징 데이터를 폐기합니다.")
+            if staging_name != RECORD_NOUNS_COLLECTION:
+                db[staging_name].drop()
+            return get_data_version(db)
+
+        # 3. 스테이징 컬렉션을 ImFiles로 원자적 교체한 뒤 같은 갱신에서 새 세대를 공개
+        #    (이전 세대로 계산된 캐시는 더 이상 사용되지 않음)
+        published = None
+        try:
+            if staging_name != RECORD_NOUNS_COLLECTION:
+                db[staging_name].rename(RECORD_NOUNS_COLLECTION, dropTarget=True)
+                # 교체된 ImFiles는 모든 문서에 heading_tokens가 있으므로 Title 검색을 'token' 모드로 전환
+                mark_title_index_backfilled(db, title_index_ready)
+                mark_random_key_backfilled(db, random_key_ready)
+                print(f"✅ '{staging_name}' ({staged_records}건) -> '{RECORD_NOUNS_COLLECTION}' 교체 완료")
+            published = release_generation_swap(generation, db)
+        finally:
+            if published is None:
+                release_generation_swap(generation, db, publish=False)
+    finally:
+        client.close()
+
+    # 4. 스케치와 기간별 빈도는 원본 전체를 집계하므로 완료 응답 이후 백그라운드에서 생성
+    start_derived_collection_build()
+    return published
+
+
+def _staged_record_count(db, staging_name: str) -> int:
+    return db[staging_name].estimated_document_count() if staging_name in db.list_collection_names() else 0
+
+
+def staging_has_records(generation: int) -> Optional[bool]:
+    """
+    워커들이 스테이징 컬렉션에 기록했는지 확인합니다. (DB 연결 실패 시 None)
+    비어 있으면 스테이징을 지원하지 않는 워커들이 ImFiles에 직접 기록한 것입니다.
+    """
+    client = get_mongodb_client()
+    if not client: return None
+    has_records = _staged_record_count(client[DB_NAME], staging_collection_name(generation)) > 0
+    client.close()
+    return has_records
+
+
+def discard_staging_collection(generation: int) -> None:
+    """실패한 재생성의 스테이징 컬렉션을 삭제합니다."""
+    client = get_mongodb_client()
+    if not client: return
+    client[DB_NAME][staging_collection_name(generation)].drop()
+    client.close()
+
+
 def distribute_importer_rebuild() -> Dict[str, Any]:
     """
     모든 워커들에게 병렬로 데이터 재생성 명령을 전송하고 결과를 종합합니다.
+    워커들은 새 세대의 스테이징 컬렉션에 기록하며, 모두 끝나면 ImFiles로 교체됩니다.
     """
     start_master_time = time.time()
     results: List[Dict[str, Any]] = []
+    # 워커의 명사 추출 단계 중복 처리 설정 (잘못된 설정이면 세대를 할당하기 전에 ValueError)
+    dedup_options = dedup_rebuild_options()
+
+    generation = allocate_generation()
+    if generation is None:
+        raise ConnectionError("MongoDB 연결 실패로 새 데이터 세대를 할당할 수 없습니다.")
+    rebuild_request = {
+        "target_collection": staging_collection_name(generation),
+        "generation": generation,
+        **dedup_options,
+    }
+    print(f"🧱 새 데이터 세대 {generation}: 스테이징 컬렉션 '{rebuild_request['target_collection']}'")
 
     # ThreadPoolExecutor를 사용하여 워커에게 비동기 병렬 요청
     with ThreadPoolExecutor(max_workers=len(WORKER_ADDRESSES)) as executor:
         future_to_worker = {
-            executor.submit(call_worker_rebuild, worker_info): worker_info['name']
+            executor.submit(call_worker_rebuild, worker_info, rebuild_request): worker_info['name']
             for worker_info in WORKER_ADDRESSES
         }
 
@@ -102,7 +362,23 @@ def distribute_importer_rebuild() -> Dict[str, Any]:
     end_master_time = time.time()
     master_total_time = end_master_time - start_master_time
 
+    failed_workers = [r["worker"] for r in results if r.get("status") in WORKER_FAILURE_STATUSES]
+    if failed_workers and staging_has_records(generation) is False:
+        # ImFiles에 직접 기록하는 워커는 실패해도 이미 데이터를 바꿨으므로, 후처리(제목 토큰 등)와 새 세대 공개로
+        # 이전 데이터로 계산된 캐시와 ETag를 무효화
+        print(f"⚠️ 워커 실패 ({', '.join(failed_workers)}): ImFiles가 직접 갱신되었으므로 새 세대를 공개합니다.")
+        data_version = finalize_staged_rebuild(generation)
+    elif failed_workers:
+        # 일부 워커 실패: 불완전한 스테이징 데이터는 버리고 기존 ImFiles/캐시를 계속 사용
+        print(f"❌ 워커 실패 ({', '.join(failed_workers)}): 스테이징 데이터를 폐기하고 기존 데이터를 유지합니다.")
+        discard_staging_collection(generation)
+        data_version = get_data_version()
+    else:
+        # 스테이징 컬렉션을 ImFiles로 교체하고 새 세대를 공개하여 캐시와 API 응답의 ETag를 무효화
+        data_version = finalize_staged_rebuild(generation)
+
     return {
         "master_total_time": master_total_time,
+        "data_version": data_version,
         "results": results
     }
\ No newline at end of file
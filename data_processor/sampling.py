@@ -0,0 +1,244 @@
+# data_processor/sampling.py
+
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional
+from pymongo.errors import ExecutionTimeout
+from .db_connector import get_mongodb_client
+from .importer import ensure_record_indexes
+from .data_version import get_meta_flag, set_meta_flag
+from .constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_NOUNS, DB_FIELD_RANDOM_KEY, META_DOC_RANDOM_KEY, META_FIELD_BACKFILLED,
+    SAMPLE_INITIAL_SIZE, SAMPLE_MAX_SIZE, SAMPLE_CONFIDENCE_TARGET, SAMPLE_SCAN_MAX_TIME_MS
+)
+
+
+def _normal_cdf(z: float) -> float:
+    return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+def rank_order_confidence(ranked_counts: List[int]) -> float:
+    """
+    표본 빈도로 정한 인접 순위 쌍 (i, i+1)의 순서가 모집단에서도 같을 확률의 평균입니다.
+    (표본 빈도를 포아송 분포로 근사: z = (c_i - c_{i+1}) / sqrt(c_i + c_{i+1}))
+    ranked_counts에는 상위 N개 다음 단어(N+1번째)까지 넣어 경계의 확실성도 반영합니다.
+    """
+    if len(ranked_counts) < 2:
+        return 1.0
+    probabilities = []
+    for higher, lower in zip(ranked_counts, ranked_counts[1:]):
+        if higher + lower == 0:
+            probabilities.append(0.5)
+        else:
+            probabilities.append(_normal_cdf((higher - lower) / math.sqrt(higher + lower)))
+    return sum(probabilities) / len(probabilities)
+
+
+def rank_stability(previous: List[str], current: List[str]) -> float:
+    """직전 표본과 현재 표본의 상위 N개 중 같은 순위에 있는 단어의 비율입니다."""
+    if not current:
+        return 1.0
+    same_rank = sum(1 for prev_word, word in zip(previous, current) if prev_word == word)
+    return same_rank / len(current)
+
+
+def is_random_key_backfilled() -> bool:
+    """ImFiles 전체에 난수 키(rand)가 채워졌다고 기록되어 있는지 확인합니다. (DB 연결 실패 시 False)"""
+    return get_meta_flag(META_DOC_RANDOM_KEY, META_FIELD_BACKFILLED)
+
+
+def mark_random_key_backfilled(db, backfilled: bool = True) -> None:
+    """ImFiles의 난수 키(rand) 백필 완료 여부를 MetaDatas에 기록합니다."""
+    set_meta_flag(db, META_DOC_RANDOM_KEY, META_FIELD_BACKFILLED, backfilled)
+
+
+def assign_random_keys(collection_name: str = RECORD_NOUNS_COLLECTION) -> Optional[int]:
+    """
+    난수 키(rand)가 없는 문서에 [0, 1) 균등 난수를 서버에서 채우고($rand) 인덱스를 생성합니다.
+    갱신한 문서 수를 반환합니다. ImFiles를 백필하면 완료를 기록하여 표본 추정이 rand 범위 검색으로 전환됩니다.
+    (스테이징 컬렉션은 ImFiles로 교체된 뒤 master_connector.finalize_staged_rebuild가 기록)
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    db = client[DB_NAME]
+    collection = db[collection_name]
+    result = collection.update_many(
+        {DB_FIELD_RANDOM_KEY: {"$exists": False}},
+        [{"$set": {DB_FIELD_RANDOM_KEY: {"$rand": {}}}}]
+    )
+    ensure_record_indexes(collection)
+    if collection_name == RECORD_NOUNS_COLLECTION:
+        mark_random_key_backfilled(db)
+    client.close()
+
+    print(f"✅ '{collection_name}' 난수 키 갱신 완료: 문서 {result.modified_count}개 ({time.time() - start_time:.4f}초)")
+    return result.modified_count
+
+
+class _RandomKeyScan:
+    """
+    rand 인덱스를 임의의 시작점 r0부터 오름차순으로 읽고, 끝에 닿으면 [0, r0) 구간을 이어 읽습니다.
+    rand는 내용과 무관한 균등 난수이므로 읽은 순서의 앞부분은 모두 조건에 맞는 레코드의 균등 무작위 표본이며,
+    읽은 레코드 수를 지나온 rand 구간 너비(covered)로 나누면 조건에 맞는 전체 레코드 수를 추정할 수 있습니다.
+    """
+
+    def __init__(self, collection, record_query: Dict[str, Any], limit: int):
+        self.collection = collection
+        self.record_query = record_query
+        self.limit = limit
+        self.start = random.random()
+        self.covered = 0.0
+        self.timed_out = False
+
+    def _segment(self, key_range: Dict[str, Any], limit: int):
+        return self.collection.find(
+            {**self.record_query, DB_FIELD_RANDOM_KEY: key_range},
+            {DB_FIELD_NOUNS: 1, DB_FIELD_RANDOM_KEY: 1, "_id": 0},
+            batch_size=min(limit, SAMPLE_INITIAL_SIZE),
+        ).sort(DB_FIELD_RANDOM_KEY, 1).limit(limit).max_time_ms(SAMPLE_SCAN_MAX_TIME_MS)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        read = 0
+        # (구간 시작, 구간 끝, 앞 구간까지 덮은 너비): [r0, 1)을 읽은 뒤 [0, r0)을 이어 읽음
+        segments = ((self.start, 1.0, 0.0), (0.0, self.start, 1.0 - self.start))
+        for low, high, covered_before in segments:
+            try:
+                with self._segment({"$gte": low, "$lt": high}, self.limit - read) as cursor:
+                    for record in cursor:
+                        read += 1
+                        self.covered = covered_before + record.get(DB_FIELD_RANDOM_KEY, low) - low
+                        yield record
+            except ExecutionTimeout:
+                # 조건에 맞는 레코드가 드물면 인덱스를 오래 훑게 되므로, 시간 상한까지 읽은 표본으로 추정
+                self.timed_out = True
+                print(f"⏱️ 표본 검색이 {SAMPLE_SCAN_MAX_TIME_MS}ms 상한에 도달하여 표본 {read}개로 추정합니다.")
+                return
+            if read >= self.limit:
+                return
+            # 이 구간을 끝까지 읽었으므로 구간 전체를 덮은 것으로 처리
+            self.covered = covered_before + high - low
+
+
+def _bounded_total(collection, record_query: Dict[str, Any], lower_bound: int) -> int:
+    """
+    rand 백필 전 $sample 표본의 환산에 쓰는 전체 레코드 수입니다.
+    조건이 없으면 메타데이터 추정치를, 있으면 SAMPLE_SCAN_MAX_TIME_MS 안에서만 센 값을 사용합니다.
+    (시간 상한을 넘으면 이미 확인한 하한 lower_bound를 사용)
+    """
+    if not record_query:
+        return max(lower_bound, collection.estimated_document_count())
+    try:
+        return collection.count_documents(record_query, maxTimeMS=SAMPLE_SCAN_MAX_TIME_MS)
+    except ExecutionTimeout:
+        print(f"⏱️ 전체 레코드 수 확인이 {SAMPLE_SCAN_MAX_TIME_MS}ms 상한에 도달하여 하한({lower_bound})으로 환산합니다.")
+        return lower_bound
+
+
+def estimate_top_nouns_by_sampling(record_query: Dict[str, Any], top_n: int,
+                                   confidence_target: float = SAMPLE_CONFIDENCE_TARGET,
+                                   initial_size: int = SAMPLE_INITIAL_SIZE,
+                                   max_size: int = SAMPLE_MAX_SIZE) -> Optional[Dict[str, Any]]:
+    """
+    조건에 맞는 ImFiles 레코드의 균등 무작위 표본으로 상위 N개를 추정합니다.
+    표본은 인덱스된 난수 키(rand)를 임의의 시작점부터 범위 검색하여 읽으므로(_RandomKeyScan) 전체를 정렬하지 않으며,
+    도착 순서의 앞부분(prefix)을 initial_size부터 두 배씩 늘려가며 평가합니다. (앞부분도 균등 무작위 표본)
+    순위 신뢰도와 직전 평가 대비 순위 안정성이 모두 목표치에 도달하면 커서를 닫고 멈춥니다.
+    (첫 평가의 안정성은 initial_size의 절반 크기 앞부분과 비교합니다.)
+
+    전체 레코드 수는 max_size + 1에서 멈추는 count로만 확인하며, 그보다 많으면 읽은 rand 구간 너비로 추정합니다.
+    rand 백필 전에는 명사만 남긴 뒤 $sample을 사용합니다. count는 전체 레코드 수 기준으로 환산한 추정치입니다.
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    record_collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+    capped_total = record_collection.count_documents(record_query, limit=max_size + 1)
+
+    if capped_total == 0:
+        client.close()
+        return {"total_records": 0, "top_words": [], "sample_size": 0, "confidence": 1.0, "rank_stability": 1.0}
+
+    scan = None
+    exhaustive = capped_total <= max_size
+    target_size = capped_total if exhaustive else max_size
+    if exhaustive:
+        # 전체가 표본 상한 이하이면 모두 읽으므로 정확한 결과와 같음 (중간 평가 없음)
+        records = record_collection.find(record_query, {DB_FIELD_NOUNS: 1, "_id": 0}, batch_size=initial_size)
+        checkpoint = target_size
+    elif is_random_key_backfilled():
+        scan = _RandomKeyScan(record_collection, record_query, target_size)
+        records = iter(scan)
+        checkpoint = max(1, min(initial_size, target_size) // 2)  # 안정성 비교 기준이 되는 첫 앞부분
+    else:
+        pipeline = [
+            {"$match": record_query},
+            {"$project": {DB_FIELD_NOUNS: 1, "_id": 0}},
+            {"$sample": {"size": target_size}},
+        ]
+        records = record_collection.aggregate(pipeline, allowDiskUse=True, batchSize=min(initial_size, target_size),
+                                              maxTimeMS=SAMPLE_SCAN_MAX_TIME_MS)
+        checkpoint = max(1, min(initial_size, target_size) // 2)
+
+    noun_counts = Counter()
+    sampled_records = 0
+    previous_ranking: Optional[List[str]] = None
+    ranked: List = []
+    confidence, stability = 0.0, 0.0
+
+    try:
+        for record in records:
+            noun_counts.update(record.get(DB_FIELD_NOUNS, []))
+            sampled_records += 1
+            if sampled_records < checkpoint and sampled_records < target_size:
+                continue
+
+            ranked = noun_counts.most_common(top_n + 1)
+            ranking = [word for word, _ in ranked[:top_n]]
+            checkpoint = min(checkpoint * 2, target_size)
+            if previous_ranking is None and sampled_records < target_size:
+                previous_ranking = ranking
+                continue
+
+            confidence = rank_order_confidence([count for _, count in ranked])
+            stability = rank_stability(previous_ranking or [], ranking)
+            previous_ranking = ranking
+            print(f"🎲 표본 {sampled_records}/{target_size}개: 순위 신뢰도 {confidence:.3f}, 순위 안정성 {stability:.3f}")
+            if confidence >= confidence_target and stability >= confidence_target:
+                break
+        else:
+            # 표본이 요청한 크기보다 적게 도착한 경우 마지막 앞부분까지 반영
+            ranked = noun_counts.most_common(top_n + 1)
+            confidence = rank_order_confidence([count for _, count in ranked])
+    except ExecutionTimeout:
+        print(f"⏱️ $sample 표본이 {SAMPLE_SCAN_MAX_TIME_MS}ms 상한에 도달하여 표본 {sampled_records}개로 추정합니다.")
+        ranked = noun_counts.most_common(top_n + 1)
+        confidence = rank_order_confidence([count for _, count in ranked])
+    finally:
+        if hasattr(records, 'close'):
+            records.close()
+
+    # 전체 레코드 수: 모두 읽었으면 정확, rand 범위 검색이면 읽은 구간 너비로 환산, $sample이면 시간 제한 count
+    if exhaustive:
+        total_records = capped_total
+        confidence, stability = 1.0, 1.0
+    elif scan is not None:
+        total_records = max(capped_total, round(sampled_records / scan.covered)) if scan.covered > 0 else capped_total
+    else:
+        total_records = _bounded_total(record_collection, record_query, capped_total)
+    client.close()
+    scale = total_records / sampled_records if sampled_records else 0.0
+    print(f"🎲 표본 추정 완료 ({time.time() - start_time:.4f}초, 표본 {sampled_records}개, 추정 전체 {total_records}개)")
+
+    return {
+        "total_records": total_records,
+        "top_words": [{"word": word, "count": round(count * scale), "sample_count": count}
+                      for word, count in ranked[:top_n]],
+        "sample_size": sampled_records,
+        "confidence": round(confidence, 4),
+        "rank_stability": round(stability, 4),
+    }
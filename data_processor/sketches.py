@@ -0,0 +1,357 @@
+# data_processor/sketches.py
+
+import calendar
+import heapq
+import time
+from datetime import datetime, date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .db_connector import get_mongodb_client
+from .constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, NOUN_SKETCH_COLLECTION, SKETCH_CAPACITY,
+    DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_NOUNS,
+    SKETCH_FIELD_BUCKET, SKETCH_FIELD_GRANULARITY, SKETCH_FIELD_TAG, SKETCH_FIELD_COUNTERS,
+    SKETCH_FIELD_OMITTED_MAX, SKETCH_FIELD_TOTAL, SKETCH_FIELD_RECORDS
+)
+
+# 태그와 무관한 (전체 기사) 스케치를 나타내는 태그 값
+ALL_TAGS_KEY = ""
+GRANULARITY_DAY = 'day'
+GRANULARITY_MONTH = 'month'
+
+
+class HeavyHitterSketch:
+    """
+    병합 가능한 Space-Saving 계열 요약(summary)입니다.
+
+    목록에 있는 단어 w에 대해 lower[w] <= 실제 빈도 <= upper[w] 가 항상 성립하고,
+    목록에 없는 단어의 실제 빈도는 omitted_max 이하임이 보장됩니다.
+    여러 스케치를 합치면 각 구간의 보장이 그대로 더해지므로 오차 한계가 유지됩니다.
+    """
+
+    def __init__(self, capacity: int = SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.upper: Dict[str, int] = {}
+        self.lower: Dict[str, int] = {}
+        self.omitted_max = 0
+        self.total = 0
+        self.records = 0
+
+    @classmethod
+    def from_exact_counts(cls, sorted_counts: Iterable[Tuple[str, int]], total: int, records: int = 0,
+                          capacity: int = SKETCH_CAPACITY) -> 'HeavyHitterSketch':
+        """빈도 내림차순으로 정렬된 정확한 (word, count) 목록에서 상위 capacity개만 남긴 스케치를 만듭니다."""
+        sketch = cls(capacity)
+        for word, count in sorted_counts:
+            if len(sketch.upper) < capacity:
+                sketch.upper[word] = sketch.lower[word] = count
+            else:
+                # 잘려나간 단어 중 가장 큰 빈도가 곧 목록 밖 단어의 상한
+                sketch.omitted_max = count
+                break
+        sketch.total = total
+        sketch.records = records
+        return sketch
+
+    @classmethod
+    def merge_all(cls, sketches: Iterable['HeavyHitterSketch'],
+                  capacity: int = SKETCH_CAPACITY) -> 'HeavyHitterSketch':
+        """
+        여러 스케치를 한 번에 병합합니다. (항목 수에 선형)
+        스케치 i에 없는 단어는 그 스케치의 omitted_max 만큼 상한이 늘어나고 하한은 늘지 않습니다.
+        """
+        merged = cls(capacity)
+        upper_delta: Dict[str, int] = {}
+
+        for sketch in sketches:
+            merged.omitted_max += sketch.omitted_max
+            merged.total += sketch.total
+            merged.records += sketch.records
+            for word, upper in sketch.upper.items():
+                upper_delta[word] = upper_delta.get(word, 0) + (upper - sketch.omitted_max)
+                merged.lower[word] = merged.lower.get(word, 0) + sketch.lower[word]
+
+        for word, delta in upper_delta.items():
+            merged.upper[word] = merged.omitted_max + delta
+
+        merged.truncate(capacity)
+        return merged
+
+    def truncate(self, capacity: int) -> None:
+        """상한 기준 상위 capacity개만 남기고, 버려진 단어의 상한을 omitted_max에 반영합니다."""
+        if len(self.upper) <= capacity:
+            return
+        kept = heapq.nlargest(capacity + 1, self.upper.items(), key=lambda item: item[1])
+        self.omitted_max = max(self.omitted_max, kept[-1][1])
+        kept_words = {word for word, _ in kept[:capacity]}
+        self.upper = {word: self.upper[word] for word in kept_words}
+        self.lower = {word: self.lower[word] for word in kept_words}
+
+    def top(self, top_n: int) -> List[Dict[str, Any]]:
+        """상한(추정 빈도) 기준 상위 top_n개를 오차(error = upper - lower)와 함께 반환합니다."""
+        ranked = heapq.nlargest(top_n, self.upper.items(), key=lambda item: (item[1], self.lower[item[0]]))
+        return [{"word": word, "count": upper, "error": upper - self.lower[word]} for word, upper in ranked]
+
+    def is_top_guaranteed(self, top_n: int) -> bool:
+        """top_n번째 단어의 하한이 나머지 모든 단어의 상한 이상이면 상위 집합이 정확함이 보장됩니다."""
+        ranked = heapq.nlargest(top_n + 1, self.upper.items(), key=lambda item: item[1])
+        if len(ranked) <= top_n:
+            return True
+        min_lower = min(self.lower[word] for word, _ in ranked[:top_n])
+        return min_lower >= max(ranked[top_n][1], self.omitted_max)
+
+    def to_document(self) -> Dict[str, Any]:
+        counters = sorted(self.upper.items(), key=lambda item: -item[1])
+        return {
+            SKETCH_FIELD_COUNTERS: [[word, upper, self.lower[word]] for word, upper in counters],
+            SKETCH_FIELD_OMITTED_MAX: self.omitted_max,
+            SKETCH_FIELD_TOTAL: self.total,
+            SKETCH_FIELD_RECORDS: self.records,
+        }
+
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any], capacity: int = SKETCH_CAPACITY) -> 'HeavyHitterSketch':
+        sketch = cls(capacity)
+        for word, upper, lower in doc.get(SKETCH_FIELD_COUNTERS, []):
+            sketch.upper[word] = upper
+            sketch.lower[word] = lower
+        sketch.omitted_max = doc.get(SKETCH_FIELD_OMITTED_MAX, 0)
+        sketch.total = doc.get(SKETCH_FIELD_TOTAL, 0)
+        sketch.records = doc.get(SKETCH_FIELD_RECORDS, 0)
+        return sketch
+
+
+# ----------------------------------------------------------------------
+# 스케치 생성 (분산 재생성 완료 후 / build_sketches 커맨드)
+# ----------------------------------------------------------------------
+
+def record_day_expression() -> Dict[str, Any]:
+    """레코드의 Date 필드에서 'YYYY-MM-DD' 일 문자열을 뽑는 집계 식입니다. (문자열/날짜 타입 모두 지원)"""
+    return {"$substrCP": [{"$toString": f"${DB_FIELD_DATE}"}, 0, 10]}
+
+
+def record_tags_expression() -> Dict[str, Any]:
+    """레코드의 태그 목록에 전체 태그 키("")를 더한 집합을 만드는 집계 식입니다. (Tags가 문자열이어도 지원)"""
+    tags_array = {"$cond": [
+        {"$isArray": f"${DB_FIELD_TAGS}"}, f"${DB_FIELD_TAGS}",
+        {"$cond": [{"$eq": [{"$type": f"${DB_FIELD_TAGS}"}, "string"]}, [f"${DB_FIELD_TAGS}"], []]}
+    ]}
+    return {"$setUnion": [[ALL_TAGS_KEY], tags_array]}
+
+
+def _bucket_and_tag_stages() -> List[Dict[str, Any]]:
+    """각 레코드를 (일/월 버킷) x (전체 + 개별 태그) 조합으로 펼치는 공통 집계 단계입니다."""
+    date_string = record_day_expression()
+    return [
+        {"$match": {DB_FIELD_DATE: {"$exists": True, "$ne": None}}},
+        {"$project": {
+            "_id": 0,
+            DB_FIELD_NOUNS: 1,
+            "bucket": [
+                {"g": GRANULARITY_DAY, "b": date_string},
+                {"g": GRANULARITY_MONTH, "b": {"$substrCP": [date_string, 0, 7]}},
+            ],
+            "tag": record_tags_expression(),
+        }},
+        {"$unwind": "$bucket"},
+        {"$unwind": "$tag"},
+    ]
+
+
+def build_noun_sketches(source_collection: str = RECORD_NOUNS_COLLECTION,
+                        target_collection: str = NOUN_SKETCH_COLLECTION,
+                        capacity: int = SKETCH_CAPACITY) -> Optional[int]:
+    """
+    ImFiles 전체에서 (일/월, 태그)별 정확한 명사 빈도를 MongoDB에서 집계하여
+    상위 capacity개만 남긴 스케치를 만들고, 임시 컬렉션에 저장한 뒤 target_collection으로 교체합니다.
+    생성된 스케치 문서 수를 반환합니다. (DB 연결 실패 시 None)
+
+    비용: 원본 컬렉션 전체를 두 번 집계합니다. (버킷별 레코드 수 + (버킷, 태그, 명사)별 빈도, 레코드당 명사 수 x 2 x 태그 수
+    만큼 펼쳐지며 allowDiskUse로 디스크를 사용) 재생성 완료를 늦추지 않도록 분산 재생성 후에는
+    새 세대를 공개한 다음 백그라운드에서 실행됩니다. (master_connector.start_derived_collection_build)
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    db = client[DB_NAME]
+    source = db[source_collection]
+    building_name = f"{target_collection}_building"
+    db[building_name].drop()
+    building = db[building_name]
+
+    # 1. 버킷별 레코드 수 (total_records 보고용)
+    record_counts: Dict[Tuple[str, str, str], int] = {}
+    for doc in source.aggregate(_bucket_and_tag_stages() + [
+        {"$group": {"_id": {"g": "$bucket.g", "b": "$bucket.b", "t": "$tag"}, "records": {"$sum": 1}}},
+    ], allowDiskUse=True):
+        key = doc["_id"]
+        record_counts[(key["g"], key["b"], key["t"])] = doc["records"]
+
+    # 2. (버킷, 태그, 명사)별 빈도를 버킷 순서/빈도 내림차순으로 스트리밍하며 버킷마다 스케치 생성
+    cursor = source.aggregate(_bucket_and_tag_stages() + [
+        {"$unwind": f"${DB_FIELD_NOUNS}"},
+        {"$group": {"_id": {"g": "$bucket.g", "b": "$bucket.b", "t": "$tag", "w": f"${DB_FIELD_NOUNS}"},
+                    "count": {"$sum": 1}}},
+        {"$sort": {"_id.g": 1, "_id.b": 1, "_id.t": 1, "count": -1}},
+    ], allowDiskUse=True, batchSize=5000)
+
+    batch: List[Dict[str, Any]] = []
+    sketch_count = 0
+    current_key = None
+    current_counts: List[Tuple[str, int]] = []
+    current_total = 0
+
+    def flush_bucket():
+        nonlocal sketch_count
+        granularity, bucket, tag = current_key
+        sketch = HeavyHitterSketch.from_exact_counts(
+            current_counts, current_total, record_counts.get(current_key, 0), capacity)
+        batch.append({
+            SKETCH_FIELD_GRANULARITY: granularity,
+            SKETCH_FIELD_BUCKET: bucket,
+            SKETCH_FIELD_TAG: tag,
+            **sketch.to_document(),
+        })
+        sketch_count += 1
+        if len(batch) >= 500:
+            building.insert_many(batch)
+            batch.clear()
+
+    with cursor:
+        for doc in cursor:
+            key = (doc["_id"]["g"], doc["_id"]["b"], doc["_id"]["t"])
+            if key != current_key:
+                if current_key is not None:
+                    flush_bucket()
+                current_key, current_counts, current_total = key, [], 0
+            # 상위 capacity + 1개까지만 보관 (마지막 하나는 omitted_max 계산용)
+            if len(current_counts) <= capacity:
+                current_counts.append((doc["_id"]["w"], doc["count"]))
+            current_total += doc["count"]
+
+    if current_key is not None:
+        flush_bucket()
+    if batch:
+        building.insert_many(batch)
+
+    building.create_index([(SKETCH_FIELD_TAG, 1), (SKETCH_FIELD_GRANULARITY, 1), (SKETCH_FIELD_BUCKET, 1)])
+
+    # 3. 완성된 스케치 컬렉션으로 원자적 교체 (조회 중인 요청은 이전 스케치를 계속 사용)
+    if sketch_count:
+        building.rename(target_collection, dropTarget=True)
+    else:
+        building.drop()
+    client.close()
+
+    print(f"✅ 명사 스케치 {sketch_count}개 생성 완료 ({time.time() - start_time:.4f}초)")
+    return sketch_count
+
+
+# ----------------------------------------------------------------------
+# 근사 상위 N 조회
+# ----------------------------------------------------------------------
+
+def _parse_day(value: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def supports_approximate(query_conditions: Dict[str, Any]) -> bool:
+    """
+    스케치로 답할 수 있는 조건인지 확인합니다.
+    (Title 조건은 스케치에 없으므로 불가, 날짜는 YYYY-MM-DD 형식이어야 함)
+    태그를 여러 개 지정한 조건도 불가합니다. 스케치는 태그별로 따로 저장되어 있어, 합산하면
+    여러 태그를 동시에 가진 기사가 중복 집계되고 상위 집합 보장(guaranteed_top_set)도 성립하지 않습니다.
+    """
+    if query_conditions.get('title'):
+        return False
+    if len(query_conditions.get('tags') or []) > 1:
+        return False
+    for field in ('start_date', 'end_date'):
+        value = query_conditions.get(field)
+        if value and _parse_day(value) is None:
+            return False
+    return True
+
+
+def build_bucket_filter(start_date: str, end_date: str) -> Dict[str, Any]:
+    """
+    날짜 범위를 최소 개수의 스케치로 덮는 쿼리를 만듭니다.
+    범위에 완전히 포함된 달은 월 스케치를, 양 끝의 걸친 달은 일 스케치를 사용합니다.
+    """
+    start_day = _parse_day(start_date) if start_date else None
+    end_day = _parse_day(end_date) if end_date else None
+
+    # 완전히 포함된 첫 달 / 마지막 달 (경계가 없으면 무한대)
+    first_full_month = None
+    if start_day:
+        first_full_month = start_day.replace(day=1)
+        if start_day.day != 1:
+            first_full_month = (first_full_month + timedelta(days=32)).replace(day=1)
+    last_full_month = None
+    if end_day:
+        last_full_month = end_day.replace(day=1)
+        if end_day.day != calendar.monthrange(end_day.year, end_day.month)[1]:
+            last_full_month = (last_full_month - timedelta(days=1)).replace(day=1)
+
+    if first_full_month and last_full_month and first_full_month > last_full_month:
+        # 범위가 한 달 안쪽이면 일 스케치만 사용
+        return {SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY,
+                SKETCH_FIELD_BUCKET: {"$gte": start_date, "$lte": end_date}}
+
+    month_range: Dict[str, str] = {}
+    if first_full_month: month_range["$gte"] = first_full_month.strftime('%Y-%m')
+    if last_full_month: month_range["$lte"] = last_full_month.strftime('%Y-%m')
+    month_filter: Dict[str, Any] = {SKETCH_FIELD_GRANULARITY: GRANULARITY_MONTH}
+    if month_range: month_filter[SKETCH_FIELD_BUCKET] = month_range
+
+    clauses = [month_filter]
+    if start_day and start_day != first_full_month:
+        clauses.append({SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY,
+                        SKETCH_FIELD_BUCKET: {"$gte": start_date, "$lt": first_full_month.isoformat()}})
+    if end_day and last_full_month:
+        after_last_full = (last_full_month + timedelta(days=32)).replace(day=1)
+        if end_day >= after_last_full:
+            clauses.append({SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY,
+                            SKETCH_FIELD_BUCKET: {"$gte": after_last_full.isoformat(), "$lte": end_date}})
+
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def get_approximate_top_nouns(query_conditions: Dict[str, Any], top_n: int) -> Optional[Dict[str, Any]]:
+    """
+    요청 범위를 덮는 스케치들을 병합하여 근사 상위 N개와 오차 한계를 반환합니다.
+
+    - 각 단어의 count는 상한 추정치이며, 실제 빈도는 [count - error, count] 안에 있습니다.
+    - error_bound는 목록에 없는 어떤 단어의 빈도도 넘지 않는 상한입니다.
+    - 날짜는 일 단위로 처리되므로 end_date 당일의 모든 기사가 포함됩니다.
+    - 태그는 하나까지만 지원합니다. (여러 개면 None: supports_approximate 참고)
+    """
+    tags = query_conditions.get('tags') or [ALL_TAGS_KEY]
+    if len(tags) > 1:
+        print("⚠️ 근사 엔진은 태그를 하나만 지원합니다. (여러 태그는 중복 집계됨)")
+        return None
+
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    sketch_query = {
+        SKETCH_FIELD_TAG: tags[0],
+        **build_bucket_filter(query_conditions.get('start_date', ""), query_conditions.get('end_date', "")),
+    }
+
+    sketch_docs = client[DB_NAME][NOUN_SKETCH_COLLECTION].find(sketch_query, {"_id": 0})
+    merged = HeavyHitterSketch.merge_all(HeavyHitterSketch.from_document(doc) for doc in sketch_docs)
+    client.close()
+
+    print(f"⚡ 근사 엔진: 스케치 병합 완료 ({time.time() - start_time:.4f}초, 총 명사 {merged.total}개)")
+
+    return {
+        "total_records": merged.records,
+        "top_words": merged.top(top_n),
+        "error_bound": merged.omitted_max,
+        "guaranteed_top_set": merged.is_top_guaranteed(top_n),
+    }
@@ -0,0 +1,355 @@
+# data_processor/tests/fakes.py
+
+"""
+테스트에서 MongoDB 대신 쓰는 메모리 컬렉션/클라이언트입니다. (DB 없이 실행되는 단위 테스트용)
+이 저장소의 코드가 쓰는 연산과 쿼리 연산자만 흉내 내며, aggregate()는 실행하지 않고
+파이프라인을 기록한 뒤 미리 넣어 둔 결과(aggregate_results)를 돌려줍니다.
+"""
+
+import copy
+import random
+import re
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+from unittest import mock
+
+_MISSING = object()
+
+
+def _get(document: Dict[str, Any], field: str) -> Any:
+    value: Any = document
+    for part in field.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    if value is _MISSING or value is None or operand is None:
+        return False
+    try:
+        if operator == '$lt': return value < operand
+        if operator == '$lte': return value <= operand
+        if operator == '$gt': return value > operand
+        return value >= operand
+    except TypeError:
+        return False  # MongoDB처럼 타입이 다른 값끼리는 비교하지 않음
+
+
+def _regex_matches(value: Any, pattern: Any, options: str = "") -> bool:
+    if not isinstance(value, str):
+        return False
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern, re.IGNORECASE if 'i' in options else 0)
+    return bool(pattern.search(value))
+
+
+def _value_matches(value: Any, condition: Any) -> bool:
+    """필드 값 하나가 조건(값 또는 연산자 딕셔너리)에 맞는지 판단합니다. (배열은 원소 중 하나라도 맞으면 일치)"""
+    if isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+        return all(_operator_matches(value, operator, operand, condition)
+                   for operator, operand in condition.items() if operator != '$options')
+    if isinstance(condition, re.Pattern):
+        values = value if isinstance(value, list) else [value]
+        return any(_regex_matches(item, condition) for item in values)
+    if value is _MISSING:
+        return condition is None
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value == condition
+
+
+def _operator_matches(value: Any, operator: str, operand: Any, condition: Dict[str, Any]) -> bool:
+    values = value if isinstance(value, list) else [value]
+    if operator == '$exists':
+        return (value is not _MISSING) == bool(operand)
+    if operator == '$eq':
+        return _value_matches(value, operand)
+    if operator == '$ne':
+        return not _value_matches(value, operand)
+    if operator == '$in':
+        return any(_value_matches(value, item) for item in operand)
+    if operator == '$nin':
+        return not any(_value_matches(value, item) for item in operand)
+    if operator == '$all':
+        return all(_value_matches(value, item) for item in operand)
+    if operator in ('$lt', '$lte', '$gt', '$gte'):
+        return any(_compare(item, operator, operand) for item in values)
+    if operator == '$regex':
+        return any(_regex_matches(item, operand, condition.get('$options', '')) for item in values)
+    if operator == '$type':
+        type_names = {'string': str, 'array': list, 'object': dict}
+        return operand in type_names and isinstance(value, type_names[operand])
+    raise NotImplementedError(f"fakes: 지원하지 않는 연산자 {operator}")
+
+
+def matches(document: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """document가 MongoDB 쿼리(query)에 맞는지 판단합니다."""
+    for field, condition in (query or {}).items():
+        if field == '$and':
+            if not all(matches(document, clause) for clause in condition): return False
+        elif field == '$or':
+            if not any(matches(document, clause) for clause in condition): return False
+        elif not _value_matches(_get(document, field), condition):
+            return False
+    return True
+
+
+def _evaluate(value: Any) -> Any:
+    """파이프라인 갱신의 식(expression) 중 {'$rand': {}}만 계산하고 나머지는 값 그대로 사용합니다."""
+    if isinstance(value, dict) and '$rand' in value:
+        return random.random()
+    return value
+
+
+def apply_update(document: Dict[str, Any], update: Any, inserting: bool = False) -> None:
+    """$set / $setOnInsert / $unset / $inc / $max 갱신(또는 $set 단계만 있는 파이프라인 갱신)을 적용합니다."""
+    if isinstance(update, list):
+        for stage in update:
+            apply_update(document, {'$set': {field: _evaluate(value) for field, value in stage['$set'].items()}})
+        return
+    for operator, fields in update.items():
+        if operator == '$setOnInsert' and not inserting:
+            continue
+        for field, value in fields.items():
+            current = document.get(field)
+            if operator in ('$set', '$setOnInsert'):
+                document[field] = copy.deepcopy(value)
+            elif operator == '$unset':
+                document.pop(field, None)
+            elif operator == '$inc':
+                document[field] = (current or 0) + value
+            elif operator == '$max':
+                document[field] = value if current is None or value > current else current
+            else:
+                raise NotImplementedError(f"fakes: 지원하지 않는 갱신 연산자 {operator}")
+
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(document)
+    included = {field for field, value in projection.items() if value and field != '_id'}
+    result = {field: copy.deepcopy(value) for field, value in document.items()
+              if field in included or (not included and projection.get(field, 1))}
+    if projection.get('_id', 1) and '_id' in document:
+        result['_id'] = document['_id']
+    else:
+        result.pop('_id', None)
+    return result
+
+
+class FakeCursor:
+    """find()/aggregate() 결과: 순회한 문서 수(consumed)를 세고 with 블록, sort/limit 체이닝을 지원합니다."""
+
+    def __init__(self, documents: Iterable[Dict[str, Any]]):
+        self.documents = list(documents)
+        self.consumed = 0
+        self.closed = False
+
+    def sort(self, key, direction=1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, field_direction in reversed(keys):
+            self.documents.sort(key=lambda document: _get(document, field), reverse=field_direction < 0)
+        return self
+
+    def limit(self, count: int):
+        if count:
+            self.documents = self.documents[:count]
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def max_time_ms(self, milliseconds: int):
+        return self
+
+    def __iter__(self):
+        for document in self.documents:
+            self.consumed += 1
+            yield document
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class FakeCollection:
+    """문서 목록을 메모리에 두고 쿼리/갱신을 흉내 내는 컬렉션입니다."""
+
+    def __init__(self, name: str = "", documents: Optional[Iterable[Dict[str, Any]]] = None, database=None):
+        self.name = name
+        self.database = database
+        self.documents: List[Dict[str, Any]] = [dict(document) for document in documents or []]
+        self.aggregate_results: List[Any] = []  # aggregate() 호출마다 앞에서부터 하나씩 반환
+        self.pipelines: List[List[Dict[str, Any]]] = []
+        self.indexes: List[Any] = []
+        self._next_id = 1
+
+    def _new_id(self) -> int:
+        while any(document.get('_id') == self._next_id for document in self.documents):
+            self._next_id += 1
+        return self._next_id
+
+    def _matching(self, query) -> List[Dict[str, Any]]:
+        return [document for document in self.documents if matches(document, query)]
+
+    def find(self, query=None, projection=None, batch_size=None, sort=None, limit=0, **kwargs) -> FakeCursor:
+        cursor = FakeCursor(_project(document, projection) for document in self._matching(query))
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    def find_one(self, query=None, projection=None):
+        found = self._matching(query)
+        return _project(found[0], projection) if found else None
+
+    def count_documents(self, query, limit=0, **kwargs) -> int:
+        count = len(self._matching(query))
+        return min(count, limit) if limit else count
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    def _upsert_document(self, query, update) -> Dict[str, Any]:
+        document = {field: value for field, value in (query or {}).items()
+                    if not field.startswith('$') and not isinstance(value, dict)}
+        document.setdefault('_id', self._new_id())
+        apply_update(document, update, inserting=True)
+        self.documents.append(document)
+        return document
+
+    def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=False, **kwargs):
+        found = self._matching(query)
+        if not found:
+            if not upsert:
+                return None
+            document = self._upsert_document(query, update)
+            return _project(document, projection) if return_document else None
+        before = copy.deepcopy(found[0])
+        apply_update(found[0], update)
+        return _project(found[0] if return_document else before, projection)
+
+    def update_one(self, query, update, upsert=False):
+        found = self._matching(query)
+        if found:
+            apply_update(found[0], update)
+        elif upsert:
+            self._upsert_document(query, update)
+        return SimpleNamespace(matched_count=len(found[:1]), modified_count=len(found[:1]))
+
+    def update_many(self, query, update, upsert=False):
+        found = self._matching(query)
+        for document in found:
+            apply_update(document, update)
+        return SimpleNamespace(matched_count=len(found), modified_count=len(found))
+
+    def replace_one(self, query, replacement, upsert=False):
+        found = self._matching(query)
+        if found:
+            document_id = found[0].get('_id')
+            found[0].clear()
+            found[0].update(copy.deepcopy(replacement), _id=document_id)
+        elif upsert:
+            self.documents.append({'_id': self._new_id(), **copy.deepcopy(replacement)})
+        return SimpleNamespace(matched_count=len(found[:1]))
+
+    def insert_many(self, documents, ordered=True):
+        for document in documents:
+            document.setdefault('_id', self._new_id())
+            self.documents.append(copy.deepcopy(document))
+
+    def delete_one(self, query):
+        found = self._matching(query)[:1]
+        self.documents = [document for document in self.documents if all(document is not item for item in found)]
+        return SimpleNamespace(deleted_count=len(found))
+
+    def delete_many(self, query):
+        found = self._matching(query)
+        self.documents = [document for document in self.documents if not matches(document, query)]
+        return SimpleNamespace(deleted_count=len(found))
+
+    def bulk_write(self, operations, ordered=True):
+        modified = deleted = 0
+        for operation in operations:
+            name = type(operation).__name__
+            if name == 'UpdateOne':
+                modified += self.update_one(operation._filter, operation._doc, upsert=operation._upsert).modified_count
+            elif name == 'DeleteMany':
+                deleted += self.delete_many(operation._filter).deleted_count
+            else:
+                raise NotImplementedError(f"fakes: 지원하지 않는 bulk 연산 {name}")
+        return SimpleNamespace(modified_count=modified, deleted_count=deleted)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        result = self.aggregate_results.pop(0) if self.aggregate_results else []
+        if isinstance(result, Exception):
+            raise result
+        return FakeCursor(result)
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append(keys)
+
+    def drop(self):
+        self.documents = []
+        if self.database is not None:
+            self.database.pop(self.name, None)
+
+    def rename(self, new_name: str, dropTarget: bool = False):
+        self.database.pop(self.name, None)
+        self.name = new_name
+        self.database[new_name] = self
+
+
+class FakeDatabase(dict):
+    """db[이름]으로 처음 접근하면 빈 컬렉션을 만듭니다."""
+
+    def __init__(self, name: str = ""):
+        super().__init__()
+        self.name = name
+
+    def __missing__(self, name: str) -> FakeCollection:
+        collection = self[name] = FakeCollection(name, database=self)
+        return collection
+
+    def list_collection_names(self) -> List[str]:
+        return [name for name, collection in self.items() if collection.documents]
+
+
+class FakeClient(dict):
+    """client[DB 이름][컬렉션 이름] 접근과 close() 호출 횟수 기록만 흉내 냅니다."""
+
+    def __init__(self):
+        super().__init__()
+        self.close_calls = 0
+
+    def __missing__(self, name: str) -> FakeDatabase:
+        database = self[name] = FakeDatabase(name)
+        return database
+
+    def __bool__(self):
+        return True  # 아직 DB에 접근하지 않은 빈 클라이언트도 '연결됨'으로 취급 (if not client 검사용)
+
+    def close(self):
+        self.close_calls += 1
+
+
+@contextmanager
+def patch_mongodb_client(*modules, client: Optional[FakeClient] = None):
+    """
+    주어진 모듈들의 get_mongodb_client가 같은 FakeClient를 반환하도록 패치합니다.
+    사용: with patch_mongodb_client(sampling) as client: ...
+    """
+    client = client if client is not None else FakeClient()
+    with ExitStack() as stack:
+        for module in modules:
+            stack.enter_context(mock.patch.object(module, 'get_mongodb_client', return_value=client))
+        yield client
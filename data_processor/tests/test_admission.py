@@ -0,0 +1,88 @@
+# data_processor/tests/test_admission.py
+
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from data_processor import admission
+from data_processor.admission import AdmissionRejected, admit, admit_degraded_sample
+from data_processor.constants import DB_NAME, ADMISSION_COLLECTION, ADMISSION_FIELD_HOLDER, ADMISSION_FIELD_EXPIRES_AT
+from data_processor.tests.fakes import patch_mongodb_client
+
+
+class AdmitTests(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(admission, 'ADMISSION_ENABLED', True),
+            mock.patch.object(admission, '_process_slots', threading.BoundedSemaphore(1)),
+            mock.patch.object(admission, 'ADMISSION_MAX_WAITERS', 0),
+            mock.patch.object(admission, '_cluster_slots_ready', False),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_process_slot_is_exclusive_and_released(self):
+        with mock.patch.object(admission, 'ADMISSION_CLUSTER_SLOTS', 0):
+            with admit(wait_seconds=0):
+                with self.assertRaises(AdmissionRejected):
+                    with admit(wait_seconds=0):
+                        pass
+            # 블록이 끝나면 슬롯을 반납하므로 다시 들어갈 수 있음
+            with admit(wait_seconds=0):
+                pass
+
+    def test_cluster_slot_is_leased_and_released_with_one_client(self):
+        with mock.patch.object(admission, 'ADMISSION_CLUSTER_SLOTS', 2), patch_mongodb_client(admission) as client:
+            slots = client[DB_NAME][ADMISSION_COLLECTION]
+            with admit(wait_seconds=0):
+                held = [slot for slot in slots.documents if slot[ADMISSION_FIELD_HOLDER]]
+                self.assertEqual(len(slots.documents), 2)
+                self.assertEqual(len(held), 1)
+                self.assertGreater(held[0][ADMISSION_FIELD_EXPIRES_AT], datetime.now(timezone.utc))
+        self.assertTrue(all(slot[ADMISSION_FIELD_HOLDER] is None for slot in slots.documents))
+        self.assertEqual(client.close_calls, 1)
+
+    def test_busy_cluster_rejects_and_frees_process_slot(self):
+        future = datetime.now(timezone.utc) + timedelta(minutes=5)
+        with mock.patch.object(admission, 'ADMISSION_CLUSTER_SLOTS', 1), patch_mongodb_client(admission) as client:
+            client[DB_NAME][ADMISSION_COLLECTION].insert_many(
+                [{"_id": 0, ADMISSION_FIELD_HOLDER: "other", ADMISSION_FIELD_EXPIRES_AT: future}])
+            with self.assertRaises(AdmissionRejected):
+                with admit(wait_seconds=0):
+                    pass
+        self.assertEqual(client.close_calls, 1)
+        self.assertTrue(admission._process_slots.acquire(blocking=False))
+        admission._process_slots.release()
+
+    def test_expired_lease_is_reclaimed(self):
+        past = datetime.now(timezone.utc) - timedelta(seconds=1)
+        with mock.patch.object(admission, 'ADMISSION_CLUSTER_SLOTS', 1), patch_mongodb_client(admission) as client:
+            slots = client[DB_NAME][ADMISSION_COLLECTION]
+            slots.insert_many([{"_id": 0, ADMISSION_FIELD_HOLDER: "crashed", ADMISSION_FIELD_EXPIRES_AT: past}])
+            with admit(wait_seconds=0):
+                self.assertNotEqual(slots.documents[0][ADMISSION_FIELD_HOLDER], "crashed")
+
+
+class DegradedSampleTests(unittest.TestCase):
+
+    def test_budget_rejects_without_waiting(self):
+        with mock.patch.object(admission, 'ADMISSION_DEGRADED_SAMPLE_SLOTS', 1), \
+                mock.patch.object(admission, '_degraded_sample_slots', threading.BoundedSemaphore(1)):
+            with admit_degraded_sample():
+                with self.assertRaises(AdmissionRejected):
+                    with admit_degraded_sample():
+                        pass
+            with admit_degraded_sample():
+                pass
+
+    def test_zero_budget_always_rejects(self):
+        with mock.patch.object(admission, 'ADMISSION_DEGRADED_SAMPLE_SLOTS', 0):
+            with self.assertRaises(AdmissionRejected):
+                with admit_degraded_sample():
+                    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# data_processor/tests/test_aggregation.py
+
+import os
+import random
+import unittest
+from collections import Counter
+from unittest import mock
+from data_processor import aggregation
+from data_processor.aggregation import StreamingNounCounter, plan_id_partitions, partition_query
+from data_processor.constants import DB_NAME, RECORD_NOUNS_COLLECTION, DB_FIELD_NOUNS
+from data_processor.tests.fakes import FakeCollection, patch_mongodb_client
+
+
+def _random_records(seed: int, count: int = 300, vocabulary: int = 400):
+    rng = random.Random(seed)
+    words = [f"noun{i:03d}" for i in range(vocabulary)]
+    return [rng.choices(words, k=rng.randint(0, 12)) for _ in range(count)]
+
+
+class StreamingNounCounterTests(unittest.TestCase):
+
+    def test_spilled_counts_match_counter(self):
+        records = _random_records(1)
+        expected = Counter(noun for nouns in records for noun in nouns)
+
+        # 상한을 아주 작게 주어 여러 번 디스크로 내보내고 파일 압축(compaction)까지 일어나게 함
+        with mock.patch.object(aggregation, 'AGG_MAX_SPILL_FILES', 3), StreamingNounCounter(0.002) as counter:
+            for nouns in records:
+                counter.add_record(nouns)
+            self.assertGreater(len(counter.spill_paths), 0)
+            self.assertLessEqual(len(counter.spill_paths), 3)
+            self.assertEqual(dict(counter.iter_counts()), dict(expected))
+            self.assertEqual(counter.records, len(records))
+            self.assertEqual(counter.total_nouns, sum(expected.values()))
+
+    def test_close_removes_spill_files(self):
+        counter = StreamingNounCounter(0.001)
+        for nouns in _random_records(2):
+            counter.add_record(nouns)
+        paths = list(counter.spill_paths)
+        counter.close()
+        for path in paths:
+            self.assertFalse(aggregation.os.path.exists(path))
+
+    def _merge_partitions(self, partitions):
+        parent = StreamingNounCounter(0.002)
+        for records in partitions:
+            child = StreamingNounCounter(0.001)
+            for nouns in records:
+                child.add_record(nouns)
+            parent.adopt_sorted_file(child.detach_sorted_file(), child.records, child.total_nouns)
+            child.close()
+        return parent
+
+    def test_adopted_partition_files_merge_to_exact_counts(self):
+        records = _random_records(3, count=600)
+        expected = Counter(noun for nouns in records for noun in nouns)
+        partitions = [records[i::4] for i in range(4)]
+
+        with self._merge_partitions(partitions) as parent:
+            self.assertEqual(dict(parent.iter_counts()), dict(expected))
+            self.assertEqual(parent.records, len(records))
+
+    def test_top_is_deterministic_across_partition_order(self):
+        # 동점이 많은 작은 어휘로 병합 순서가 달라도 상위 N개(동점 순서 포함)가 같아야 함
+        records = _random_records(4, count=400, vocabulary=30)
+        partitions = [records[i::5] for i in range(5)]
+
+        with self._merge_partitions(partitions) as forward, \
+                self._merge_partitions(list(reversed(partitions))) as backward:
+            self.assertEqual(forward.top(15), backward.top(15))
+
+    def test_detach_sorted_file_without_counts(self):
+        with StreamingNounCounter() as counter:
+            self.assertIsNone(counter.detach_sorted_file())
+
+
+class PartitionPlanningTests(unittest.TestCase):
+
+    def test_plan_id_partitions_marks_only_last_bucket_inclusive(self):
+        collection = mock.Mock()
+        collection.aggregate.return_value = [
+            {"_id": {"min": 1, "max": 40}, "count": 39},
+            {"_id": {"min": 40, "max": 80}, "count": 40},
+            {"_id": {"min": 80, "max": 99}, "count": 20},
+        ]
+        partitions = plan_id_partitions(collection, {"Tags": {"$in": ["A"]}}, 3)
+
+        pipeline = collection.aggregate.call_args[0][0]
+        self.assertEqual(pipeline[0], {"$match": {"Tags": {"$in": ["A"]}}})
+        self.assertEqual(pipeline[-1]["$bucketAuto"]["buckets"], 3)
+        self.assertEqual([p["last"] for p in partitions], [False, False, True])
+        self.assertEqual(sum(p["count"] for p in partitions), 99)
+
+    def test_partition_query_ranges_do_not_overlap(self):
+        first = {"min": 1, "max": 40, "count": 39, "last": False}
+        last = {"min": 40, "max": 99, "count": 60, "last": True}
+        self.assertEqual(partition_query({}, first), {"_id": {"$gte": 1, "$lt": 40}})
+        self.assertEqual(partition_query({"Tags": "A"}, last),
+                         {"$and": [{"Tags": "A"}, {"_id": {"$gte": 40, "$lte": 99}}]})
+
+    def test_small_queries_skip_partition_planning(self):
+        # 컬렉션 전체가 기준보다 작으면 조건 건수를 세지 않음 (메타데이터 건수만 사용)
+        collection = FakeCollection(RECORD_NOUNS_COLLECTION, [{"_id": i, "Tags": "A"} for i in range(10)])
+        with mock.patch.object(collection, 'count_documents', wraps=collection.count_documents) as count, \
+                mock.patch.object(aggregation, 'count_nouns_streaming') as streaming:
+            aggregation.count_nouns_parallel(collection, {"Tags": "A"}, workers=4, min_records=1000)
+        streaming.assert_called_once()
+        count.assert_not_called()
+        self.assertEqual(collection.pipelines, [])
+
+    def test_selective_queries_use_a_capped_count(self):
+        collection = FakeCollection(RECORD_NOUNS_COLLECTION,
+                                    [{"_id": i, "Tags": "A" if i < 5 else "B"} for i in range(50)])
+        with mock.patch.object(collection, 'count_documents', wraps=collection.count_documents) as count, \
+                mock.patch.object(aggregation, 'count_nouns_streaming') as streaming:
+            aggregation.count_nouns_parallel(collection, {"Tags": "A"}, workers=4, min_records=20)
+        count.assert_called_once_with({"Tags": "A"}, limit=20)
+        streaming.assert_called_once()
+        self.assertEqual(collection.pipelines, [])
+
+    def test_partitions_read_the_given_collection(self):
+        collection = FakeCollection("ImFiles_staging_3", [{"_id": i} for i in range(50)])
+        partitions = [{"min": 0, "max": 25, "count": 25, "last": False},
+                      {"min": 25, "max": 49, "count": 25, "last": True}]
+        executor = mock.Mock()
+        executor.submit.return_value.result.return_value = (None, 25, 0)
+        with mock.patch.object(aggregation, 'plan_id_partitions', return_value=partitions), \
+                mock.patch.object(aggregation, '_get_executor', return_value=executor):
+            counter = aggregation.count_nouns_parallel(collection, {}, workers=2, min_records=10)
+        with counter:
+            self.assertEqual(counter.records, 50)
+        self.assertEqual([call.args[-1] for call in executor.submit.call_args_list], ["ImFiles_staging_3"] * 2)
+
+    def test_count_partition_uses_collection_name(self):
+        with patch_mongodb_client(aggregation) as client:
+            client[DB_NAME]["ImFiles_staging_3"].insert_many([{"_id": 1, DB_FIELD_NOUNS: ["경제", "정치"]}])
+            client[DB_NAME][RECORD_NOUNS_COLLECTION].insert_many([{"_id": 1, DB_FIELD_NOUNS: ["다른"]}])
+            path, records, total_nouns = aggregation.count_partition({}, collection_name="ImFiles_staging_3")
+        try:
+            self.assertEqual((records, total_nouns), (1, 2))
+        finally:
+            if path: os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+# data_processor/tests/test_cache_manager.py
+
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+from data_processor import cache_manager
+from data_processor.admission import AdmissionRejected
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, TOP_NOUNS_CACHE_COLLECTION, CACHE_FIELD_GENERATION, CACHE_FIELD_TOP_WORDS,
+    CACHE_FIELD_TOTAL_RECORDS, DB_FIELD_TAGS, DB_FIELD_NOUNS, ENGINE_SAMPLED
+)
+from data_processor.tests.fakes import FakeDatabase, patch_mongodb_client
+
+
+class CurrentCachedDocumentTests(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDatabase()
+        self.cache = self.db[TOP_NOUNS_CACHE_COLLECTION]
+        self.key = {"title": "경제", "top_n": 10}
+        self.live_generation = 4
+        self.cached_generation = 4
+        patcher = mock.patch.object(cache_manager, 'get_data_version', side_effect=self._version)
+        self.get_data_version = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _version(self, db=None):
+        return self.cached_generation if db is None else self.live_generation
+
+    def _store(self, generation):
+        self.cache.insert_many([{**self.key, CACHE_FIELD_GENERATION: generation}])
+
+    def test_hit_uses_cached_version_only(self):
+        self._store(4)
+        self.assertIsNotNone(cache_manager._find_current_cached_document(self.db, self.key))
+        self.get_data_version.assert_called_once_with()
+
+    def test_stale_process_version_is_checked_live(self):
+        self.cached_generation = 3
+        self._store(4)
+        self.assertIsNotNone(cache_manager._find_current_cached_document(self.db, self.key))
+        self.assertEqual(len(self.cache.documents), 1)
+
+    def test_older_generation_is_deleted(self):
+        self._store(2)
+        self.assertIsNone(cache_manager._find_current_cached_document(self.db, self.key))
+        self.assertEqual(self.cache.documents, [])
+
+    def test_newer_generation_is_kept_when_live_read_lags(self):
+        self._store(5)
+        self.assertIsNone(cache_manager._find_current_cached_document(self.db, self.key))
+        self.assertEqual(len(self.cache.documents), 1)
+
+
+class TopNounsBatchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.admissions = 0
+        self.reject_after = None
+        patches = [
+            mock.patch.object(cache_manager, 'get_data_version', return_value=1),
+            mock.patch.object(cache_manager, 'admit', self._admit),
+            mock.patch.object(cache_manager, 'BATCH_SCAN_GROUP_SIZE', 2),
+            mock.patch.object(cache_manager, 'ADMISSION_OVERLOAD_POLICY', 'reject'),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @contextmanager
+    def _admit(self):
+        if self.reject_after is not None and self.admissions >= self.reject_after:
+            raise AdmissionRejected("혼잡", retry_after=7)
+        self.admissions += 1
+        yield
+
+    def _batch(self, tags, cached=()):
+        with patch_mongodb_client(cache_manager) as client:
+            db = client[DB_NAME]
+            db[RECORD_NOUNS_COLLECTION].insert_many([
+                {DB_FIELD_TAGS: ["경제"], DB_FIELD_NOUNS: ["금리", "금리", "물가"]},
+                {DB_FIELD_TAGS: ["정치", "경제"], DB_FIELD_NOUNS: ["선거", "금리"]},
+                {DB_FIELD_TAGS: ["사회"], DB_FIELD_NOUNS: ["날씨"]},
+            ])
+            for tag in cached:
+                key = cache_manager.build_cache_key(cache_manager.normalize_query_conditions({"tags": [tag]}), 5)
+                db[TOP_NOUNS_CACHE_COLLECTION].insert_many([{**key, CACHE_FIELD_GENERATION: 1,
+                                                             CACHE_FIELD_TOTAL_RECORDS: 9, CACHE_FIELD_TOP_WORDS: []}])
+            results = cache_manager.get_top_nouns_batch([{"tags": [tag]} for tag in tags], 5, admission=True)
+        return results, db
+
+    def test_each_group_shares_one_scan_with_bounded_counters(self):
+        results, db = self._batch(["경제", "정치", "사회"])
+        self.assertEqual(self.admissions, 2)  # 3건을 2건씩 묶어 두 번 검색
+        self.assertEqual(results[0][CACHE_FIELD_TOP_WORDS][:2], [{"word": "금리", "count": 3}, {"word": "물가", "count": 1}])
+        self.assertEqual(results[1][CACHE_FIELD_TOTAL_RECORDS], 1)
+        self.assertEqual(results[2][CACHE_FIELD_TOP_WORDS], [{"word": "날씨", "count": 1}])
+        self.assertEqual(len(db[TOP_NOUNS_CACHE_COLLECTION].documents), 3)
+
+    def test_rejection_marks_only_uncomputed_items(self):
+        self.reject_after = 1
+        results, _ = self._batch(["경제", "정치", "사회", "스포츠"], cached=["스포츠"])
+        self.assertTrue(results[3]["cache_hit"])
+        self.assertEqual(results[0]["engine"], "exact")
+        self.assertEqual(results[1]["engine"], "exact")
+        self.assertEqual((results[2]["status"], results[2]["retry_after"]), (503, 7))
+
+
+class CacheMissAdmissionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.holding = False
+        self.admissions = 0
+        self.reject = False
+        self.conditions = {"tags": ["경제"]}
+        patches = [
+            mock.patch.object(cache_manager, 'admit', self._admit),
+            mock.patch.object(cache_manager, 'get_cached_document', return_value=None),
+            mock.patch.object(cache_manager, 'start_background_calculation'),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @contextmanager
+    def _admit(self):
+        if self.reject:
+            raise AdmissionRejected("혼잡", retry_after=7)
+        self.admissions += 1
+        self.holding = True
+        try:
+            yield
+        finally:
+            self.holding = False
+
+    def _document(self, records):
+        return {CACHE_FIELD_GENERATION: 1, CACHE_FIELD_TOTAL_RECORDS: records, CACHE_FIELD_TOP_WORDS: []}
+
+    def test_sampled_miss_runs_under_admission(self):
+        def estimate(query, top_n):
+            self.assertTrue(self.holding)
+            return {CACHE_FIELD_TOP_WORDS: [], "sample_size": 10}
+
+        with mock.patch.object(cache_manager, 'estimate_top_nouns_by_sampling', side_effect=estimate):
+            document = cache_manager.get_top_nouns_document(self.conditions, 5, engine=ENGINE_SAMPLED, admission=True)
+        self.assertEqual(self.admissions, 1)
+        self.assertEqual(document["engine"], ENGINE_SAMPLED)
+
+    def test_rejected_sampled_miss_degrades(self):
+        self.reject = True
+        degraded = {"degraded": True}
+        with mock.patch.object(cache_manager, 'estimate_top_nouns_by_sampling') as estimate, \
+                mock.patch.object(cache_manager, '_get_degraded_document', return_value=degraded) as degrade:
+            document = cache_manager.get_top_nouns_document(self.conditions, 5, engine=ENGINE_SAMPLED, admission=True)
+        self.assertIs(document, degraded)
+        estimate.assert_not_called()
+        self.assertEqual(degrade.call_args.args[2].retry_after, 7)
+
+    def test_zero_hit_rebuild_runs_without_the_slot(self):
+        def rebuild():
+            self.assertFalse(self.holding)
+            return {"data_version": 2}
+
+        with mock.patch.object(cache_manager, 'calculate_and_save_document',
+                               side_effect=[self._document(0), self._document(4)]) as calculate, \
+                mock.patch.object(cache_manager, 'distribute_importer_rebuild', side_effect=rebuild) as distribute:
+            document = cache_manager.get_top_nouns_document(self.conditions, 5, admission=True)
+
+        distribute.assert_called_once()
+        self.assertEqual(self.admissions, 2)  # 재처리 뒤 새 슬롯을 얻어 재집계
+        self.assertEqual([call.kwargs["rebuild_on_miss"] for call in calculate.call_args_list], [False, False])
+        self.assertEqual(document[CACHE_FIELD_TOTAL_RECORDS], 4)
+
+    def test_zero_hit_recount_can_be_rejected(self):
+        def rebuild():
+            self.reject = True
+            return {"data_version": 2}
+
+        with mock.patch.object(cache_manager, 'calculate_and_save_document', return_value=self._document(0)), \
+                mock.patch.object(cache_manager, 'distribute_importer_rebuild', side_effect=rebuild), \
+                mock.patch.object(cache_manager, '_get_degraded_document', return_value={"degraded": True}):
+            document = cache_manager.get_top_nouns_document(self.conditions, 5, admission=True)
+        self.assertEqual(document, {"degraded": True})
+
+    def test_failed_rebuild_returns_the_empty_result(self):
+        with mock.patch.object(cache_manager, 'calculate_and_save_document', return_value=self._document(0)), \
+                mock.patch.object(cache_manager, 'distribute_importer_rebuild', side_effect=ConnectionError("x")):
+            document = cache_manager.get_top_nouns_document(self.conditions, 5, admission=True)
+        self.assertEqual(self.admissions, 1)
+        self.assertEqual(document[CACHE_FIELD_TOTAL_RECORDS], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
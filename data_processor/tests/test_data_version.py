@@ -0,0 +1,60 @@
+# data_processor/tests/test_data_version.py
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from data_processor.data_version import (
+    allocate_generation, claim_generation_swap, release_generation_swap, get_data_version
+)
+from data_processor.constants import (
+    META_COLLECTION, META_DOC_DATA_VERSION, META_FIELD_SWAPPING, META_FIELD_SWAPPING_SINCE,
+    GENERATION_SWAP_LEASE_SECONDS
+)
+from data_processor.tests.fakes import FakeDatabase
+
+
+class GenerationSwapTests(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDatabase()
+
+    def _meta(self):
+        return self.db[META_COLLECTION].find_one({"_id": META_DOC_DATA_VERSION})
+
+    def test_generations_are_allocated_after_the_published_version(self):
+        first, second = allocate_generation(self.db), allocate_generation(self.db)
+        self.assertEqual((first, second), (1, 2))
+        self.assertEqual(get_data_version(self.db), 0)
+
+    def test_only_one_swap_runs_at_a_time(self):
+        first, second = allocate_generation(self.db), allocate_generation(self.db)
+        self.assertTrue(claim_generation_swap(first, self.db))
+        # 다른 교체가 진행 중이면 None (기다렸다가 다시 시도)
+        self.assertIsNone(claim_generation_swap(second, self.db))
+
+        self.assertEqual(release_generation_swap(first, self.db), first)
+        self.assertIsNone(self._meta()[META_FIELD_SWAPPING])
+        self.assertTrue(claim_generation_swap(second, self.db))
+        self.assertEqual(release_generation_swap(second, self.db), second)
+
+    def test_older_generation_cannot_replace_newer_data(self):
+        older, newer = allocate_generation(self.db), allocate_generation(self.db)
+        self.assertTrue(claim_generation_swap(newer, self.db))
+        release_generation_swap(newer, self.db)
+        self.assertIs(claim_generation_swap(older, self.db), False)
+        self.assertEqual(get_data_version(self.db), newer)
+
+    def test_expired_lease_can_be_taken_over(self):
+        stuck, fresh = allocate_generation(self.db), allocate_generation(self.db)
+        self.assertTrue(claim_generation_swap(stuck, self.db))
+        self.db[META_COLLECTION].update_one({"_id": META_DOC_DATA_VERSION}, {"$set": {
+            META_FIELD_SWAPPING_SINCE: datetime.now(timezone.utc) - timedelta(seconds=GENERATION_SWAP_LEASE_SECONDS + 1)
+        }})
+        self.assertTrue(claim_generation_swap(fresh, self.db))
+        # 임대를 빼앗긴 교체는 반납/공개하지 못함
+        self.assertIsNone(release_generation_swap(stuck, self.db))
+        self.assertEqual(release_generation_swap(fresh, self.db, publish=False), 0)
+        self.assertEqual(get_data_version(self.db), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
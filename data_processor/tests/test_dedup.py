@@ -0,0 +1,63 @@
+# data_processor/tests/test_dedup.py
+
+import unittest
+from unittest import mock
+from data_processor import dedup
+from data_processor.dedup import content_hash, normalize_article_text, dedup_rebuild_options, remove_duplicate_records
+from data_processor.constants import (
+    DB_NAME, DB_FIELD_CONTENT_HASH, DEDUP_COUNT_ONCE, DEDUP_COUNT_PER_OCCURRENCE
+)
+from data_processor.tests.fakes import patch_mongodb_client
+
+
+class ContentHashTests(unittest.TestCase):
+
+    def test_hash_ignores_case_whitespace_punctuation_and_unicode_forms(self):
+        original = content_hash("Brexit talks resume", "The PM said: 'talks will resume.'")
+        republished = content_hash("  BREXIT talks   resume ", "The PM said  talks will resume")
+        self.assertEqual(original, republished)
+        # 전각 문자(NFKC 정규화 대상)도 같은 텍스트로 취급
+        self.assertEqual(content_hash("ＢＢＣ", ""), content_hash("bbc", ""))
+
+    def test_hash_differs_for_different_content(self):
+        self.assertNotEqual(content_hash("Brexit talks resume", ""), content_hash("Brexit talks stall", ""))
+
+    def test_heading_and_body_are_separated(self):
+        self.assertNotEqual(normalize_article_text("a", "b c"), normalize_article_text("a b", "c"))
+        self.assertEqual(normalize_article_text(None, None), "\n")
+
+
+class DedupRebuildOptionsTests(unittest.TestCase):
+
+    def test_options_sent_to_workers(self):
+        self.assertEqual(dedup_rebuild_options(DEDUP_COUNT_ONCE, "2"),
+                         {"dedup_count_mode": DEDUP_COUNT_ONCE, "extractor_version": "2"})
+        self.assertEqual(dedup_rebuild_options(DEDUP_COUNT_PER_OCCURRENCE)["dedup_count_mode"],
+                         DEDUP_COUNT_PER_OCCURRENCE)
+
+    def test_rejects_unknown_count_mode(self):
+        with self.assertRaises(ValueError):
+            dedup_rebuild_options("twice")
+
+
+class RemoveDuplicateRecordsTests(unittest.TestCase):
+
+    def test_keeps_the_first_record_of_each_group(self):
+        with patch_mongodb_client(dedup) as client:
+            collection = client[DB_NAME]["ImFiles_staging_2"]
+            collection.insert_many([{"_id": record_id, DB_FIELD_CONTENT_HASH: "h"} for record_id in (1, 2, 3)]
+                                   + [{"_id": 4, DB_FIELD_CONTENT_HASH: "k"}])
+            # 파이프라인($sort 후 $group)이 만드는 결과: 가장 이른 레코드가 ids[0]
+            collection.aggregate_results = [[{"_id": "h", "ids": [2, 1, 3], "count": 3}]]
+
+            self.assertEqual(remove_duplicate_records("ImFiles_staging_2"), 2)
+
+        self.assertEqual(sorted(document["_id"] for document in collection.documents), [2, 4])
+        self.assertEqual(client.close_calls, 1)
+
+    def test_returns_none_without_connection(self):
+        with mock.patch.object(dedup, 'get_mongodb_client', return_value=None):
+            self.assertIsNone(remove_duplicate_records("ImFiles"))
+
+if __name__ == '__main__':
+    unittest.main()
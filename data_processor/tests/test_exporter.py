@@ -0,0 +1,60 @@
+# data_processor/tests/test_exporter.py
+
+import csv
+import io
+import json
+import unittest
+from unittest import mock
+from pymongo.errors import PyMongoError
+from data_processor import exporter, title_index
+from data_processor.constants import DB_NAME, RECORD_NOUNS_COLLECTION
+from data_processor.tests.fakes import patch_mongodb_client
+
+DISTRIBUTION = [{"_id": "경제", "count": 3}, {"_id": "a,b", "count": 1}]
+
+
+class ExportTests(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(title_index, 'is_title_index_backfilled', return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _records(self, client):
+        return client[DB_NAME][RECORD_NOUNS_COLLECTION]
+
+    def test_ndjson_streams_the_server_side_distribution(self):
+        with patch_mongodb_client(exporter) as client:
+            self._records(client).aggregate_results.append(DISTRIBUTION)
+            lines = list(exporter.iter_export_lines({"title": "경제"}, 'ndjson'))
+
+        self.assertEqual([json.loads(line) for line in lines],
+                         [{"word": "경제", "count": 3}, {"word": "a,b", "count": 1}])
+        pipeline = self._records(client).pipelines[0]
+        self.assertIn("$match", pipeline[0])
+        self.assertEqual(pipeline[-1], {"$sort": {"count": -1, "_id": 1}})
+        self.assertEqual(client.close_calls, 1)
+
+    def test_csv_has_header_and_quotes_fields(self):
+        with patch_mongodb_client(exporter) as client:
+            self._records(client).aggregate_results.append(DISTRIBUTION)
+            rows = list(csv.reader(io.StringIO("".join(exporter.iter_export_lines({"title": "경제"}, 'csv')))))
+        self.assertEqual(rows, [["word", "count"], ["경제", "3"], ["a,b", "1"]])
+
+    def test_errors_are_raised_before_streaming(self):
+        with self.assertRaises(ValueError):
+            exporter.iter_export_lines({"title": "경제"}, 'xml')
+
+        with patch_mongodb_client(exporter) as client:
+            self._records(client).aggregate_results.append(PyMongoError("down"))
+            with self.assertRaises(ConnectionError):
+                exporter.iter_export_lines({"title": "경제"})
+        self.assertEqual(client.close_calls, 1)
+
+        with mock.patch.object(exporter, 'get_mongodb_client', return_value=None):
+            with self.assertRaises(ConnectionError):
+                exporter.iter_export_lines({"title": "경제"})
+
+
+if __name__ == '__main__':
+    unittest.main()
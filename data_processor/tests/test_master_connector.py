@@ -0,0 +1,67 @@
+# data_processor/tests/test_master_connector.py
+
+import unittest
+from unittest import mock
+from data_processor import master_connector
+from data_processor.master_connector import _apply_worker_result, distribute_importer_rebuild
+
+
+def _result(status, **fields):
+    return {"worker": "w", "status": status, "message": "", "processing_time": 0.0, "records_inserted": 0, **fields}
+
+
+class WorkerResultTests(unittest.TestCase):
+
+    def test_missing_status_counts_as_success(self):
+        response_data = _result("INITIATED")
+        _apply_worker_result(response_data, {"message": "완료", "records_inserted": 3})
+        self.assertEqual((response_data["status"], response_data["records_inserted"]), ("SUCCESS", 3))
+
+    def test_non_object_response_is_invalid(self):
+        response_data = _result("INITIATED")
+        _apply_worker_result(response_data, ["SUCCESS"])
+        self.assertEqual(response_data["status"], "INVALID_RESPONSE")
+
+
+class DistributeRebuildTests(unittest.TestCase):
+
+    def setUp(self):
+        self.statuses = []
+        patches = {
+            'allocate_generation': mock.Mock(return_value=5),
+            'call_worker_rebuild': mock.Mock(side_effect=lambda worker, request: _result(
+                self.statuses[master_connector.WORKER_ADDRESSES.index(worker)], worker=worker['name'])),
+            'finalize_staged_rebuild': mock.Mock(return_value=5),
+            'discard_staging_collection': mock.Mock(),
+            'staging_has_records': mock.Mock(return_value=True),
+            'get_data_version': mock.Mock(return_value=4),
+        }
+        for name, value in patches.items():
+            patcher = mock.patch.object(master_connector, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _rebuild(self, *statuses):
+        self.statuses = list(statuses)
+        return distribute_importer_rebuild()
+
+    def test_accepted_replies_are_successful(self):
+        self.assertEqual(self._rebuild("SUCCESS", "ACCEPTED", "SUCCESS")["data_version"], 5)
+        master_connector.finalize_staged_rebuild.assert_called_once_with(5)
+        master_connector.discard_staging_collection.assert_not_called()
+
+    def test_failed_staged_rebuild_is_discarded(self):
+        self.assertEqual(self._rebuild("SUCCESS", "TIMEOUT", "SUCCESS")["data_version"], 4)
+        master_connector.discard_staging_collection.assert_called_once_with(5)
+        master_connector.finalize_staged_rebuild.assert_not_called()
+
+    def test_failed_in_place_rebuild_still_publishes(self):
+        # 스테이징이 비어 있으면 워커들이 ImFiles에 직접 기록한 것이므로 이전 캐시/ETag를 무효화해야 함
+        master_connector.staging_has_records.return_value = False
+        self.assertEqual(self._rebuild("SUCCESS", "CONNECTION_ERROR", "SUCCESS")["data_version"], 5)
+        master_connector.finalize_staged_rebuild.assert_called_once_with(5)
+        master_connector.discard_staging_collection.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
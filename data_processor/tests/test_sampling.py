@@ -0,0 +1,126 @@
+# data_processor/tests/test_sampling.py
+
+import random
+import unittest
+from collections import Counter
+from unittest import mock
+from data_processor import sampling
+from data_processor.sampling import (
+    rank_order_confidence, rank_stability, estimate_top_nouns_by_sampling, assign_random_keys
+)
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, META_COLLECTION, META_DOC_RANDOM_KEY, META_FIELD_BACKFILLED,
+    DB_FIELD_NOUNS, DB_FIELD_RANDOM_KEY
+)
+from data_processor.tests.fakes import patch_mongodb_client
+
+
+def _keyed(records, seed=0):
+    rng = random.Random(seed)
+    return [{**record, DB_FIELD_RANDOM_KEY: rng.random()} for record in records]
+
+
+class RankStatisticsTests(unittest.TestCase):
+
+    def test_confidence_grows_with_separation(self):
+        self.assertEqual(rank_order_confidence([5]), 1.0)
+        self.assertAlmostEqual(rank_order_confidence([10, 10]), 0.5)
+        self.assertAlmostEqual(rank_order_confidence([0, 0]), 0.5)
+        self.assertLess(rank_order_confidence([12, 10]), rank_order_confidence([120, 100]))
+        self.assertGreater(rank_order_confidence([1000, 500, 100]), 0.999)
+
+    def test_stability_is_share_of_same_ranks(self):
+        self.assertEqual(rank_stability([], []), 1.0)
+        self.assertEqual(rank_stability(["a", "b", "c"], ["a", "b", "c"]), 1.0)
+        self.assertAlmostEqual(rank_stability(["a", "b", "c", "d"], ["a", "c", "b", "d"]), 0.5)
+        self.assertEqual(rank_stability([], ["a", "b"]), 0.0)
+
+
+class SamplingEstimateTests(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(sampling, 'is_random_key_backfilled', return_value=True)
+        self.backfilled = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _estimate(self, records, **kwargs):
+        with patch_mongodb_client(sampling) as client:
+            collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            collection.insert_many(records)
+            return estimate_top_nouns_by_sampling({}, **kwargs), collection
+
+    def test_small_result_is_read_exactly(self):
+        rng = random.Random(4)
+        records = [{DB_FIELD_NOUNS: rng.choices("가나다라마", k=5)} for _ in range(30)]
+        exact = Counter(noun for record in records for noun in record[DB_FIELD_NOUNS])
+        result, collection = self._estimate(records, top_n=5, initial_size=8, max_size=30)
+
+        self.assertEqual(result["sample_size"], 30)
+        self.assertEqual((result["total_records"], result["confidence"]), (30, 1.0))
+        self.assertEqual({item["word"]: item["count"] for item in result["top_words"]}, dict(exact))
+        self.assertEqual(collection.pipelines, [])
+
+    def test_random_key_scan_stops_early_and_estimates_total(self):
+        rng = random.Random(3)
+        records = _keyed([{DB_FIELD_NOUNS: ["가"] * 30 + ["나"] * 15 + ["다"] * 5 + [f"희귀{rng.randint(0, 999)}"]}
+                          for _ in range(5000)])
+        result, collection = self._estimate(records, top_n=3, confidence_target=0.95, initial_size=50, max_size=2000)
+
+        # $sample(전체 무작위 정렬)을 쓰지 않고, 목표에 도달하면 상한까지 읽지 않고 멈춤
+        self.assertEqual(collection.pipelines, [])
+        self.assertLess(result["sample_size"], 2000)
+        self.assertEqual([item["word"] for item in result["top_words"]], ["가", "나", "다"])
+        self.assertGreaterEqual(result["confidence"], 0.95)
+        # 읽은 rand 구간 너비로 환산한 전체 레코드 수
+        self.assertAlmostEqual(result["total_records"], 5000, delta=1500)
+        scale = result["total_records"] / result["sample_size"]
+        self.assertEqual(result["top_words"][0]["count"], round(result["top_words"][0]["sample_count"] * scale))
+
+    def test_scan_wraps_around_the_start_key(self):
+        records = _keyed([{DB_FIELD_NOUNS: [f"명사{i}"]} for i in range(400)], seed=5)
+        with mock.patch.object(sampling.random, 'random', return_value=0.9):
+            result, _ = self._estimate(records, top_n=400, confidence_target=1.01, initial_size=50, max_size=200)
+
+        self.assertEqual(result["sample_size"], 200)
+        # [0.9, 1) 구간 전체와 [0, r) 일부를 덮으므로 전체 추정치는 400 근처
+        self.assertAlmostEqual(result["total_records"], 400, delta=80)
+
+    def test_sample_stage_is_used_before_backfill(self):
+        self.backfilled.return_value = False
+        records = [{DB_FIELD_NOUNS: ["가", "나"]} for _ in range(50)]
+        with patch_mongodb_client(sampling) as client:
+            collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            collection.insert_many(records)
+            collection.aggregate_results.append([{DB_FIELD_NOUNS: ["가", "나"]}] * 10)
+            result = estimate_top_nouns_by_sampling({}, top_n=2, confidence_target=1.01, initial_size=4, max_size=10)
+
+        # 문서 전체가 아니라 명사만 남긴 뒤 무작위 표본을 뽑음
+        self.assertEqual(list(collection.pipelines[0][1]), ["$project"])
+        self.assertEqual(collection.pipelines[0][2], {"$sample": {"size": 10}})
+        self.assertEqual(result["total_records"], 50)
+        self.assertEqual(result["top_words"][0]["count"], 50)
+
+    def test_no_matching_records(self):
+        result, collection = self._estimate([], top_n=5)
+        self.assertEqual(result["sample_size"], 0)
+        self.assertEqual(result["top_words"], [])
+        self.assertEqual(collection.pipelines, [])
+
+
+class AssignRandomKeysTests(unittest.TestCase):
+
+    def test_missing_keys_are_filled_and_flag_is_recorded(self):
+        with patch_mongodb_client(sampling) as client:
+            db = client[DB_NAME]
+            db[RECORD_NOUNS_COLLECTION].insert_many([{DB_FIELD_NOUNS: []}, {DB_FIELD_NOUNS: [], DB_FIELD_RANDOM_KEY: 0.5}])
+            self.assertEqual(assign_random_keys(), 1)
+
+        keys = [document[DB_FIELD_RANDOM_KEY] for document in db[RECORD_NOUNS_COLLECTION].documents]
+        self.assertEqual(keys[1], 0.5)
+        self.assertTrue(0.0 <= keys[0] < 1.0)
+        self.assertIn([(DB_FIELD_RANDOM_KEY, 1)], db[RECORD_NOUNS_COLLECTION].indexes)
+        self.assertTrue(db[META_COLLECTION].find_one({"_id": META_DOC_RANDOM_KEY})[META_FIELD_BACKFILLED])
+
+
+if __name__ == '__main__':
+    unittest.main()
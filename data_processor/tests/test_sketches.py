@@ -0,0 +1,132 @@
+# data_processor/tests/test_sketches.py
+
+import random
+import unittest
+from collections import Counter
+from data_processor import sketches
+from data_processor.sketches import (
+    HeavyHitterSketch, GRANULARITY_DAY, GRANULARITY_MONTH,
+    build_bucket_filter, supports_approximate, get_approximate_top_nouns
+)
+from data_processor.constants import (
+    DB_NAME, NOUN_SKETCH_COLLECTION, SKETCH_FIELD_BUCKET, SKETCH_FIELD_GRANULARITY, SKETCH_FIELD_TAG
+)
+from data_processor.tests.fakes import patch_mongodb_client
+
+
+def _bucket_counts(seed: int, buckets: int = 6, vocabulary: int = 200):
+    rng = random.Random(seed)
+    words = [f"noun{i:03d}" for i in range(vocabulary)]
+    # 앞쪽 단어일수록 자주 나오도록 (실제 명사 분포처럼 치우치게)
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return [Counter(rng.choices(words, weights=weights, k=rng.randint(200, 600))) for _ in range(buckets)]
+
+
+def _sketch(counts: Counter, capacity: int) -> HeavyHitterSketch:
+    return HeavyHitterSketch.from_exact_counts(counts.most_common(), sum(counts.values()), capacity=capacity)
+
+
+class HeavyHitterSketchTests(unittest.TestCase):
+
+    def test_merged_bounds_contain_true_counts(self):
+        buckets = _bucket_counts(7)
+        exact = sum(buckets, Counter())
+        merged = HeavyHitterSketch.merge_all([_sketch(counts, 20) for counts in buckets], capacity=20)
+
+        self.assertEqual(merged.total, sum(exact.values()))
+        for word, upper in merged.upper.items():
+            self.assertLessEqual(merged.lower[word], exact[word])
+            self.assertLessEqual(exact[word], upper)
+        for word, count in exact.items():
+            if word not in merged.upper:
+                self.assertLessEqual(count, merged.omitted_max)
+
+    def test_error_matches_bound_width(self):
+        merged = HeavyHitterSketch.merge_all([_sketch(counts, 20) for counts in _bucket_counts(8)], capacity=20)
+        for item in merged.top(10):
+            self.assertEqual(item["error"], merged.upper[item["word"]] - merged.lower[item["word"]])
+
+    def test_complete_sketches_are_exact_and_guaranteed(self):
+        buckets = _bucket_counts(9, vocabulary=30)
+        exact = sum(buckets, Counter())
+        merged = HeavyHitterSketch.merge_all([_sketch(counts, 100) for counts in buckets], capacity=100)
+
+        self.assertEqual(merged.omitted_max, 0)
+        self.assertTrue(merged.is_top_guaranteed(5))
+        self.assertEqual({item["word"]: item["count"] for item in merged.top(5)},
+                         {word: exact[word] for word, _ in exact.most_common(5)})
+
+    def test_not_guaranteed_when_boundary_is_ambiguous(self):
+        sketch = HeavyHitterSketch(capacity=3)
+        sketch.upper = {"a": 10, "b": 9, "c": 8}
+        sketch.lower = {"a": 10, "b": 5, "c": 8}
+        self.assertFalse(sketch.is_top_guaranteed(2))
+        sketch.lower["b"] = 9
+        self.assertTrue(sketch.is_top_guaranteed(2))
+
+    def test_document_round_trip(self):
+        sketch = _sketch(_bucket_counts(10)[0], 15)
+        restored = HeavyHitterSketch.from_document(sketch.to_document(), capacity=15)
+        self.assertEqual((restored.upper, restored.lower, restored.omitted_max, restored.total),
+                         (sketch.upper, sketch.lower, sketch.omitted_max, sketch.total))
+
+
+class BucketFilterTests(unittest.TestCase):
+
+    def test_range_inside_one_month_uses_day_buckets(self):
+        query = build_bucket_filter("2024-03-05", "2024-03-20")
+        self.assertEqual(query, {SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY,
+                                 SKETCH_FIELD_BUCKET: {"$gte": "2024-03-05", "$lte": "2024-03-20"}})
+
+    def test_full_months_use_month_buckets_only(self):
+        query = build_bucket_filter("2024-01-01", "2024-02-29")
+        self.assertEqual(query, {SKETCH_FIELD_GRANULARITY: GRANULARITY_MONTH,
+                                 SKETCH_FIELD_BUCKET: {"$gte": "2024-01", "$lte": "2024-02"}})
+
+    def test_partial_edges_add_day_buckets(self):
+        query = build_bucket_filter("2024-01-15", "2024-03-10")
+        self.assertEqual(query["$or"], [
+            {SKETCH_FIELD_GRANULARITY: GRANULARITY_MONTH, SKETCH_FIELD_BUCKET: {"$gte": "2024-02", "$lte": "2024-02"}},
+            {SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY, SKETCH_FIELD_BUCKET: {"$gte": "2024-01-15", "$lt": "2024-02-01"}},
+            {SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY, SKETCH_FIELD_BUCKET: {"$gte": "2024-03-01", "$lte": "2024-03-10"}},
+        ])
+
+
+class SupportsApproximateTests(unittest.TestCase):
+
+    def test_supported_conditions(self):
+        self.assertTrue(supports_approximate({}))
+        self.assertTrue(supports_approximate({"tags": ["경제"], "start_date": "2024-01-01"}))
+
+    def test_unsupported_conditions(self):
+        self.assertFalse(supports_approximate({"title": "선거"}))
+        self.assertFalse(supports_approximate({"tags": ["경제", "정치"]}))
+        self.assertFalse(supports_approximate({"start_date": "2024/01/01"}))
+        # 여러 태그는 DB를 조회하기 전에 None으로 거절
+        self.assertIsNone(get_approximate_top_nouns({"tags": ["경제", "정치"]}, 10))
+
+
+class ApproximateTopNounsTests(unittest.TestCase):
+
+    def test_merges_only_buckets_in_range_for_the_tag(self):
+        buckets = _bucket_counts(11, buckets=3)
+        documents = []
+        for bucket, tag, counts in (("2024-03-01", "경제", buckets[0]), ("2024-03-02", "경제", buckets[1]),
+                                    ("2024-03-02", "정치", buckets[2]), ("2024-04-01", "경제", buckets[2])):
+            documents.append({**_sketch(counts, 50).to_document(), SKETCH_FIELD_GRANULARITY: GRANULARITY_DAY,
+                              SKETCH_FIELD_BUCKET: bucket, SKETCH_FIELD_TAG: tag})
+
+        with patch_mongodb_client(sketches) as client:
+            client[DB_NAME][NOUN_SKETCH_COLLECTION].insert_many(documents)
+            result = get_approximate_top_nouns({"tags": ["경제"], "start_date": "2024-03-01",
+                                                "end_date": "2024-03-05"}, 5)
+
+        exact = buckets[0] + buckets[1]
+        for item in result["top_words"]:
+            self.assertGreaterEqual(item["count"], exact[item["word"]])
+        self.assertEqual(result["top_words"][0]["word"], exact.most_common(1)[0][0])
+        self.assertEqual(client.close_calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
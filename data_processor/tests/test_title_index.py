@@ -0,0 +1,68 @@
+# data_processor/tests/test_title_index.py
+
+import unittest
+from data_processor import title_index
+from data_processor.title_index import tokenize_heading, build_title_query, heading_matches, build_title_index
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, META_COLLECTION, META_DOC_DATA_VERSION, META_DOC_TITLE_INDEX,
+    META_FIELD_BACKFILLED, META_FIELD_VERSION, DB_FIELD_HEADING, DB_FIELD_HEADING_TOKENS
+)
+from data_processor.tests.fakes import matches, patch_mongodb_client
+
+HEADINGS = ["Apple Watch 출시", "애플워치 판매 급증", "C++ 표준 위원회", "U.S. 경제 전망", "파인애플 가격"]
+
+
+def _documents():
+    return [{DB_FIELD_HEADING: heading, DB_FIELD_HEADING_TOKENS: tokenize_heading(heading)} for heading in HEADINGS]
+
+
+class TitleQueryTests(unittest.TestCase):
+
+    def _search(self, title, mode='token'):
+        query = build_title_query(title, mode)
+        found = [document[DB_FIELD_HEADING] for document in _documents() if matches(document, query)]
+        # 파이썬 판정(heading_matches)도 DB 쿼리와 같은 결과여야 함
+        self.assertEqual(found, [heading for heading in HEADINGS if heading_matches(heading, title, mode)])
+        return query, found
+
+    def test_tokenize_heading(self):
+        self.assertEqual(tokenize_heading("Apple watch, APPLE 출시!"), ["apple", "watch", "출시"])
+        self.assertEqual(tokenize_heading(None), [])
+
+    def test_token_mode_matches_word_prefixes(self):
+        query, found = self._search("app WAT")
+        self.assertIn(DB_FIELD_HEADING_TOKENS, query)
+        self.assertEqual(found, ["Apple Watch 출시"])
+        self.assertEqual(self._search("애플")[1], ["애플워치 판매 급증"])  # '파인애플'의 중간은 일치하지 않음
+
+    def test_short_or_punctuation_queries_fall_back_to_regex(self):
+        for title, expected in (("c++", ["C++ 표준 위원회"]), ("u.s.", ["U.S. 경제 전망"]), ("++", ["C++ 표준 위원회"])):
+            query, found = self._search(title)
+            self.assertIn(DB_FIELD_HEADING, query)
+            self.assertEqual(found, expected)
+
+    def test_regex_mode_is_escaped_substring(self):
+        query, found = self._search("애플", mode='regex')
+        self.assertEqual(query[DB_FIELD_HEADING]["$regex"], "애플")
+        self.assertEqual(found, ["애플워치 판매 급증", "파인애플 가격"])
+        self.assertEqual(self._search("c+", mode='regex')[1], ["C++ 표준 위원회"])
+
+
+class BuildTitleIndexTests(unittest.TestCase):
+
+    def test_backfill_marks_flag_and_bumps_version_once(self):
+        with patch_mongodb_client(title_index) as client:
+            db = client[DB_NAME]
+            db[RECORD_NOUNS_COLLECTION].insert_many([{DB_FIELD_HEADING: heading} for heading in HEADINGS])
+            self.assertEqual(build_title_index(), len(HEADINGS))
+            self.assertEqual(build_title_index(), 0)  # 이미 토큰이 있는 문서는 건너뜀
+
+        records = db[RECORD_NOUNS_COLLECTION].documents
+        self.assertEqual(records[0][DB_FIELD_HEADING_TOKENS], ["apple", "watch", "출시"])
+        self.assertTrue(db[META_COLLECTION].find_one({"_id": META_DOC_TITLE_INDEX})[META_FIELD_BACKFILLED])
+        # 'regex' -> 'token' 전환은 처음 한 번만 캐시를 무효화
+        self.assertEqual(db[META_COLLECTION].find_one({"_id": META_DOC_DATA_VERSION})[META_FIELD_VERSION], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# data_processor/tests/test_transport.py
+
+import json
+import unittest
+import zlib
+from unittest import mock
+from data_processor import transport
+from data_processor.transport import (
+    FRAME_HEADER, FRAME_MAGIC, CODEC_JSON, COMPRESSION_NONE, COMPRESSION_ZLIB,
+    MESSAGE_COUNTERS, MESSAGE_PROGRESS, MESSAGE_RESULT, TransportError,
+    encode_frame, encode_counters, decode_frame, decode_frames, iter_frames, counters_from_body
+)
+from data_processor.constants import TRANSPORT_VERSION
+
+
+def _raw_frame(payload: bytes, compression: int = COMPRESSION_NONE, version: int = TRANSPORT_VERSION,
+               magic: bytes = FRAME_MAGIC, message_type: int = MESSAGE_RESULT) -> bytes:
+    flags = CODEC_JSON | (compression << 2)
+    return FRAME_HEADER.pack(magic, version, flags, message_type, len(payload)) + payload
+
+
+class FrameRoundTripTests(unittest.TestCase):
+
+    def test_json_and_zlib_round_trip(self):
+        body = {"status": "SUCCESS", "message": "완료", "records_inserted": 3}
+        for compression in (COMPRESSION_NONE, COMPRESSION_ZLIB):
+            frame, offset = decode_frame(encode_frame(MESSAGE_RESULT, body, CODEC_JSON, compression))
+            self.assertEqual(frame.message_type, MESSAGE_RESULT)
+            self.assertEqual(frame.body, body)
+
+    def test_counters_round_trip_is_compressed(self):
+        counts = {f"명사{i}": i for i in range(500)}
+        data = encode_counters(counts, worker="w1")
+        flags = FRAME_HEADER.unpack_from(data)[2]
+        self.assertNotEqual((flags >> 2) & 0b11, COMPRESSION_NONE)
+        (frame,) = decode_frames(data)
+        self.assertEqual(frame.body["worker"], "w1")
+        self.assertEqual(counters_from_body(frame.body), counts)
+
+    def test_iter_frames_reassembles_split_chunks(self):
+        data = (encode_frame(MESSAGE_PROGRESS, {"processed": 1}, CODEC_JSON)
+                + encode_frame(MESSAGE_RESULT, {"status": "SUCCESS"}, CODEC_JSON))
+        chunks = [data[i:i + 3] for i in range(0, len(data), 3)]
+        frames = list(iter_frames(chunks))
+        self.assertEqual([frame.message_type for frame in frames], [MESSAGE_PROGRESS, MESSAGE_RESULT])
+
+
+class MalformedFrameTests(unittest.TestCase):
+
+    def test_truncated_stream_raises(self):
+        data = encode_frame(MESSAGE_RESULT, {"status": "SUCCESS"}, CODEC_JSON)
+        self.assertEqual(decode_frame(data[:-1]), (None, 0))
+        with self.assertRaises(TransportError):
+            decode_frames(data[:-1])
+
+    def test_version_mismatch_and_bad_magic(self):
+        payload = b'{}'
+        with self.assertRaises(TransportError):
+            decode_frame(_raw_frame(payload, version=TRANSPORT_VERSION + 1))
+        with self.assertRaises(TransportError):
+            decode_frame(_raw_frame(payload, magic=b'XXX'))
+
+    def test_oversized_frame_is_rejected_from_header(self):
+        header_only = FRAME_HEADER.pack(FRAME_MAGIC, TRANSPORT_VERSION, 0, MESSAGE_RESULT, 1024)
+        with mock.patch.object(transport, 'TRANSPORT_MAX_FRAME_BYTES', 100):
+            with self.assertRaises(TransportError):
+                decode_frame(header_only)
+
+    def test_decompression_is_bounded(self):
+        payload = zlib.compress(json.dumps({"pad": "x" * 10000}).encode('utf-8'))
+        with mock.patch.object(transport, 'TRANSPORT_MAX_DECODED_BYTES', 1000):
+            with self.assertRaises(TransportError):
+                decode_frame(_raw_frame(payload, COMPRESSION_ZLIB))
+
+    def test_codec_errors_become_transport_errors(self):
+        corrupt_zlib = _raw_frame(b'not zlib at all', COMPRESSION_ZLIB)
+        truncated_zlib = _raw_frame(zlib.compress(b'{"status": "SUCCESS"}')[:-4], COMPRESSION_ZLIB)
+        bad_json = _raw_frame(b'{"status": ')
+        bad_utf8 = _raw_frame(b'\xff\xfe')
+        for data in (corrupt_zlib, truncated_zlib, bad_json, bad_utf8):
+            with self.assertRaises(TransportError):
+                decode_frame(data)
+
+    def test_non_dict_body_is_rejected(self):
+        with self.assertRaises(TransportError):
+            decode_frame(_raw_frame(b'[1, 2, 3]'))
+
+    def test_counters_shape_is_checked(self):
+        with self.assertRaises(TransportError):
+            counters_from_body({"words": ["a", "b"], "counts": [1]})
+        with self.assertRaises(TransportError):
+            counters_from_body({"words": "ab", "counts": [1, 2]})
+
+    def test_counters_frame_type(self):
+        (frame,) = decode_frames(encode_counters({"a": 1}))
+        self.assertEqual(frame.message_type, MESSAGE_COUNTERS)
+
+
+class WorkerFrameStreamTests(unittest.TestCase):
+
+    def test_counters_are_summarized_as_running_totals(self):
+        from data_processor.master_connector import _read_worker_frames
+        stream = (encode_counters({"경제": 3, "정치": 2}) + encode_counters({"경제": 1})
+                  + encode_frame(MESSAGE_RESULT, {"status": "SUCCESS", "records_inserted": 7}, CODEC_JSON))
+        response = mock.Mock()
+        response.iter_content.return_value = [stream[i:i + 10] for i in range(0, len(stream), 10)]
+        response_data = {"worker": "w1", "status": "INITIATED"}
+
+        _read_worker_frames(response, response_data)
+        self.assertEqual(response_data["status"], "SUCCESS")
+        self.assertEqual(response_data["records_inserted"], 7)
+        self.assertEqual(response_data["counted_entries"], 3)
+        self.assertEqual(response_data["counted_total"], 6)
+
+    def test_stream_without_result_is_an_error(self):
+        from data_processor.master_connector import _read_worker_frames
+        response = mock.Mock()
+        response.iter_content.return_value = [encode_counters({"경제": 1})]
+        response_data = {"worker": "w1", "status": "INITIATED"}
+        _read_worker_frames(response, response_data)
+        self.assertEqual(response_data["status"], "HTTP_ERROR")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+# data_processor/tests/test_trends.py
+
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+from data_processor import trends, title_index
+from data_processor.admission import AdmissionRejected
+from data_processor.trends import (
+    GRANULARITY_MONTH, GRANULARITY_WEEK, build_period_counts, get_noun_trends, get_rising_nouns
+)
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, NOUN_PERIOD_COLLECTION, NOUN_PERIOD_SOURCE_COLLECTION, DB_FIELD_DATE,
+    PERIOD_FIELD_GRANULARITY, PERIOD_FIELD_PERIOD, PERIOD_FIELD_TAG, PERIOD_FIELD_WORD, PERIOD_FIELD_COUNT,
+    TREND_RISING_MAX_LIMIT
+)
+from data_processor.tests.fakes import patch_mongodb_client
+
+
+def _fingerprint(month, records, nouns=10):
+    return {"_id": month, "records": records, "nouns": nouns, "noun_chars": nouns * 3, "tag_chars": records * 5}
+
+
+def _period_row(granularity, period, word="경제", count=1):
+    return {PERIOD_FIELD_GRANULARITY: granularity, PERIOD_FIELD_PERIOD: period, PERIOD_FIELD_TAG: "__all__",
+            PERIOD_FIELD_WORD: word, PERIOD_FIELD_COUNT: count}
+
+
+class BuildPeriodCountsTests(unittest.TestCase):
+
+    def _seed(self, client):
+        db = client[DB_NAME]
+        db[NOUN_PERIOD_SOURCE_COLLECTION].insert_many([_fingerprint("2024-01", 5), _fingerprint("2024-03", 7)])
+        db[NOUN_PERIOD_COLLECTION].insert_many([
+            _period_row(GRANULARITY_MONTH, "2024-01"),
+            _period_row(GRANULARITY_WEEK, "2024-W02"),
+            _period_row(GRANULARITY_MONTH, "2024-03"),
+            _period_row(GRANULARITY_WEEK, "2024-W09"),
+            _period_row(GRANULARITY_WEEK, "2024-W13"),
+        ])
+        return db
+
+    def test_only_changed_months_and_their_weeks_are_recounted(self):
+        with patch_mongodb_client(trends) as client:
+            db = self._seed(client)
+            source = db[RECORD_NOUNS_COLLECTION]
+            source.aggregate_results = [[_fingerprint("2024-01", 5), _fingerprint("2024-03", 8)], []]
+
+            build_period_counts()
+
+        remaining = {(row[PERIOD_FIELD_GRANULARITY], row[PERIOD_FIELD_PERIOD])
+                     for row in db[NOUN_PERIOD_COLLECTION].documents}
+        self.assertEqual(remaining, {(GRANULARITY_MONTH, "2024-01"), (GRANULARITY_WEEK, "2024-W02")})
+
+        recount = source.pipelines[1]
+        self.assertIn("$merge", recount[-1])
+        date_clauses = recount[0]["$match"]["$or"]
+        # 2024-03의 주차는 2024-02-26(월) ~ 2024-03-31(일)을 덮음
+        self.assertIn({DB_FIELD_DATE: {"$gte": "2024-02-26", "$lt": "2024-04-01"}}, date_clauses)
+        period_filter = next(stage["$match"] for stage in recount if "$match" in stage and "$or" in stage["$match"]
+                             and "period.g" in stage["$match"]["$or"][0])
+        self.assertEqual(period_filter["$or"][0]["period.p"], {"$in": ["2024-03"]})
+        self.assertEqual(period_filter["$or"][1]["period.p"]["$in"][0], "2024-W09")
+        self.assertEqual(period_filter["$or"][1]["period.p"]["$in"][-1], "2024-W13")
+
+        fingerprints = {doc["_id"]: doc["records"] for doc in db[NOUN_PERIOD_SOURCE_COLLECTION].documents}
+        self.assertEqual(fingerprints, {"2024-01": 5, "2024-03": 8})
+
+    def test_unchanged_source_does_no_recount(self):
+        with patch_mongodb_client(trends) as client:
+            db = self._seed(client)
+            source = db[RECORD_NOUNS_COLLECTION]
+            source.aggregate_results = [[_fingerprint("2024-01", 5), _fingerprint("2024-03", 7)]]
+
+            self.assertEqual(build_period_counts(), 5)
+        self.assertEqual(len(source.pipelines), 1)
+
+    def test_removed_month_is_deleted_with_its_fingerprint(self):
+        with patch_mongodb_client(trends) as client:
+            db = self._seed(client)
+            db[RECORD_NOUNS_COLLECTION].aggregate_results = [[_fingerprint("2024-01", 5)], []]
+
+            build_period_counts()
+
+        self.assertNotIn("2024-03", {doc["_id"] for doc in db[NOUN_PERIOD_SOURCE_COLLECTION].documents})
+        self.assertNotIn("2024-03", {row[PERIOD_FIELD_PERIOD] for row in db[NOUN_PERIOD_COLLECTION].documents})
+
+    def test_full_rebuild_when_forced_missing_or_unparseable(self):
+        for full, seed, new_month in ((True, True, "2024-03"), (False, False, "2024-03"), (False, True, "2024-3x")):
+            with self.subTest(full=full, seed=seed, new_month=new_month), patch_mongodb_client(trends) as client:
+                db = self._seed(client) if seed else client[DB_NAME]
+                source = db[RECORD_NOUNS_COLLECTION]
+                source.aggregate_results = [[_fingerprint("2024-01", 5), _fingerprint(new_month, 9)], []]
+
+                build_period_counts(full=full)
+
+                self.assertIn("$out", source.pipelines[1][-1])
+                self.assertEqual({doc["_id"] for doc in db[NOUN_PERIOD_SOURCE_COLLECTION].documents},
+                                 {"2024-01", new_month})
+
+
+class NounTrendsTests(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(title_index, 'is_title_index_backfilled', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_title_trends_skip_undated_records_under_admission(self):
+        admitted = []
+
+        @contextmanager
+        def fake_admit():
+            admitted.append(True)
+            yield
+
+        with patch_mongodb_client(trends) as client, mock.patch.object(trends, 'admit', fake_admit):
+            source = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            source.aggregate_results = [[{"_id": {"p": "2024-01", "w": "경제"}, "count": 3}]]
+
+            result = get_noun_trends(["경제", "정치"], title="budget news", start_period="2024-01")
+
+        self.assertEqual(admitted, [True])
+        self.assertEqual(result["periods"], ["2024-01"])
+        self.assertEqual(result["series"], {"경제": [3], "정치": [0]})
+        pipeline = source.pipelines[0]
+        self.assertEqual(pipeline[0]["$match"][DB_FIELD_DATE], {"$exists": True, "$ne": None})
+        self.assertEqual(pipeline[2]["$match"]["period"], {"$nin": [None, ""], "$gte": "2024-01"})
+
+    def test_title_trends_rejection_propagates_and_closes_client(self):
+        @contextmanager
+        def rejecting_admit():
+            raise AdmissionRejected("혼잡", retry_after=7)
+            yield
+
+        with patch_mongodb_client(trends) as client, mock.patch.object(trends, 'admit', rejecting_admit):
+            with self.assertRaises(AdmissionRejected):
+                get_noun_trends(["경제"], title="budget")
+        self.assertEqual(client.close_calls, 1)
+        self.assertEqual(client[DB_NAME][RECORD_NOUNS_COLLECTION].pipelines, [])
+
+    def test_precomputed_trends_do_not_need_admission(self):
+        with patch_mongodb_client(trends) as client, \
+                mock.patch.object(trends, 'admit', side_effect=AssertionError("admit 호출")):
+            client[DB_NAME][NOUN_PERIOD_COLLECTION].aggregate_results = [
+                [{"_id": {"p": "2024-W02", "w": "경제"}, "count": 2}]]
+            result = get_noun_trends(["경제"], granularity=GRANULARITY_WEEK)
+        self.assertEqual(result["series"], {"경제": [2]})
+
+
+class RisingNounsValidationTests(unittest.TestCase):
+
+    def test_invalid_limit_or_min_count_is_rejected_before_querying(self):
+        with mock.patch.object(trends, 'get_mongodb_client') as get_client:
+            for kwargs in ({"limit": 0}, {"limit": TREND_RISING_MAX_LIMIT + 1}, {"limit": True}, {"limit": "5"},
+                           {"min_count": -1}):
+                with self.subTest(**kwargs), self.assertRaises(ValueError):
+                    get_rising_nouns("2024-01", "2024-02", **kwargs)
+        get_client.assert_not_called()
+
+    def test_limit_caps_ranking(self):
+        rows = [{"_id": f"명사{i}", "count_a": 0, "count_b": 10 + i} for i in range(5)]
+        with patch_mongodb_client(trends) as client:
+            client[DB_NAME][NOUN_PERIOD_COLLECTION].aggregate_results = [rows]
+            rising = get_rising_nouns("2024-01", "2024-02", limit=2)
+        self.assertEqual([item["word"] for item in rising], ["명사4", "명사3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
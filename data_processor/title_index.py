@@ -0,0 +1,132 @@
+# data_processor/title_index.py
+
+import re
+import time
+from typing import Any, Dict, List, Optional
+from pymongo import UpdateOne
+from .db_connector import get_mongodb_client
+from .importer import ensure_record_indexes
+from .data_version import bump_data_version, get_meta_flag, set_meta_flag
+from .constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, META_COLLECTION, META_DOC_TITLE_INDEX, META_FIELD_BACKFILLED,
+    DB_FIELD_HEADING, DB_FIELD_HEADING_TOKENS, TITLE_SEARCH_MODE, TITLE_INDEX_BATCH_SIZE, TITLE_MIN_TOKEN_LENGTH
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def is_title_index_backfilled() -> bool:
+    """ImFiles 전체의 heading_tokens 백필이 끝났다고 기록되어 있는지 확인합니다. (DB 연결 실패 시 False)"""
+    return get_meta_flag(META_DOC_TITLE_INDEX, META_FIELD_BACKFILLED)
+
+
+def mark_title_index_backfilled(db, backfilled: bool = True) -> None:
+    """ImFiles의 heading_tokens 백필 완료 여부를 MetaDatas에 기록합니다."""
+    set_meta_flag(db, META_DOC_TITLE_INDEX, META_FIELD_BACKFILLED, backfilled)
+
+
+def title_search_mode() -> str:
+    """
+    실제로 사용할 Title 검색 방식입니다. 'token' 모드라도 백필이 끝났다고 기록되기 전에는
+    heading_tokens가 없는 문서가 검색되지 않으므로(0건 -> 전체 재생성 유발) 'regex' 모드로 처리합니다.
+    """
+    if TITLE_SEARCH_MODE == 'token' and not is_title_index_backfilled():
+        return 'regex'
+    return TITLE_SEARCH_MODE
+
+
+def tokenize_heading(heading: Optional[str]) -> List[str]:
+    """
+    기사 제목(Heading)을 소문자 단어 토큰 목록으로 분리합니다. (중복 제거, 순서 유지)
+    워커 Importer가 ImFiles 저장 시 같은 함수로 'heading_tokens' 필드를 채우면 별도 백필이 필요 없습니다.
+    """
+    if not heading:
+        return []
+    return list(dict.fromkeys(_TOKEN_PATTERN.findall(str(heading).lower())))
+
+
+def _title_query_tokens(title: str, mode: Optional[str]) -> Optional[List[str]]:
+    """
+    'token' 모드로 검색할 검색어 단어 목록을 반환합니다. 'regex' 모드로 처리해야 하면 None을 반환합니다.
+    (단어 문자가 없거나, TITLE_MIN_TOKEN_LENGTH보다 짧은 단어가 있는 경우: 'c++' -> 'c'로 줄어들지 않도록)
+    """
+    if (mode or title_search_mode()) != 'token':
+        return None
+    tokens = tokenize_heading(title)
+    if not tokens or any(len(token) < TITLE_MIN_TOKEN_LENGTH for token in tokens):
+        return None
+    return tokens
+
+
+def build_title_query(title: str, mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Title 검색 조건을 ImFiles 쿼리 조건으로 변환합니다.
+
+    - 'token' 모드 (기본): 검색어의 각 단어가 제목의 어떤 단어의 접두어이면 일치합니다.
+      ('app' -> 'Apple Watch' 일치, 'ple' -> 일치하지 않음, 'watch apple' -> 'Apple Watch' 일치)
+      대소문자를 무시하고, 'heading_tokens' 다중키 인덱스의 범위 검색으로 처리됩니다.
+    - 'regex' 모드: 기존과 같은 부분 문자열(대소문자 무시) 검색이지만 입력값을 이스케이프합니다.
+      (인덱스를 사용할 수 없어 전체 컬렉션을 검사합니다.)
+
+    검색어에 단어 문자가 하나도 없거나 TITLE_MIN_TOKEN_LENGTH보다 짧은 단어가 있으면 'regex' 모드로 처리합니다.
+    mode를 생략하면 title_search_mode()를 따릅니다. (백필 완료 전에는 'regex')
+    """
+    tokens = _title_query_tokens(title, mode)
+    if tokens:
+        return {DB_FIELD_HEADING_TOKENS: {"$all": [re.compile("^" + re.escape(token)) for token in tokens]}}
+    return {DB_FIELD_HEADING: {"$regex": re.escape(title), "$options": "i"}}
+
+
+def heading_matches(heading: Optional[str], title: str, mode: Optional[str] = None) -> bool:
+    """build_title_query와 같은 의미로 파이썬에서 제목 일치 여부를 판단합니다."""
+    if not title:
+        return True
+    query_tokens = _title_query_tokens(title, mode)
+    if query_tokens:
+        heading_tokens = tokenize_heading(heading)
+        return all(any(token.startswith(query_token) for token in heading_tokens) for query_token in query_tokens)
+    return title.lower() in (heading or "").lower()
+
+
+def build_title_index(collection_name: str = RECORD_NOUNS_COLLECTION, rebuild: bool = False,
+                      batch_size: int = TITLE_INDEX_BATCH_SIZE) -> Optional[int]:
+    """
+    ImFiles 문서에 'heading_tokens' 필드를 채우고(백필) 검색 인덱스를 생성합니다.
+    rebuild=False이면 토큰 필드가 없는 문서만 처리합니다. 갱신한 문서 수를 반환합니다.
+    ImFiles를 백필하면 완료를 기록하여 이후 Title 검색이 'token' 모드로 전환됩니다.
+    (스테이징 컬렉션은 ImFiles로 교체된 뒤 master_connector.finalize_staged_rebuild가 기록)
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    collection = client[DB_NAME][collection_name]
+    target_filter = {} if rebuild else {DB_FIELD_HEADING_TOKENS: {"$exists": False}}
+
+    updated = 0
+    operations = []
+    cursor = collection.find(target_filter, {DB_FIELD_HEADING: 1}, batch_size=batch_size)
+    with cursor:
+        for doc in cursor:
+            operations.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {DB_FIELD_HEADING_TOKENS: tokenize_heading(doc.get(DB_FIELD_HEADING))}}
+            ))
+            if len(operations) >= batch_size:
+                updated += collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+
+    ensure_record_indexes(collection)
+    if collection_name == RECORD_NOUNS_COLLECTION:
+        db = client[DB_NAME]
+        meta_doc = db[META_COLLECTION].find_one({"_id": META_DOC_TITLE_INDEX})
+        mark_title_index_backfilled(db)
+        if not (meta_doc and meta_doc.get(META_FIELD_BACKFILLED)):
+            # 'regex' -> 'token'으로 Title 검색 의미가 바뀌므로 이전 방식으로 계산된 캐시를 무효화
+            bump_data_version(db)
+    client.close()
+
+    print(f"✅ '{collection_name}' 제목 토큰 인덱스 갱신 완료: 문서 {updated}개 ({time.time() - start_time:.4f}초)")
+    return updated
@@ -0,0 +1,217 @@
+# data_processor/transport.py
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from .constants import (
+    TRANSPORT_VERSION, TRANSPORT_COMPRESS_MIN_BYTES, TRANSPORT_FORCE_JSON,
+    TRANSPORT_MAX_FRAME_BYTES, TRANSPORT_MAX_DECODED_BYTES
+)
+
+# 프레임 헤더: 매직(3) | 버전(1) | 플래그(1) | 메시지 종류(1) | 본문 길이(4, big-endian)
+FRAME_MAGIC = b'TCF'
+FRAME_HEADER = struct.Struct('>3sBBBI')
+
+# 메시지 종류
+MESSAGE_NOTIFICATION = 1  # 워커 상태 알림 (worker_name, status, message)
+MESSAGE_PROGRESS = 2  # 진행 상황 (processed, total 등)
+MESSAGE_COUNTERS = 3  # 명사 빈도 묶음 (words, counts 열 배열)
+MESSAGE_RESULT = 4  # 재생성 최종 결과 (status, message, processing_time, records_inserted)
+MESSAGE_TYPES = {MESSAGE_NOTIFICATION: 'notification', MESSAGE_PROGRESS: 'progress',
+                 MESSAGE_COUNTERS: 'counters', MESSAGE_RESULT: 'result'}
+
+# 플래그 하위 2비트: 직렬화 방식, 그다음 2비트: 압축 방식
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+
+class TransportError(ValueError):
+    """프레임 형식이 잘못되었거나 지원하지 않는 버전/코덱일 때 발생합니다."""
+
+
+class Frame(NamedTuple):
+    message_type: int
+    body: Dict[str, Any]
+
+
+def _load_msgpack():
+    try:
+        import msgpack  # 선택 의존성
+        return msgpack
+    except ImportError:
+        return None
+
+
+def _load_zstd():
+    try:
+        import zstandard  # 선택 의존성
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _default_codecs() -> Tuple[int, int]:
+    """설치된 패키지에 따라 기본 직렬화/압축 방식을 고릅니다. (msgpack > JSON, zstd > zlib)"""
+    if TRANSPORT_FORCE_JSON:
+        return CODEC_JSON, COMPRESSION_NONE
+    codec = CODEC_MSGPACK if _load_msgpack() else CODEC_JSON
+    compression = COMPRESSION_ZSTD if _load_zstd() else COMPRESSION_ZLIB
+    return codec, compression
+
+
+def encode_frame(message_type: int, body: Dict[str, Any], codec: Optional[int] = None,
+                 compression: Optional[int] = None) -> bytes:
+    """메시지 하나를 길이가 앞에 붙은 바이너리 프레임으로 만듭니다."""
+    if message_type not in MESSAGE_TYPES:
+        raise TransportError(f"알 수 없는 메시지 종류입니다: {message_type}")
+    default_codec, default_compression = _default_codecs()
+    codec = default_codec if codec is None else codec
+    compression = default_compression if compression is None else compression
+
+    if codec == CODEC_MSGPACK:
+        payload = _load_msgpack().packb(body, use_bin_type=True)
+    else:
+        payload = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    if len(payload) < TRANSPORT_COMPRESS_MIN_BYTES:
+        compression = COMPRESSION_NONE
+    if compression == COMPRESSION_ZSTD:
+        payload = _load_zstd().ZstdCompressor().compress(payload)
+    elif compression == COMPRESSION_ZLIB:
+        payload = zlib.compress(payload)
+
+    flags = codec | (compression << 2)
+    return FRAME_HEADER.pack(FRAME_MAGIC, TRANSPORT_VERSION, flags, message_type, len(payload)) + payload
+
+
+def _decompress_zlib(payload: bytes) -> bytes:
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(payload, TRANSPORT_MAX_DECODED_BYTES + 1)
+    if len(data) > TRANSPORT_MAX_DECODED_BYTES or decompressor.unconsumed_tail:
+        raise TransportError(f"압축을 푼 프레임 본문이 최대 크기({TRANSPORT_MAX_DECODED_BYTES}바이트)를 넘습니다.")
+    if not decompressor.eof:
+        raise TransportError("zlib 압축 본문이 중간에서 끝났습니다.")
+    return data
+
+
+def _decompress_zstd(zstandard, payload: bytes) -> bytes:
+    chunks, size = [], 0
+    with zstandard.ZstdDecompressor().stream_reader(payload) as reader:
+        while True:
+            chunk = reader.read(64 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > TRANSPORT_MAX_DECODED_BYTES:
+                raise TransportError(f"압축을 푼 프레임 본문이 최대 크기({TRANSPORT_MAX_DECODED_BYTES}바이트)를 넘습니다.")
+            chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _decode_payload(flags: int, payload: bytes) -> Dict[str, Any]:
+    """
+    프레임 본문의 압축을 풀고 역직렬화합니다. 압축을 푼 크기는 TRANSPORT_MAX_DECODED_BYTES로 제한하며,
+    코덱 라이브러리(zlib, zstandard, msgpack, json)의 오류는 모두 TransportError로 바꿉니다.
+    """
+    codec, compression = flags & 0b11, (flags >> 2) & 0b11
+
+    try:
+        if compression == COMPRESSION_ZSTD:
+            zstandard = _load_zstd()
+            if zstandard is None:
+                raise TransportError("zstd로 압축된 프레임이지만 zstandard 패키지가 설치되어 있지 않습니다.")
+            payload = _decompress_zstd(zstandard, payload)
+        elif compression == COMPRESSION_ZLIB:
+            payload = _decompress_zlib(payload)
+        elif compression != COMPRESSION_NONE:
+            raise TransportError(f"지원하지 않는 압축 방식입니다: {compression}")
+
+        if codec == CODEC_MSGPACK:
+            msgpack = _load_msgpack()
+            if msgpack is None:
+                raise TransportError("msgpack 프레임이지만 msgpack 패키지가 설치되어 있지 않습니다.")
+            body = msgpack.unpackb(payload, raw=False)
+        elif codec == CODEC_JSON:
+            body = json.loads(payload.decode('utf-8'))
+        else:
+            raise TransportError(f"지원하지 않는 직렬화 방식입니다: {codec}")
+    except TransportError:
+        raise
+    except Exception as e:  # zlib.error, zstandard.ZstdError, msgpack의 각종 예외, UnicodeDecodeError 등
+        raise TransportError(f"프레임 본문을 해석할 수 없습니다: {e}") from e
+
+    if not isinstance(body, dict):
+        raise TransportError(f"프레임 본문이 객체(dict)가 아닙니다: {type(body).__name__}")
+    return body
+
+
+def decode_frame(buffer: bytes, offset: int = 0) -> Tuple[Optional[Frame], int]:
+    """
+    buffer의 offset 위치에서 프레임 하나를 읽어 (Frame, 다음 offset)을 반환합니다.
+    아직 프레임 전체가 도착하지 않았으면 (None, offset)을 반환합니다.
+    """
+    if len(buffer) - offset < FRAME_HEADER.size:
+        return None, offset
+    magic, version, flags, message_type, length = FRAME_HEADER.unpack_from(buffer, offset)
+    if magic != FRAME_MAGIC:
+        raise TransportError("프레임 시작 표시(magic)가 올바르지 않습니다.")
+    if version != TRANSPORT_VERSION:
+        raise TransportError(f"지원하지 않는 프레임 버전입니다: {version} (지원: {TRANSPORT_VERSION})")
+    if length > TRANSPORT_MAX_FRAME_BYTES:
+        # 본문이 도착할 때까지 버퍼에 쌓지 않고 헤더만 보고 바로 거절
+        raise TransportError(f"프레임 본문이 최대 크기({TRANSPORT_MAX_FRAME_BYTES}바이트)를 넘습니다: {length}바이트")
+
+    start = offset + FRAME_HEADER.size
+    if len(buffer) - start < length:
+        return None, offset
+    body = _decode_payload(flags, bytes(buffer[start:start + length]))
+    return Frame(message_type, body), start + length
+
+
+def iter_frames(chunks: Iterable[bytes]) -> Iterator[Frame]:
+    """
+    바이트 조각(HTTP 스트리밍 응답의 iter_content 등)을 받아 완성되는 대로 프레임을 반환합니다.
+    스트림이 프레임 중간에서 끝나면 TransportError가 발생합니다.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer.extend(chunk)
+        offset = 0
+        while True:
+            frame, offset = decode_frame(buffer, offset)
+            if frame is None:
+                break
+            yield frame
+        del buffer[:offset]
+    if buffer:
+        raise TransportError(f"스트림이 프레임 중간에서 끝났습니다. (남은 {len(buffer)}바이트)")
+
+
+def decode_frames(data: bytes) -> List[Frame]:
+    """완전한 본문(요청 body 등)에 들어 있는 모든 프레임을 읽습니다."""
+    return list(iter_frames([data]))
+
+
+def encode_counters(counts: Dict[str, int], **meta: Any) -> bytes:
+    """명사 빈도를 열 배열(words, counts) 형태의 COUNTERS 프레임으로 만듭니다. (키 반복을 줄여 압축 효율을 높임)"""
+    words = list(counts)
+    return encode_frame(MESSAGE_COUNTERS, {**meta, "words": words, "counts": [counts[word] for word in words]})
+
+
+def counters_from_body(body: Dict[str, Any]) -> Dict[str, int]:
+    """COUNTERS 프레임 본문을 {명사: 빈도} 딕셔너리로 되돌립니다."""
+    words, counts = body.get("words", []), body.get("counts", [])
+    if not isinstance(words, list) or not isinstance(counts, list):
+        raise TransportError("COUNTERS 프레임의 words와 counts는 배열이어야 합니다.")
+    if len(words) != len(counts):
+        raise TransportError("COUNTERS 프레임의 words와 counts 길이가 다릅니다.")
+    return dict(zip(words, counts))
+
+
+def frame_to_json(frame: Frame) -> Dict[str, Any]:
+    """디버깅용: 프레임을 사람이 읽을 수 있는 JSON 딕셔너리로 변환합니다."""
+    return {"type": MESSAGE_TYPES.get(frame.message_type, frame.message_type), **frame.body}
@@ -0,0 +1,350 @@
+# data_processor/trends.py
+
+import math
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from .db_connector import get_mongodb_client
+from .sketches import ALL_TAGS_KEY, record_day_expression, record_tags_expression
+from .title_index import build_title_query
+from .admission import admit
+from .constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, NOUN_PERIOD_COLLECTION, NOUN_PERIOD_SOURCE_COLLECTION, DB_FIELD_DATE, DB_FIELD_NOUNS, DB_FIELD_TAGS,
+    PERIOD_FIELD_GRANULARITY, PERIOD_FIELD_PERIOD, PERIOD_FIELD_TAG, PERIOD_FIELD_WORD, PERIOD_FIELD_COUNT,
+    TREND_RISING_MAX_LIMIT
+)
+
+GRANULARITY_MONTH = 'month'  # 'YYYY-MM'
+GRANULARITY_WEEK = 'week'  # ISO 주차 'YYYY-Www'
+TREND_GRANULARITIES = (GRANULARITY_MONTH, GRANULARITY_WEEK)
+
+
+def _period_expressions() -> Dict[str, Any]:
+    """레코드의 Date에서 월('YYYY-MM')과 ISO 주차('YYYY-Www') 키를 만드는 집계 식입니다."""
+    day_string = record_day_expression()
+    parsed_day = {"$dateFromString": {"dateString": day_string, "format": "%Y-%m-%d", "onError": None}}
+    return {
+        GRANULARITY_MONTH: {"$substrCP": [day_string, 0, 7]},
+        GRANULARITY_WEEK: {"$cond": [{"$eq": [parsed_day, None]}, None,
+                                     {"$dateToString": {"format": "%G-W%V", "date": parsed_day}}]},
+    }
+
+
+def _period_count_stages(period_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Date가 있는 레코드를 (기간, 태그, 명사)별 빈도 문서로 펼쳐 집계하는 공통 단계입니다."""
+    periods = _period_expressions()
+    return [
+        {"$project": {
+            "_id": 0,
+            DB_FIELD_NOUNS: 1,
+            "tag": record_tags_expression(),
+            "period": [{"g": granularity, "p": expression} for granularity, expression in periods.items()],
+        }},
+        {"$unwind": "$period"},
+        {"$match": period_filter or {"period.p": {"$ne": None}}},
+        {"$unwind": "$tag"},
+        {"$unwind": f"${DB_FIELD_NOUNS}"},
+        {"$group": {"_id": {"g": "$period.g", "p": "$period.p", "t": "$tag", "w": f"${DB_FIELD_NOUNS}"},
+                    PERIOD_FIELD_COUNT: {"$sum": 1}}},
+        {"$project": {
+            "_id": 0,
+            PERIOD_FIELD_GRANULARITY: "$_id.g",
+            PERIOD_FIELD_PERIOD: "$_id.p",
+            PERIOD_FIELD_TAG: "$_id.t",
+            PERIOD_FIELD_WORD: "$_id.w",
+            PERIOD_FIELD_COUNT: 1,
+        }},
+    ]
+
+
+def _month_fingerprints(db, source_collection: str) -> Dict[str, Dict[str, int]]:
+    """
+    ImFiles의 월별 지문(레코드 수, 명사 수, 명사/태그 글자 수 합)을 계산합니다. 명사를 펼치지 않으므로
+    기간별 빈도 집계보다 훨씬 가볍고, 지문이 바뀐 월만 다시 집계하는 기준이 됩니다.
+    (글자 수까지 같은 채로 명사만 바뀐 경우는 감지하지 못하므로, 필요하면 full=True로 전체 재계산)
+    """
+    nouns = {"$cond": [{"$isArray": f"${DB_FIELD_NOUNS}"}, f"${DB_FIELD_NOUNS}", []]}
+    rows = db[source_collection].aggregate([
+        {"$match": {DB_FIELD_DATE: {"$exists": True, "$ne": None}}},
+        {"$group": {
+            "_id": _period_expressions()[GRANULARITY_MONTH],
+            "records": {"$sum": 1},
+            "nouns": {"$sum": {"$size": nouns}},
+            "noun_chars": {"$sum": {"$sum": {"$map": {"input": nouns, "in": {"$strLenCP": "$$this"}}}}},
+            "tag_chars": {"$sum": {"$sum": {"$map": {"input": record_tags_expression(),
+                                                     "in": {"$strLenCP": "$$this"}}}}},
+        }},
+    ], allowDiskUse=True)
+    return {row["_id"]: {field: row[field] for field in ("records", "nouns", "noun_chars", "tag_chars")}
+            for row in rows}
+
+
+def _month_days(month: str) -> Optional[Tuple[date, date]]:
+    """'YYYY-MM' 월의 첫날과 다음 달 첫날을 반환합니다. (형식이 아니면 None)"""
+    try:
+        first_day = datetime.strptime(month, "%Y-%m").date()
+    except (TypeError, ValueError):
+        return None
+    next_month = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first_day, next_month
+
+
+def _weeks_and_day_range(month: str) -> Tuple[List[str], date, date]:
+    """월에 걸친 ISO 주차 키 목록과, 그 주들을 모두 덮는 날짜 범위 [월요일, 다음 주 월요일)을 반환합니다."""
+    first_day, next_month = _month_days(month)
+    weeks = []
+    day = first_day
+    while day < next_month:
+        iso_year, iso_week, _ = day.isocalendar()
+        weeks.append(f"{iso_year}-W{iso_week:02d}")
+        day += timedelta(days=1)
+    range_start = first_day - timedelta(days=first_day.weekday())
+    last_day = next_month - timedelta(days=1)
+    range_end = last_day + timedelta(days=7 - last_day.weekday())
+    return list(dict.fromkeys(weeks)), range_start, range_end
+
+
+def _date_range_clauses(range_start: date, range_end: date) -> List[Dict[str, Any]]:
+    """문자열/날짜 타입 Date 모두에 대해 Date 인덱스를 사용할 수 있는 범위 조건입니다."""
+    start_time = datetime(range_start.year, range_start.month, range_start.day)
+    end_time = datetime(range_end.year, range_end.month, range_end.day)
+    return [{DB_FIELD_DATE: {"$gte": range_start.isoformat(), "$lt": range_end.isoformat()}},
+            {DB_FIELD_DATE: {"$gte": start_time, "$lt": end_time}}]
+
+
+def _rebuild_all_period_counts(db, source_collection: str, target_collection: str) -> int:
+    """전체 재계산: 원본 전체를 집계($out)한 뒤 target_collection으로 원자적 교체합니다."""
+    building_name = f"{target_collection}_building"
+    db[building_name].drop()
+    db[source_collection].aggregate(
+        [{"$match": {DB_FIELD_DATE: {"$exists": True, "$ne": None}}}]
+        + _period_count_stages()
+        + [{"$out": building_name}],
+        allowDiskUse=True
+    )
+
+    building = db[building_name]
+    document_count = building.estimated_document_count()
+    if document_count:
+        # 명사별 시계열 조회 / 기간별 상승 명사 조회용 인덱스
+        building.create_index([(PERIOD_FIELD_GRANULARITY, 1), (PERIOD_FIELD_TAG, 1),
+                               (PERIOD_FIELD_WORD, 1), (PERIOD_FIELD_PERIOD, 1)])
+        building.create_index([(PERIOD_FIELD_GRANULARITY, 1), (PERIOD_FIELD_TAG, 1), (PERIOD_FIELD_PERIOD, 1)])
+        building.rename(target_collection, dropTarget=True)
+    else:
+        building.drop()
+        db[target_collection].drop()
+    return document_count
+
+
+def _update_changed_periods(db, source_collection: str, target_collection: str, months: List[str]) -> None:
+    """
+    증분 갱신: 바뀐 월과 그 월에 걸친 ISO 주차의 빈도 문서만 지우고, 해당 기간의 레코드만 다시 집계하여
+    $merge로 넣습니다. (주차는 이웃 월의 날짜도 포함하므로 주 전체를 덮는 날짜 범위의 레코드를 읽음)
+    """
+    weeks: List[str] = []
+    date_clauses: List[Dict[str, Any]] = []
+    for month in months:
+        month_weeks, range_start, range_end = _weeks_and_day_range(month)
+        weeks.extend(month_weeks)
+        date_clauses.extend(_date_range_clauses(range_start, range_end))
+    weeks = list(dict.fromkeys(weeks))
+
+    period_query = {"$or": [
+        {PERIOD_FIELD_GRANULARITY: GRANULARITY_MONTH, PERIOD_FIELD_PERIOD: {"$in": months}},
+        {PERIOD_FIELD_GRANULARITY: GRANULARITY_WEEK, PERIOD_FIELD_PERIOD: {"$in": weeks}},
+    ]}
+    db[target_collection].delete_many(period_query)
+    db[source_collection].aggregate(
+        [{"$match": {DB_FIELD_DATE: {"$exists": True, "$ne": None}, "$or": date_clauses}}]
+        + _period_count_stages({"$or": [
+            {"period.g": GRANULARITY_MONTH, "period.p": {"$in": months}},
+            {"period.g": GRANULARITY_WEEK, "period.p": {"$in": weeks}},
+        ]})
+        + [{"$merge": {"into": target_collection, "whenMatched": "replace", "whenNotMatched": "insert"}}],
+        allowDiskUse=True
+    )
+
+
+def build_period_counts(source_collection: str = RECORD_NOUNS_COLLECTION,
+                        target_collection: str = NOUN_PERIOD_COLLECTION,
+                        source_fingerprint_collection: str = NOUN_PERIOD_SOURCE_COLLECTION,
+                        full: bool = False) -> Optional[int]:
+    """
+    ImFiles의 (월/주, 태그, 명사)별 빈도를 MongoDB 서버에서 집계하여 기간별 빈도 컬렉션을 갱신합니다.
+    분산 재생성(Import)이 끝날 때마다 호출되며, 기간별 빈도 문서 수를 반환합니다. (DB 연결 실패 시 None)
+
+    - 증분 갱신 (기본): ImFiles의 월별 지문(_month_fingerprints)을 지난 집계 때 저장한 지문과 비교하여,
+      바뀌거나 사라진 월과 그 월에 걸친 주차만 다시 집계합니다. (재생성으로 ImFiles 전체가 교체되어도
+      내용이 같은 월은 건너뜀) 갱신 중에는 해당 기간의 빈도가 잠시 비어 보일 수 있습니다.
+    - 전체 재계산: full=True이거나, 기간별 빈도/지문이 아직 없거나, 형식이 아닌 월 키가 바뀐 경우
+      원본 전체를 한 번 집계($out)하여 원자적으로 교체합니다. 레코드당 (명사 수 x 2[월/주] x (태그 수 + 1))개로
+      펼쳐지며 allowDiskUse로 디스크를 사용합니다.
+    재생성 완료를 늦추지 않도록 ImFiles 교체 후 백그라운드에서 실행됩니다. (master_connector.start_derived_collection_build)
+    """
+    client = get_mongodb_client()
+    if not client: return None
+
+    start_time = time.time()
+    db = client[DB_NAME]
+    fingerprint_collection = db[source_fingerprint_collection]
+    fingerprints = _month_fingerprints(db, source_collection)
+    previous = {doc.pop("_id"): doc for doc in fingerprint_collection.find({})}
+    changed_months = sorted(month for month in set(fingerprints) | set(previous)
+                            if fingerprints.get(month) != previous.get(month))
+
+    existing = db.list_collection_names()
+    if not full and (target_collection not in existing or not previous):
+        print("ℹ️ 기간별 빈도 또는 월별 지문이 없어 전체를 집계합니다.")
+        full = True
+    if not full and any(_month_days(month) is None for month in changed_months):
+        print("ℹ️ 형식이 아닌 날짜의 레코드가 바뀌어 전체를 집계합니다.")
+        full = True
+
+    if full:
+        _rebuild_all_period_counts(db, source_collection, target_collection)
+        fingerprint_collection.delete_many({})
+        if fingerprints:
+            fingerprint_collection.insert_many([{"_id": month, **fingerprint}
+                                                for month, fingerprint in fingerprints.items()])
+    elif changed_months:
+        _update_changed_periods(db, source_collection, target_collection, changed_months)
+        for month in changed_months:
+            if month in fingerprints:
+                fingerprint_collection.replace_one({"_id": month}, {"_id": month, **fingerprints[month]}, upsert=True)
+            else:
+                fingerprint_collection.delete_one({"_id": month})
+
+    document_count = db[target_collection].estimated_document_count() \
+        if target_collection in db.list_collection_names() else 0
+    client.close()
+
+    mode = "전체 재계산" if full else f"증분 갱신, 바뀐 월 {len(changed_months)}개"
+    print(f"✅ 기간별 명사 빈도 {document_count}건 ({mode}, {time.time() - start_time:.4f}초)")
+    return document_count
+
+
+def _period_range_query(start_period: str, end_period: str) -> Dict[str, Any]:
+    period_range: Dict[str, str] = {}
+    if start_period: period_range["$gte"] = start_period
+    if end_period: period_range["$lte"] = end_period
+    return period_range
+
+
+def _validate_trend_query(granularity: str, tags: Optional[List[str]], title: str = "") -> None:
+    if granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"지원하지 않는 기간 단위입니다: {granularity} (가능: {', '.join(TREND_GRANULARITIES)})")
+    if not title and len(tags or []) > 1:
+        raise ValueError("기간별 빈도 조회는 태그를 하나만 지정할 수 있습니다. (여러 태그를 가진 기사가 중복 집계되므로)")
+
+
+def _period_word_counts(rows) -> Dict[str, Dict[str, int]]:
+    counts: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        counts.setdefault(row["_id"]["p"], {})[row["_id"]["w"]] = row["count"]
+    return counts
+
+
+def get_noun_trends(nouns: List[str], granularity: str = GRANULARITY_MONTH, tags: Optional[List[str]] = None,
+                    title: str = "", start_period: str = "", end_period: str = "") -> Optional[Dict[str, Any]]:
+    """
+    명사별 기간(월/주) 빈도 시계열을 반환합니다. {"periods": [...], "series": {noun: [count, ...]}}
+
+    - Title 조건이 없으면 미리 집계된 기간별 빈도 컬렉션에서 바로 조회합니다.
+      이 경우 태그는 하나까지만 지정할 수 있습니다. (태그별 빈도를 합산하면 여러 태그를 가진 기사가 중복 집계됨)
+    - Title 조건이 있으면 제목 토큰 인덱스로 좁힌 ImFiles에서 해당 명사만 집계합니다. (여러 태그 가능)
+      이 집계는 admit() 슬롯 안에서 실행되며, 슬롯을 얻지 못하면 AdmissionRejected가 발생합니다.
+    """
+    _validate_trend_query(granularity, tags, title)
+
+    client = get_mongodb_client()
+    if not client: return None
+    db = client[DB_NAME]
+    period_range = _period_range_query(start_period, end_period)
+
+    try:
+        if not title:
+            query: Dict[str, Any] = {
+                PERIOD_FIELD_GRANULARITY: granularity,
+                PERIOD_FIELD_TAG: (tags or [ALL_TAGS_KEY])[0],
+                PERIOD_FIELD_WORD: {"$in": nouns},
+            }
+            if period_range: query[PERIOD_FIELD_PERIOD] = period_range
+            counts = _period_word_counts(db[NOUN_PERIOD_COLLECTION].aggregate([
+                {"$match": query},
+                {"$group": {"_id": {"p": f"${PERIOD_FIELD_PERIOD}", "w": f"${PERIOD_FIELD_WORD}"},
+                            "count": {"$sum": f"${PERIOD_FIELD_COUNT}"}}},
+            ]))
+        else:
+            # Date가 없는 레코드는 기간을 만들 수 없으므로 제외 (기간별 빈도 컬렉션과 같은 기준)
+            record_query: Dict[str, Any] = build_title_query(title)
+            record_query[DB_FIELD_DATE] = {"$exists": True, "$ne": None}
+            if tags: record_query[DB_FIELD_TAGS] = {"$in": tags}
+            period_expression = _period_expressions()[granularity]
+            period_match: Dict[str, Any] = {"$nin": [None, ""]}
+            period_match.update(period_range)
+            pipeline: List[Dict[str, Any]] = [
+                {"$match": record_query},
+                {"$project": {
+                    "_id": 0,
+                    "period": period_expression,
+                    DB_FIELD_NOUNS: {"$filter": {"input": f"${DB_FIELD_NOUNS}", "cond": {"$in": ["$$this", nouns]}}},
+                }},
+                {"$match": {"period": period_match}},
+                {"$unwind": f"${DB_FIELD_NOUNS}"},
+                {"$group": {"_id": {"p": "$period", "w": f"${DB_FIELD_NOUNS}"}, "count": {"$sum": 1}}},
+            ]
+            # 미리 집계된 컬렉션을 쓰지 못하고 ImFiles를 다시 읽으므로 캐시 미스 집계와 같은 슬롯 제한을 받음
+            with admit():
+                counts = _period_word_counts(db[RECORD_NOUNS_COLLECTION].aggregate(pipeline, allowDiskUse=True))
+    finally:
+        client.close()
+
+    periods = sorted(counts)
+    return {
+        "granularity": granularity,
+        "periods": periods,
+        "series": {noun: [counts[period].get(noun, 0) for period in periods] for noun in nouns},
+    }
+
+
+def get_rising_nouns(period_a: str, period_b: str, granularity: str = GRANULARITY_MONTH,
+                     tags: Optional[List[str]] = None, limit: int = 20, min_count: int = 5) -> Optional[
+    List[Dict[str, Any]]]:
+    """
+    두 기간(period_a -> period_b) 사이에 빈도가 가장 많이 오른 명사 순위를 반환합니다.
+    점수는 평활화한 로그 비율 log2((count_b + 1) / (count_a + 1))이며, period_b 빈도가 min_count 미만인 명사는 제외합니다.
+    태그는 하나까지만 지정할 수 있습니다. limit은 1 ~ TREND_RISING_MAX_LIMIT, min_count는 0 이상이어야 합니다.
+    """
+    _validate_trend_query(granularity, tags)
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= TREND_RISING_MAX_LIMIT:
+        raise ValueError(f"limit은 1 이상 {TREND_RISING_MAX_LIMIT} 이하의 정수여야 합니다: {limit}")
+    if isinstance(min_count, bool) or not isinstance(min_count, int) or min_count < 0:
+        raise ValueError(f"min_count는 0 이상의 정수여야 합니다: {min_count}")
+
+    client = get_mongodb_client()
+    if not client: return None
+
+    rows = client[DB_NAME][NOUN_PERIOD_COLLECTION].aggregate([
+        {"$match": {
+            PERIOD_FIELD_GRANULARITY: granularity,
+            PERIOD_FIELD_TAG: (tags or [ALL_TAGS_KEY])[0],
+            PERIOD_FIELD_PERIOD: {"$in": [period_a, period_b]},
+        }},
+        {"$group": {
+            "_id": f"${PERIOD_FIELD_WORD}",
+            "count_a": {"$sum": {"$cond": [{"$eq": [f"${PERIOD_FIELD_PERIOD}", period_a]}, f"${PERIOD_FIELD_COUNT}", 0]}},
+            "count_b": {"$sum": {"$cond": [{"$eq": [f"${PERIOD_FIELD_PERIOD}", period_b]}, f"${PERIOD_FIELD_COUNT}", 0]}},
+        }},
+        {"$match": {"count_b": {"$gte": min_count}}},
+    ], allowDiskUse=True)
+
+    ranked = []
+    for row in rows:
+        score = math.log2((row["count_b"] + 1) / (row["count_a"] + 1))
+        ranked.append({"word": row["_id"], "count_a": row["count_a"], "count_b": row["count_b"],
+                       "change": row["count_b"] - row["count_a"], "score": round(score, 4)})
+    client.close()
+
+    ranked.sort(key=lambda item: (-item["score"], -item["count_b"]))
+    return ranked[:limit]